@@ -0,0 +1,231 @@
+"""Caches for the Flask app.
+
+TTLCache is a plain in-process LRU. The response cache can instead use a
+backend shared by every gunicorn worker (see make_cache_backend):
+
+  memory  TTLCache, one copy per worker (default)
+  sqlite  SQLiteCache, a single SQLite file all workers on the host open
+  redis   RedisCache, any Redis-compatible server (needs the `redis` package)
+
+Shared backends take str keys and bytes values; TTLCache takes anything.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app import config
+
+try:
+    import redis
+except ImportError:  # Only needed for CACHE_BACKEND=redis
+    redis = None
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    Holds at most `maxsize` entries; the least recently used entry is
+    evicted first. A `ttl` of 0 or less disables expiry.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """LRU + TTL cache kept in a SQLite file shared across processes.
+
+    Each process opens its own connection (re-opened after a fork), and
+    WAL mode lets workers read while another one writes. Expiry uses wall
+    clock time since entries outlive the process that wrote them.
+
+    A hit only writes when the entry's access time is more than
+    `touch_interval` seconds old, and never waits for the write lock to do
+    it, so reads don't queue behind one another. The LRU order is exact to
+    within that interval.
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, path, maxsize, ttl, touch_interval=60):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.touch_interval = touch_interval
+        self._conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_MS / 1000,
+                                   check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                );
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed "
+                         "ON cache_entries (accessed_at);")
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?;", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                # set() purges expired entries, so a read needn't write
+                return default
+            if now - accessed_at >= self.touch_interval:
+                self._touch(conn, key, now)
+            return bytes(value)
+
+    def _touch(self, conn, key, now):
+        """Best-effort access time update: if another worker holds the
+        write lock, skip it instead of waiting."""
+        conn.execute("PRAGMA busy_timeout = 0;")
+        try:
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?;", (now, key))
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS};")
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE;")
+            try:
+                conn.execute("""
+                    INSERT INTO cache_entries (key, value, expires_at, accessed_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE
+                    SET value = excluded.value, expires_at = excluded.expires_at,
+                        accessed_at = excluded.accessed_at;
+                """, (key, value, expires_at, now))
+                conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?;", (now,))
+                excess = conn.execute("SELECT COUNT(*) FROM cache_entries;").fetchone()[0] - self.maxsize
+                if excess > 0:
+                    conn.execute("""
+                        DELETE FROM cache_entries WHERE key IN (
+                            SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?
+                        );
+                    """, (excess,))
+                conn.execute("COMMIT;")
+            except Exception:
+                conn.execute("ROLLBACK;")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM cache_entries;")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM cache_entries;").fetchone()[0]
+
+
+class RedisCache:
+    """Cache on a Redis-compatible server.
+
+    The server does the LRU eviction (configure maxmemory-policy
+    allkeys-lru); entries also get a TTL. Takes any client with Redis-style
+    get/set/scan_iter/delete, which is how tests swap in a local stand-in.
+    Connection errors count as misses so the API keeps serving if the cache
+    server goes away.
+    """
+
+    def __init__(self, client, ttl, prefix="paper-trail:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, ttl, prefix="paper-trail:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        return cls(redis.Redis.from_url(url, socket_timeout=1), ttl, prefix)
+
+    def get(self, key, default=None):
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as e:
+            print(f"Cache get failed: {e}")
+            return default
+        return default if value is None else value
+
+    def set(self, key, value):
+        try:
+            self.client.set(self.prefix + key, value, ex=int(self.ttl) if self.ttl > 0 else None)
+        except Exception as e:
+            print(f"Cache set failed: {e}")
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+
+
+def make_cache_backend(backend, maxsize, ttl):
+    """Builds the cache named by `backend` ('memory', 'sqlite' or 'redis')."""
+    if backend == "memory":
+        return TTLCache(maxsize, ttl)
+    if backend == "sqlite":
+        return SQLiteCache(config.CACHE_SQLITE_PATH, maxsize, ttl)
+    if backend == "redis":
+        return RedisCache.from_url(config.CACHE_REDIS_URL, ttl)
+    raise ValueError(f"Unknown cache backend: {backend!r}")
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 # from pathlib import Path
 
@@ -16,10 +17,17 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+# --- Data Version Polling ---
+# How often (seconds) each worker re-reads the data_versions stamp that the
+# populate scripts bump. In-process indexes and caches rebuild when it moves.
+DATA_VERSION_CHECK_INTERVAL = float(os.getenv("DATA_VERSION_CHECK_INTERVAL", "30"))
+
 # --- Test Mode Override ---
 # When running tests, force usage of test database to prevent production data corruption
 if os.getenv("TESTING") == "true":
     DB_NAME = "paper_trail_test"
+    # Tests reseed between cases, so always check the stamp
+    DATA_VERSION_CHECK_INTERVAL = 0
 
 # --- Build the conn_params dictionary that all your scripts use ---
 # This dictionary is imported by your other scripts.
@@ -31,6 +39,80 @@ conn_params = {
     "password": DB_PASSWORD
 }
 
+# --- Connection Pool (used by the Flask app only) ---
+# Each gunicorn worker gets its own pool. psycopg2 keeps at most
+# DB_POOL_MIN_CONN idle connections; extra ones opened under load are
+# closed when returned. Requests wait up to DB_POOL_TIMEOUT seconds for a
+# free connection once DB_POOL_MAX_CONN are checked out.
+DB_POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN_CONN", "1"))
+DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+DB_SEARCH_PATH = os.getenv("DB_SEARCH_PATH", "pt,public")
+
+# --- Search ---
+# Answer /api/politicians/search from each worker's in-memory index
+# (app/search_index.py) instead of querying Postgres per keystroke.
+POLITICIAN_SEARCH_INDEX = os.getenv("POLITICIAN_SEARCH_INDEX", "true").lower() == "true"
+POLITICIAN_SEARCH_LIMIT = int(os.getenv("POLITICIAN_SEARCH_LIMIT", "25"))
+DONOR_SEARCH_LIMIT = int(os.getenv("DONOR_SEARCH_LIMIT", "100"))
+
+# --- Vote Count Cache ---
+# Totals for /api/politician/<id>/votes, keyed by data version + filters
+VOTE_COUNT_CACHE_SIZE = int(os.getenv("VOTE_COUNT_CACHE_SIZE", "4096"))
+VOTE_COUNT_CACHE_TTL = float(os.getenv("VOTE_COUNT_CACHE_TTL", "3600"))
+
+# --- Response Cache ---
+# Serialized JSON of the read-only API routes, keyed by data version, path
+# and query args (app/http_cache.py). RESPONSE_CACHE_MAX_AGE is what
+# browsers are told; 0 means revalidate every time via If-None-Match.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "0"))
+# Where cached responses live: "memory" (per worker), "sqlite" (one file
+# shared by every worker on the host) or "redis" (shared by every host)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_SQLITE_PATH = os.getenv(
+    "CACHE_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "paper-trail-cache.sqlite3")
+)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+# --- Bill Subjects ---
+# Browsers may reuse /api/bills/subjects for this many seconds before
+# revalidating with If-None-Match
+BILL_SUBJECTS_MAX_AGE = int(os.getenv("BILL_SUBJECTS_MAX_AGE", "300"))
+
+# --- FEC Ingest (bin/populate_donors_and_donations.py) ---
+# Qualifying rows buffered per file before donors are resolved and the
+# batch is written. Peak ingest memory scales with this, not the cycle size.
+FEC_CHUNK_ROWS = int(os.getenv("FEC_CHUNK_ROWS", "100000"))
+# Parse each decompressed file with this many processes (1 = serial).
+# Files are split into newline-aligned shards of about FEC_SHARD_BYTES.
+FEC_PARSE_WORKERS = int(os.getenv("FEC_PARSE_WORKERS", "1"))
+FEC_SHARD_BYTES = int(os.getenv("FEC_SHARD_BYTES", str(64 * 1024 * 1024)))
+# Filter itcont rows with vectorized NumPy column operations before the
+# per-row parse (requires `pip install numpy`; falls back to the row loop)
+FEC_COLUMNAR = os.getenv("FEC_COLUMNAR", "false").lower() == "true"
+# Concurrent itcont downloads, and the size cap of the local download cache
+FEC_DOWNLOAD_WORKERS = int(os.getenv("FEC_DOWNLOAD_WORKERS", "2"))
+FEC_DOWNLOAD_CACHE_BYTES = int(os.getenv("FEC_DOWNLOAD_CACHE_BYTES", str(20 * 1024 ** 3)))
+# Size cap of the cache of decompressed FEC payloads (see bin/fec_text_cache.py)
+FEC_TEXT_CACHE_BYTES = int(os.getenv("FEC_TEXT_CACHE_BYTES", str(40 * 1024 ** 3)))
+# Apply only new/amended rows of changed files instead of reloading every
+# donation (same as passing --incremental to the script)
+FEC_INCREMENTAL = os.getenv("FEC_INCREMENTAL", "false").lower() == "true"
+# Donations are partitioned by FEC cycle. Reload a single cycle into a new
+# partition and swap it in (same as --reload-cycle=YYYY), and detach the
+# partitions of cycles before a given one (--detach-before-cycle=YYYY).
+# 0 turns either off.
+FEC_RELOAD_CYCLE = int(os.getenv("FEC_RELOAD_CYCLE", "0"))
+FEC_DETACH_BEFORE_CYCLE = int(os.getenv("FEC_DETACH_BEFORE_CYCLE", "0"))
+
+# --- Vote Ingest (bin/populate_votes.py) ---
+# Voteview vote files parsed at once by forked workers (1 = serial)
+VOTE_PARSE_WORKERS = int(os.getenv("VOTE_PARSE_WORKERS", "1"))
+
 # --- Load API Key from .env ---
 CONGRESS_GOV_API_KEY = os.getenv("CONGRESS_GOV_API_KEY")
 
@@ -40,6 +122,9 @@ FEC_DATA_FOLDER_PATH = os.path.join(BASE_DIR, "contributions")
 VOTE_DATA_FOLDER_PATH = os.path.join(BASE_DIR, "votes")
 MEMBER_FILE_PATH = os.path.join(BASE_DIR, "HSall_members.json")
 BILL_DATA_PATH = os.path.join(BASE_DIR, "bills")
+FEC_DOWNLOAD_CACHE_PATH = os.path.join(FEC_DATA_FOLDER_PATH, "download-cache")
+FEC_TEXT_CACHE_PATH = os.path.join(FEC_DATA_FOLDER_PATH, "text-cache")
+FEC_LOOKUP_SNAPSHOT_PATH = os.path.join(FEC_DATA_FOLDER_PATH, "lookup-snapshots")
 
 # --- Sanity Check (Optional but Recommended) ---
 # This will warn you if you forgot to fill in your .env file.
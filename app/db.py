@@ -0,0 +1,164 @@
+"""Process-wide PostgreSQL connection pool for the Flask app.
+
+Each gunicorn worker lazily builds its own pool the first time a request
+needs a connection. The pool remembers the PID that created it, so a
+forked child never reuses sockets inherited from its parent. Connections
+are checked out once per app context and handed back when the request
+ends, or when the app context ends for work done outside a request.
+"""
+
+import os
+import threading
+import time
+
+import psycopg2
+import psycopg2.pool
+from flask import g
+
+from app import config
+from app.derived import fetch_data_version
+
+
+class PoolTimeoutError(psycopg2.pool.PoolError):
+    """Raised when no pooled connection frees up within DB_POOL_TIMEOUT."""
+
+
+class BoundedConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """ThreadedConnectionPool that waits for a free slot instead of failing.
+
+    psycopg2 raises PoolError as soon as maxconn connections are checked
+    out. A semaphore sized to maxconn lets callers block for up to
+    ``timeout`` seconds before giving up.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, *args, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._timeout = timeout
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise PoolTimeoutError(
+                f"No database connection available after {self._timeout}s"
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _connection_kwargs():
+    """conn_params plus a startup search_path, so no extra SET round trip is needed."""
+    kwargs = dict(config.conn_params)
+    kwargs["options"] = f"-c search_path={config.DB_SEARCH_PATH}"
+    kwargs["connect_timeout"] = config.DB_CONNECT_TIMEOUT
+    return kwargs
+
+
+def get_pool():
+    """Returns this process's pool, creating it after a fork if needed."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            # A pool inherited across fork shares sockets with the parent.
+            # Drop the reference without closing so the parent's
+            # connections are left alone.
+            _pool = BoundedConnectionPool(
+                config.DB_POOL_MIN_CONN,
+                config.DB_POOL_MAX_CONN,
+                config.DB_POOL_TIMEOUT,
+                **_connection_kwargs(),
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def close_pool():
+    """Closes every connection owned by this process's pool."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
+
+
+def get_db_connection():
+    """Returns the connection bound to the current app context.
+
+    The first call in a request checks a connection out of the pool;
+    later calls in the same request reuse it.
+    """
+    if "db_conn" not in g:
+        g.db_conn = get_pool().getconn()
+    return g.db_conn
+
+
+def release_db_connection(exception=None):
+    """Returns the app context's connection to the pool.
+
+    Registered as both a request and an app-context teardown handler. An
+    app context that is already pushed (a CLI command, or a test client
+    inside one) outlives its requests, so each request hands its
+    connection back as it finishes. psycopg2's pool rolls
+    back any open transaction on return, and connections that died mid
+    request are discarded rather than recycled.
+    """
+    conn = g.pop("db_conn", None)
+    if conn is None:
+        return
+    pool = get_pool()
+    pool.putconn(conn, close=bool(conn.closed))
+
+
+_data_version = None
+_data_version_checked_at = 0.0
+
+
+def current_data_version():
+    """Returns the data_versions stamp, re-reading it at most every
+    DATA_VERSION_CHECK_INTERVAL seconds per process.
+
+    Returns 0 if the table hasn't been created yet.
+    """
+    global _data_version, _data_version_checked_at
+    now = time.monotonic()
+    if (_data_version is not None
+            and now - _data_version_checked_at < config.DATA_VERSION_CHECK_INTERVAL):
+        return _data_version
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        version = fetch_data_version(cur)
+    except psycopg2.errors.UndefinedTable:
+        conn.rollback()
+        version = 0
+    finally:
+        cur.close()
+
+    _data_version = version
+    _data_version_checked_at = now
+    return version
+
+
+def init_app(app):
+    """Registers pool teardown on a Flask app."""
+    app.teardown_request(release_db_connection)
+    app.teardown_appcontext(release_db_connection)
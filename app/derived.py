@@ -0,0 +1,127 @@
+"""Derived tables shared by the bin/populate_* scripts and the API.
+
+The populate scripts own the base tables. Anything the API reads that is
+computed from them lives here, so both sides agree on the schema.
+"""
+
+
+def ensure_data_versions_table(conn):
+    """Creates the data_versions table if it doesn't already exist.
+
+    One row per dataset ('politicians', 'bills', ...). Each populate run
+    increments its row, and the API uses the total as a cheap stamp to
+    tell when its in-process copies are stale.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                dataset TEXT PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+        conn.commit()
+    finally:
+        cur.close()
+
+
+def bump_data_version(conn, dataset):
+    """Marks `dataset` as changed. Call after a populate run commits."""
+    ensure_data_versions_table(conn)
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            INSERT INTO data_versions (dataset, version) VALUES (%s, 1)
+            ON CONFLICT (dataset) DO UPDATE
+            SET version = data_versions.version + 1, updated_at = now();
+        """, (dataset,))
+        conn.commit()
+    finally:
+        cur.close()
+    print(f"Bumped data version for '{dataset}'.")
+
+
+def fetch_data_version(cur):
+    """Returns the combined data version stamp (sum of all dataset versions)."""
+    cur.execute("SELECT COALESCE(SUM(version), 0) FROM data_versions;")
+    return int(cur.fetchone()[0])
+
+
+def ensure_politician_industry_totals(conn):
+    """Creates the politician_industry_totals materialized view if missing.
+
+    Holds SUM(Amount) per (PoliticianID, Industry) so the donation summary
+    endpoints read a handful of precomputed rows instead of aggregating
+    every donation on each page view. The unique index makes
+    REFRESH ... CONCURRENTLY possible and serves the per-politician lookup.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS politician_industry_totals AS
+            SELECT t.PoliticianID, d.Industry,
+                   SUM(t.Amount) AS TotalAmount,
+                   COUNT(*) AS DonationCount
+            FROM Donations t
+            JOIN Donors d ON t.DonorID = d.DonorID
+            WHERE d.Industry IS NOT NULL
+            GROUP BY t.PoliticianID, d.Industry;
+        """)
+        cur.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_politician_industry_totals_pk
+            ON politician_industry_totals (PoliticianID, Industry);
+        """)
+        conn.commit()
+    finally:
+        cur.close()
+
+
+def refresh_politician_industry_totals(conn):
+    """Recomputes politician_industry_totals without blocking API readers."""
+    ensure_politician_industry_totals(conn)
+    print("Refreshing 'politician_industry_totals'...")
+    cur = conn.cursor()
+    try:
+        cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY politician_industry_totals;")
+        conn.commit()
+    finally:
+        cur.close()
+
+
+def ensure_bill_subjects_table(conn):
+    """Creates the bill_subjects vocabulary table if it doesn't already exist.
+
+    One row per distinct entry of Bills.subjects, so the subject picker
+    doesn't have to unnest every bill on each page load.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS bill_subjects (
+                subject TEXT PRIMARY KEY,
+                bill_count INT NOT NULL
+            );
+        """)
+        conn.commit()
+    finally:
+        cur.close()
+
+
+def refresh_bill_subjects(conn):
+    """Rebuilds bill_subjects from Bills in a single transaction."""
+    ensure_bill_subjects_table(conn)
+    print("Refreshing 'bill_subjects'...")
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM bill_subjects;")
+        cur.execute("""
+            INSERT INTO bill_subjects (subject, bill_count)
+            SELECT subject, COUNT(*)
+            FROM Bills, UNNEST(subjects) AS subject
+            WHERE subject IS NOT NULL AND subject <> ''
+            GROUP BY subject;
+        """)
+        conn.commit()
+    finally:
+        cur.close()
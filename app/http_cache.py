@@ -0,0 +1,107 @@
+"""Response cache for the read-only API routes.
+
+Everything the API serves changes only when a bin/populate_* script runs
+and bumps the data_versions stamp. Wrapping a view in @cache_response
+keeps its serialized JSON keyed on (data version, path, query args), so a
+repeat request skips both the SQL and the JSON encoding. When the stamp
+moves, the old keys are simply never asked for again and age out of the LRU.
+
+CACHE_BACKEND picks where entries live (app/cache.py). With a shared
+backend, a page is rendered once per data version for all workers rather
+than once per worker.
+
+Every cached response carries a strong ETag (a hash of the body), and a
+request whose If-None-Match already names it gets an empty 304.
+"""
+
+import functools
+import hashlib
+from urllib.parse import urlencode
+
+from flask import current_app, make_response, request
+
+from app import config
+from app.cache import make_cache_backend
+from app.db import current_data_version
+
+response_cache = make_cache_backend(
+    config.CACHE_BACKEND, config.RESPONSE_CACHE_SIZE, config.RESPONSE_CACHE_TTL
+)
+
+
+def response_cache_key(version):
+    """'response:<data version>:<path>?<sorted query args>'.
+
+    Arg order doesn't matter. A str key works with every backend.
+    """
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"response:{version}:{request.path}?{query}"
+
+
+def pack_entry(etag, body):
+    return etag.encode() + b"\n" + body
+
+
+def unpack_entry(entry):
+    etag, _, body = entry.partition(b"\n")
+    return etag.decode(), body
+
+
+def body_etag(body):
+    """Strong validator for a response body."""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def cache_response(view=None, *, max_age=None):
+    """Decorator for GET views that return JSON.
+
+    Only 200 JSON responses are stored; errors are passed through
+    untouched. A cache backend that fails counts as a miss. `max_age` sets Cache-Control max-age for browsers and
+    defaults to RESPONSE_CACHE_MAX_AGE. With 0, clients are told to
+    revalidate every time, which the ETag makes cheap.
+    """
+    if view is None:
+        return functools.partial(cache_response, max_age=max_age)
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not config.RESPONSE_CACHE_ENABLED:
+            return view(*args, **kwargs)
+
+        try:
+            key = response_cache_key(current_data_version())
+        except Exception as e:
+            # Without a stamp there is nothing safe to key on. Let the view
+            # run (and report its own database error).
+            print(f"Response cache bypassed: {e}")
+            return view(*args, **kwargs)
+
+        try:
+            entry = response_cache.get(key)
+        except Exception as e:
+            # A backend error (e.g. SQLite "database is locked") is a miss
+            print(f"Response cache get failed: {e}")
+            entry = None
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or not response.is_json:
+                return response
+            body = response.get_data()
+            entry = pack_entry(body_etag(body), body)
+            try:
+                response_cache.set(key, entry)
+            except Exception as e:
+                print(f"Response cache set failed: {e}")
+
+        etag, body = unpack_entry(entry)
+        response = current_app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        age = config.RESPONSE_CACHE_MAX_AGE if max_age is None else max_age
+        if age > 0:
+            response.cache_control.public = True
+            response.cache_control.max_age = age
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    return wrapper
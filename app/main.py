@@ -1,11 +1,18 @@
+import base64
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
 import os
 from flask import Flask, render_template, jsonify, request
 from app import config
+from app.cache import TTLCache
+from app.db import current_data_version, get_db_connection, init_app as init_db
+from app.http_cache import cache_response
+from app.search_index import get_politician_index
 
 
 app = Flask(__name__)
+init_db(app)
 
 # --- TOPIC TO INDUSTRY MAPPING ---
 TOPIC_INDUSTRY_MAP = {
@@ -21,15 +28,6 @@ TOPIC_INDUSTRY_MAP = {
 }
 
 
-def get_db_connection():
-    """Establishes database connection."""
-    conn = psycopg2.connect(**config.conn_params)
-    cursor = conn.cursor()
-    cursor.execute("SET search_path TO pt, public;")
-    conn.commit()
-    cursor.close()
-    return conn
-
 @app.route('/')
 def index():
     """Serves the main index.html file."""
@@ -48,26 +46,39 @@ def feedback():
 # -----------------------------------
 
 @app.route('/api/politicians/search')
+@cache_response
 def search_politicians():
-    """Searches for politicians by name."""
+    """Searches for politicians by name, ranked by trigram similarity.
+
+    Served from the in-process index in app/search_index.py unless
+    POLITICIAN_SEARCH_INDEX is turned off, in which case the same ranking is
+    computed in Postgres.
+    """
     query = request.args.get('name', '')
     if len(query) < 2:
         return jsonify([])
 
-    conn = None
     try:
+        if config.POLITICIAN_SEARCH_INDEX:
+            index = get_politician_index(current_data_version())
+            return jsonify(index.search(query, config.POLITICIAN_SEARCH_LIMIT))
+
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-      # Using 'Politicians' table name based on previous lack of error
+        # The full-name expression must match idx_politicians_full_name_trgm
+        # (created by bin/populate_politicians.py) so the ILIKE can use the
+        # pg_trgm GIN index instead of a sequential scan.
         sql = """
             SELECT PoliticianID, FirstName, LastName, Party, State, Role, IsActive
             FROM Politicians
             WHERE (FirstName || ' ' || LastName) ILIKE %s
-            ORDER BY IsActive DESC, LastName, FirstName;
+            ORDER BY similarity(FirstName || ' ' || LastName, %s) DESC,
+                     IsActive DESC, LastName, FirstName
+            LIMIT %s;
         """
         search_query = f"%{query}%"
-        cur.execute(sql, (search_query,))
+        cur.execute(sql, (search_query, query, config.POLITICIAN_SEARCH_LIMIT))
 
 
         politicians = cur.fetchall()
@@ -78,14 +89,11 @@ def search_politicians():
     except (Exception, psycopg2.Error) as e:
         print(f"Error searching politicians: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/politician/<int:politician_id>')
+@cache_response
 def get_politician(politician_id):
     """Gets a single politician by ID."""
-    conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -116,37 +124,105 @@ def get_politician(politician_id):
     except (Exception, psycopg2.Error) as e:
         print(f"Error fetching politician: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
+
+def encode_cursor(*values):
+    """Builds an opaque keyset cursor token from the last row's sort values."""
+    raw = ":".join(str(v) for v in values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, expected_parts):
+    """Splits a cursor token back into its string parts. Raises ValueError."""
+    padded = token + "=" * (-len(token) % 4)
+    parts = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+    if len(parts) != expected_parts:
+        raise ValueError("Malformed cursor")
+    return parts
+
 
 @app.route('/api/donors/search')
+@cache_response
 def search_donors_route():
-    """Searches for donors by name."""
+    """Searches for donors by name.
+
+    By default returns a name-sorted list. With ?mode=ranked the results are
+    ordered by trigram similarity and wrapped as {"donors": [...], "next": token};
+    pass the token back as ?after= to fetch the following page. ?employer= and
+    ?state= narrow either mode.
+    """
     query = request.args.get('name', '')
     if len(query) < 3:  # Match the 3-char minimum from the frontend
         return jsonify([])
 
-    conn = None
+    ranked = request.args.get('mode', '').lower() == 'ranked'
+    employer = request.args.get('employer', '').strip()
+    state = request.args.get('state', '').strip()
+    after = request.args.get('after', '')
+
+    try:
+        limit = int(request.args.get('limit', config.DONOR_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, config.DONOR_SEARCH_LIMIT))
+
+    after_score = after_id = None
+    if ranked and after:
+        try:
+            score_part, id_part = decode_cursor(after, 2)
+            after_score, after_id = float(score_part), int(id_part)
+        except (ValueError, UnicodeDecodeError):
+            return jsonify({"error": "Invalid cursor"}), 400
+
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-        # Query the 'Donors' table
-        sql = """
-            SELECT DonorID, Name, DonorType, Employer, State
+        # Name and Employer ILIKE filters use the pg_trgm GIN indexes and the
+        # State filter uses idx_donors_state (see create_tables_if_not_exists
+        # in bin/populate_donors_and_donations.py).
+        where_clauses = ["Name ILIKE %(pattern)s"]
+        params = {"pattern": f"%{query}%", "query": query, "limit": limit}
+        if employer:
+            where_clauses.append("Employer ILIKE %(employer)s")
+            params["employer"] = f"%{employer}%"
+        if state:
+            where_clauses.append("State = %(state)s")
+            params["state"] = state.upper()
+
+        if ranked:
+            if after_id is not None:
+                # Keyset continuation. Casting to real compares against the
+                # exact float4 value similarity() produced on the last page.
+                where_clauses.append("""
+                    (similarity(Name, %(query)s) < %(after_score)s::real
+                     OR (similarity(Name, %(query)s) = %(after_score)s::real
+                         AND DonorID > %(after_id)s))
+                """)
+                params["after_score"] = after_score
+                params["after_id"] = after_id
+            # The score is only computed when the results are ranked by it
+            score_sql = ",\n                   similarity(Name, %(query)s) AS score"
+            order_sql = "score DESC, DonorID"
+            # Fetch one extra row to know whether another page exists
+            params["limit"] = limit + 1
+        else:
+            score_sql = ""
+            order_sql = "Name"
+
+        sql = f"""
+            SELECT DonorID, Name, DonorType, Employer, State{score_sql}
             FROM Donors
-            WHERE Name ILIKE %s
-            ORDER BY Name;
+            WHERE {' AND '.join(where_clauses)}
+            ORDER BY {order_sql}
+            LIMIT %(limit)s;
         """
-        search_query = f"%{query}%"
-        cur.execute(sql, (search_query,))
+        cur.execute(sql, params)
         donors = cur.fetchall()
         cur.close()
 
         # Format the keys to be lowercase to match the JavaScript
         donor_list = []
-        for d in donors:
+        for d in donors[:limit]:
             donor_list.append({
                 "donorid": d['donorid'],
                 "name": d['name'],
@@ -154,20 +230,24 @@ def search_donors_route():
                 "employer": d['employer'],
                 "state": d['state']
             })
-            
-        return jsonify(donor_list)
+
+        if not ranked:
+            return jsonify(donor_list)
+
+        next_cursor = None
+        if len(donors) > limit:
+            last = donors[limit - 1]
+            next_cursor = encode_cursor(repr(last['score']), last['donorid'])
+        return jsonify({"donors": donor_list, "next": next_cursor})
 
     except (Exception, psycopg2.Error) as e:
         print(f"Error searching donors: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/donor/<int:donor_id>')
+@cache_response
 def get_donor(donor_id):
     """Gets a single donor by ID."""
-    conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -196,14 +276,11 @@ def get_donor(donor_id):
     except (Exception, psycopg2.Error) as e:
         print(f"Error fetching donor: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/donor/<int:donor_id>/donations')
+@cache_response
 def get_donor_contributions(donor_id):
     """Gets all donations for a specific donor, joined with politician info."""
-    conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -246,19 +323,37 @@ def get_donor_contributions(donor_id):
     except (Exception, psycopg2.Error) as e:
         print(f"Error fetching donor contributions: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
+
+# Vote totals per (data version, politician, filters). Counting a member's
+# full record is the expensive part of the votes endpoint and the answer
+# only changes when a populate script runs.
+vote_count_cache = TTLCache(maxsize=config.VOTE_COUNT_CACHE_SIZE, ttl=config.VOTE_COUNT_CACHE_TTL)
+
+# Values of Bills.BillType accepted by ?type=
+BILL_TYPES = {'hr', 's', 'hjres', 'sjres', 'hconres', 'sconres', 'hres', 'sres'}
+
 
 @app.route('/api/politician/<int:politician_id>/votes')
+@cache_response
 def get_politician_votes(politician_id):
-    """Gets paginated and filtered vote history for a politician."""
-    conn = None
+    """Gets paginated and filtered vote history for a politician, one entry
+    per roll call, with the roll call (or null for votes loaded without one).
+
+    Votes are ordered by Votes.SortDate (the bill's DateIntroduced, with
+    undated bills first when descending) and VoteID, which
+    idx_votes_politician_sort serves in order. Pages by ?page= (OFFSET) by
+    default. Passing ?after= switches to keyset pagination on (SortDate,
+    VoteID): an empty value fetches the first page, and
+    pagination.nextCursor fetches the one after it, so deep pages cost the
+    same as the first.
+    """
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-        page = int(request.args.get('page', 1))
+        keyset = 'after' in request.args
+        after = request.args.get('after', '')
+        page = 1 if keyset else int(request.args.get('page', 1))
         per_page = 10
         offset = (page - 1) * per_page
         sort_order = request.args.get('sort', 'desc').upper()
@@ -271,32 +366,11 @@ def get_politician_votes(politician_id):
         where_clauses = ["v.PoliticianID = %s"]
         params = [politician_id]
 
-        # Bill type mapping from frontend format to database format
-        BILL_TYPE_MAP = {
-            'hr': 'H.R.%',
-            's': 'S.%',
-            'hjres': 'H.J.Res.%',
-            'sjres': 'S.J.Res.%',
-            'hconres': 'H.Con.Res.%',
-            'sconres': 'S.Con.Res.%',
-            'hres': 'H.Res.%',
-            'sres': 'S.Res.%'
-        }
-
-        if bill_types:
-            # Build OR conditions for bill numbers starting with the types
-            # Example: "(b.BillNumber ILIKE 'H.R.%' OR b.BillNumber ILIKE 'S.%')"
-            type_conditions = []
-            for bill_type in bill_types:
-                # Map lowercase type to actual bill number format
-                pattern = BILL_TYPE_MAP.get(bill_type.lower())
-                if pattern:
-                    type_conditions.append("b.BillNumber ILIKE %s")
-                    params.append(pattern)
-
-            # Only add filter if we have valid bill types
-            if type_conditions:
-                where_clauses.append(f"({' OR '.join(type_conditions)})")
+        # Bills.BillType holds the lowercased type code ('hr', 's', 'hjres', ...)
+        types = sorted({t.lower() for t in bill_types} & BILL_TYPES)
+        if types:
+            where_clauses.append("b.BillType = ANY(%s)")
+            params.append(types)
 
         if bill_subjects:
             where_clauses.append("b.subjects && %s")
@@ -304,28 +378,57 @@ def get_politician_votes(politician_id):
 
         where_sql = " AND ".join(where_clauses)
 
-        count_sql = f"SELECT COUNT(*) FROM votes v JOIN bills b ON v.BillID = b.BillID WHERE {where_sql};"
-        # Make sure params are passed as a tuple
-        cur.execute(count_sql, tuple(params))
-        total_votes = cur.fetchone()['count']
+        count_key = (current_data_version(), politician_id,
+                     tuple(types), tuple(sorted(bill_subjects)))
+        total_votes = vote_count_cache.get(count_key)
+        if total_votes is None:
+            count_sql = f"SELECT COUNT(*) FROM votes v JOIN bills b ON v.BillID = b.BillID WHERE {where_sql};"
+            # Make sure params are passed as a tuple
+            cur.execute(count_sql, tuple(params))
+            total_votes = cur.fetchone()['count']
+            vote_count_cache.set(count_key, total_votes)
         total_pages = (total_votes + per_page - 1) // per_page
 
+        data_params = list(params)
+        if keyset:
+            if after:
+                try:
+                    after_date, after_vote_id = decode_cursor(after, 2)
+                    after_vote_id = int(after_vote_id)
+                except (ValueError, UnicodeDecodeError):
+                    return jsonify({"error": "Invalid cursor"}), 400
+                comparison = '<' if sort_order == 'DESC' else '>'
+                where_sql += f" AND (v.SortDate, v.VoteID) {comparison} (%s::date, %s)"
+                data_params.extend([after_date, after_vote_id])
+            # One extra row tells us whether there is a next page
+            page_sql = "LIMIT %s"
+            data_params.append(per_page + 1)
+        else:
+            page_sql = "LIMIT %s OFFSET %s"
+            data_params.extend([per_page, offset])
+
         # Selecting columns that exist in your tables
         data_sql = f"""
-            SELECT v.VoteID, v.vote, b.BillNumber, b.Title, b.DateIntroduced, b.subjects
+            SELECT v.VoteID, v.vote, b.BillNumber, b.Title, b.DateIntroduced, b.subjects,
+                   r.Congress, r.Chamber, r.RollNumber, r.VoteDate, r.Question,
+                   v.SortDate::text AS sort_date
             FROM votes v
             JOIN bills b ON v.BillID = b.BillID
+            LEFT JOIN rollcalls r ON v.RollCallID = r.RollCallID
             WHERE {where_sql}
-            ORDER BY b.DateIntroduced {sort_order}
-            LIMIT %s OFFSET %s;
+            ORDER BY v.SortDate {sort_order}, v.VoteID {sort_order}
+            {page_sql};
         """
-        # Create a new list for data query params including limit and offset
-        data_params = list(params)
-        data_params.extend([per_page, offset])
 
         cur.execute(data_sql, tuple(data_params))
         votes_data = cur.fetchall()
 
+        next_cursor = None
+        if keyset and len(votes_data) > per_page:
+            votes_data = votes_data[:per_page]
+            last = votes_data[-1]
+            next_cursor = encode_cursor(last['sort_date'], last['voteid'])
+
         votes_list = []
         for row in votes_data:
             # Convert date to ISO format string for consistent API response
@@ -339,17 +442,29 @@ def get_politician_votes(politician_id):
                 "BillNumber": row['billnumber'],
                 "Title": row['title'],
                 "DateIntroduced": date_introduced,
-                "subjects": row['subjects']
+                "subjects": row['subjects'],
+                "RollCall": {
+                    "Congress": row['congress'],
+                    "Chamber": row['chamber'],
+                    "RollNumber": row['rollnumber'],
+                    "Date": row['votedate'].isoformat() if row['votedate'] else None,
+                    "Question": row['question']
+                } if row['rollnumber'] is not None else None
             })
 
         cur.close()
 
+        pagination = {
+            "currentPage": page,
+            "totalPages": total_pages,
+            "totalVotes": total_votes
+        }
+        if keyset:
+            del pagination["currentPage"]
+            pagination["nextCursor"] = next_cursor
+
         return jsonify({
-            "pagination": {
-                "currentPage": page,
-                "totalPages": total_pages,
-                "totalVotes": total_votes
-            },
+            "pagination": pagination,
             "votes": votes_list
         })
 
@@ -358,27 +473,20 @@ def get_politician_votes(politician_id):
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/politician/<int:politician_id>/donations/summary')
+@cache_response
 def get_donation_summary(politician_id):
     """Gets UNFILTERED donation summary, grouped by INDUSTRY."""
-    conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-        # --- CORRECTED: Use lowercase 'donations' table name ---
-        # Assuming 'donors' table name is also lowercase
+        # Precomputed by the populate scripts (see app/derived.py)
         sql = """
-            SELECT d.Industry, SUM(t.Amount) AS TotalAmount
-            FROM donations t
-            JOIN donors d ON t.DonorID = d.DonorID
-            WHERE t.PoliticianID = %s
-            GROUP BY d.Industry
-            HAVING d.Industry IS NOT NULL
+            SELECT Industry, TotalAmount
+            FROM politician_industry_totals
+            WHERE PoliticianID = %s
             ORDER BY TotalAmount DESC;
         """
 
@@ -397,11 +505,9 @@ def get_donation_summary(politician_id):
     except (Exception, psycopg2.Error) as e:
         print(f"Error fetching donation summary: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/politician/<int:politician_id>/donations/summary/filtered')
+@cache_response
 def get_filtered_donation_summary(politician_id):
     """Gets donation summary filtered by a bill topic."""
     topic = request.args.get('topic')
@@ -412,21 +518,16 @@ def get_filtered_donation_summary(politician_id):
     if not industries:
         return jsonify([])
 
-    conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-        # --- CORRECTED: Use lowercase 'donations' table name ---
-        # Assuming 'donors' table name is also lowercase
+        # Precomputed by the populate scripts (see app/derived.py)
         sql = """
-            SELECT d.Industry, SUM(t.Amount) AS TotalAmount
-            FROM donations t
-            JOIN donors d ON t.DonorID = d.DonorID
-            WHERE t.PoliticianID = %s
-            AND d.Industry = ANY(%s)
-            GROUP BY d.Industry
-            HAVING d.Industry IS NOT NULL
+            SELECT Industry, TotalAmount
+            FROM politician_industry_totals
+            WHERE PoliticianID = %s
+            AND Industry = ANY(%s)
             ORDER BY TotalAmount DESC;
         """
 
@@ -445,42 +546,40 @@ def get_filtered_donation_summary(politician_id):
     except (Exception, psycopg2.Error) as e:
         print(f"Error fetching filtered donation summary: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
-@app.route('/api/bills/subjects')
-def get_all_bill_subjects():
-    """Gets all unique bill subjects from the Bills table."""
-    conn = None
+def load_bill_subjects(cur):
+    """Sorted subject list, from bill_subjects or, before populate_bills.py
+    has created it, straight from Bills."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        
-        # Use UNNEST to expand the 'subjects' array column,
-        # get all distinct non-null subjects, and order them.
-        sql = """
-            SELECT DISTINCT UNNEST(subjects) AS subject 
-            FROM Bills 
+        cur.execute("SELECT subject FROM bill_subjects ORDER BY subject;")
+    except psycopg2.errors.UndefinedTable:
+        cur.connection.rollback()
+        cur.execute("""
+            SELECT DISTINCT UNNEST(subjects) AS subject
+            FROM Bills
             WHERE subjects IS NOT NULL AND subjects != '{}'
             ORDER BY subject;
-        """
-        cur.execute(sql)
-        results = cur.fetchall()
-        
-        # Convert the list of dicts ([{'subject': 'Health'}, ...])
-        # into a simple list of strings (['Health', ...])
-        subject_list = [row['subject'] for row in results] 
-        
+        """)
+    return [row[0] for row in cur.fetchall() if row[0]]
+
+
+@app.route('/api/bills/subjects')
+@cache_response(max_age=config.BILL_SUBJECTS_MAX_AGE)
+def get_all_bill_subjects():
+    """Gets all unique bill subjects.
+
+    Read from the bill_subjects table that bin/populate_bills.py maintains.
+    Browsers may reuse the list for BILL_SUBJECTS_MAX_AGE seconds.
+    """
+    try:
+        cur = get_db_connection().cursor()
+        subject_list = load_bill_subjects(cur)
         cur.close()
-        return jsonify(subject_list) # Flask automatically returns this as JSON
+        return jsonify(subject_list)
 
     except (Exception, psycopg2.Error) as e:
         print(f"Error fetching bill subjects: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
 
 
 if __name__ == "__main__":
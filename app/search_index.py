@@ -0,0 +1,135 @@
+"""In-process politician name index for /api/politicians/search.
+
+The Politicians table only holds a few thousand rows, so every worker
+keeps its own copy in memory. The typeahead can then be answered without
+a database round trip per keystroke. The index is rebuilt when the
+data_versions stamp changes (see app/derived.py).
+
+Layout: one tuple per politician plus, for every character bigram that
+appears in a lowercased full name, an array('I') of row positions. A query
+intersects the postings of its own bigrams and then checks the surviving
+rows with a substring test, which matches the old ILIKE '%q%' behaviour.
+"""
+
+import re
+import threading
+from array import array
+
+from app.db import get_db_connection
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def name_trigrams(text):
+    """Trigram set of `text`, computed the way pg_trgm's similarity() does it."""
+    trigrams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            trigrams.add(padded[i:i + 3])
+    return trigrams
+
+
+def trigram_similarity(a_trigrams, b_trigrams):
+    """pg_trgm similarity: shared trigrams over the union of both sets."""
+    if not a_trigrams or not b_trigrams:
+        return 0.0
+    shared = len(a_trigrams & b_trigrams)
+    return shared / (len(a_trigrams) + len(b_trigrams) - shared)
+
+
+def _bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class PoliticianIndex:
+    """Immutable bigram index over politician full names."""
+
+    FIELDS = ("politicianid", "firstname", "lastname", "party", "state", "role", "isactive")
+
+    def __init__(self, rows, version):
+        # rows: (PoliticianID, FirstName, LastName, Party, State, Role, IsActive)
+        self.version = version
+        self._rows = [tuple(row) for row in rows]
+        self._names = [f"{row[1] or ''} {row[2] or ''}".lower() for row in self._rows]
+
+        postings = {}
+        for position, name in enumerate(self._names):
+            for gram in _bigrams(name):
+                postings.setdefault(gram, array('I')).append(position)
+        self._postings = postings
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _candidates(self, needle):
+        grams = _bigrams(needle)
+        if not grams:
+            return range(len(self._rows))
+        lists = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return ()
+            lists.append(posting)
+        lists.sort(key=len)
+        result = set(lists[0])
+        for posting in lists[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+    def search(self, query, limit):
+        """Substring match on "First Last", ranked like the SQL search.
+
+        Order is trigram similarity DESC, IsActive DESC, LastName, FirstName.
+        """
+        needle = query.lower()
+        query_trigrams = name_trigrams(query)
+
+        matches = []
+        for position in self._candidates(needle):
+            name = self._names[position]
+            if needle not in name:
+                continue
+            row = self._rows[position]
+            score = trigram_similarity(query_trigrams, name_trigrams(name))
+            matches.append((-score, not row[6], row[2] or '', row[1] or '', position))
+
+        matches.sort()
+        return [dict(zip(self.FIELDS, self._rows[m[-1]])) for m in matches[:limit]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def load_politician_index(conn, version):
+    """Reads every politician into a new PoliticianIndex."""
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT PoliticianID, FirstName, LastName, Party, State, Role, IsActive
+            FROM Politicians;
+        """)
+        return PoliticianIndex(cur.fetchall(), version)
+    finally:
+        cur.close()
+
+
+def get_politician_index(version):
+    """Returns this worker's index, rebuilding it if `version` has moved on.
+
+    Only a rebuild touches the database.
+    """
+    global _index
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = load_politician_index(get_db_connection(), version)
+            print(f"Loaded politician search index ({len(_index)} rows, version {version}).")
+        return _index
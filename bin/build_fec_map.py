@@ -1,17 +1,20 @@
 import os
-import zipfile
-import io
-import csv
+import sys
 import psycopg2
 import time
 from psycopg2.extras import execute_values
 import re
-from app.config import conn_params # Imports your configuration file
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+import app.config as config  # Imports your configuration file
+from bin.fec_text_cache import TextCache
 
 # --- CONFIGURATION ---
 # All config is now pulled from test.py
 FEC_DATA_FOLDER_PATH = config.FEC_DATA_FOLDER_PATH
 BATCH_SIZE = 500
+# Shared with populate_donors_and_donations.py: cn zips are decompressed once
+text_cache = TextCache(config.FEC_TEXT_CACHE_PATH, config.FEC_TEXT_CACHE_BYTES)
 
 # --- STATE ABBREVIATION MAP ---
 # This maps the FEC's 2-letter abbreviation to the full state name used by Congress.gov
@@ -138,57 +141,53 @@ def build_mapping_table():
             filepath = os.path.join(FEC_DATA_FOLDER_PATH, filename)
             print(f"  Processing {filename}...")
             try:
-                with zipfile.ZipFile(filepath, 'r') as zf:
-                    data_filename = [f for f in zf.namelist() if f.endswith('.txt')][0]
-                    with zf.open(data_filename, 'r') as f:
-                        reader = csv.reader(io.TextIOWrapper(f, encoding='latin-1'), delimiter='|')
-                        for row in reader:
-                            try:
-                                record = dict(zip(CN_HEADERS, row))
-                                cand_id, name_str = record.get('CAND_ID'), record.get('CAND_NAME', '')
-                                state_abbr, office = record.get('CAND_OFFICE_ST', '').strip(), record.get('CAND_OFFICE', '')
+                for row in text_cache.read_rows(filepath):
+                    try:
+                        record = dict(zip(CN_HEADERS, row))
+                        cand_id, name_str = record.get('CAND_ID'), record.get('CAND_NAME', '')
+                        state_abbr, office = record.get('CAND_OFFICE_ST', '').strip(), record.get('CAND_OFFICE', '')
                                 
-                                if not (cand_id and name_str and state_abbr and office in ['H', 'S', 'P']):
-                                    continue
+                        if not (cand_id and name_str and state_abbr and office in ['H', 'S', 'P']):
+                            continue
                                 
-                                matched_pid = None
-                                fname_fec_clean, lname_fec_clean = normalize_fec_name(name_str)
+                        matched_pid = None
+                        fname_fec_clean, lname_fec_clean = normalize_fec_name(name_str)
                                 
-                                if office == 'P' and state_abbr == 'US':
-                                    # --- Presidential Match Logic ---
-                                    key_fec = (lname_fec_clean, 'us_president')
-                                    potential_matches = politician_db_lookup.get(key_fec)
-                                    if potential_matches:
-                                        if len(potential_matches) == 1:
-                                            matched_pid = potential_matches[0][0]
-                                        else:
-                                            # Match on first name if multiple last names
-                                            for pid, fname_db_clean, role in potential_matches:
-                                                if fname_fec_clean == fname_db_clean:
-                                                    matched_pid = pid; break
+                        if office == 'P' and state_abbr == 'US':
+                            # --- Presidential Match Logic ---
+                            key_fec = (lname_fec_clean, 'us_president')
+                            potential_matches = politician_db_lookup.get(key_fec)
+                            if potential_matches:
+                                if len(potential_matches) == 1:
+                                    matched_pid = potential_matches[0][0]
                                 else:
-                                    # --- Congress Match Logic ---
-                                    full_state_name = STATE_ABBREVIATION_MAP.get(state_abbr.upper())
-                                    if not full_state_name:
-                                        continue # Skip if we can't map the state
+                                    # Match on first name if multiple last names
+                                    for pid, fname_db_clean, role in potential_matches:
+                                        if fname_fec_clean == fname_db_clean:
+                                            matched_pid = pid; break
+                        else:
+                            # --- Congress Match Logic ---
+                            full_state_name = STATE_ABBREVIATION_MAP.get(state_abbr.upper())
+                            if not full_state_name:
+                                continue # Skip if we can't map the state
                                     
-                                    key_fec = (lname_fec_clean, full_state_name)
-                                    potential_matches = politician_db_lookup.get(key_fec)
+                            key_fec = (lname_fec_clean, full_state_name)
+                            potential_matches = politician_db_lookup.get(key_fec)
                                     
-                                    if potential_matches:
-                                        if len(potential_matches) == 1:
-                                            matched_pid = potential_matches[0][0]
-                                        else:
-                                            # Match on first name if multiple last names
-                                            for pid, fname_db_clean, role in potential_matches:
-                                                if fname_fec_clean == fname_db_clean:
-                                                    matched_pid = pid; break 
-                                
-                                if matched_pid:
-                                    mapping_to_insert[cand_id] = matched_pid; matches_found_count += 1 
+                            if potential_matches:
+                                if len(potential_matches) == 1:
+                                    matched_pid = potential_matches[0][0]
                                 else:
-                                    unmatched_candidates.add(f"FEC: '{name_str}', {state_abbr}, {office} -> Parsed: ('{fname_fec_clean}', '{lname_fec_clean}')")
-                            except: continue
+                                    # Match on first name if multiple last names
+                                    for pid, fname_db_clean, role in potential_matches:
+                                        if fname_fec_clean == fname_db_clean:
+                                            matched_pid = pid; break 
+                                
+                        if matched_pid:
+                            mapping_to_insert[cand_id] = matched_pid; matches_found_count += 1 
+                        else:
+                            unmatched_candidates.add(f"FEC: '{name_str}', {state_abbr}, {office} -> Parsed: ('{fname_fec_clean}', '{lname_fec_clean}')")
+                    except: continue
             except Exception as e: print(f"    Warning: Could not process {filename}: {e}")
 
         mapping_tuples = list(mapping_to_insert.items())
@@ -0,0 +1,128 @@
+"""Compact in-memory index from normalized donor keys to DonorIDs.
+
+populate_donors_and_donations.py used to cache every donor in a dict
+keyed by a tuple of four lowercased strings: several hundred bytes per
+donor, and several GB for the individual-contribution files.
+
+DonorKeyIndex keeps no strings at all. Each key is reduced to a 64-bit
+hash plus an independent 64-bit fingerprint (a BLAKE2b digest), and both
+are stored with the DonorID in flat arrays using open addressing (linear
+probing), about 30 bytes per donor at the maximum load factor.
+
+Lookups are probabilistic: a key is only matched by its hash and
+fingerprint, never compared with the stored key, so two keys that agree
+on all 128 bits would share a DonorID. For any realistic number of donors
+the odds of that are negligible (around 1e-23 for a hundred million
+keys). If two different DonorIDs are stored under the same hash and
+fingerprint, the slot is marked ambiguous and those keys are kept exactly
+in a small overflow dict. Keys that land on an ambiguous slot and aren't
+in the overflow dict are reported as unknown, so the caller resolves
+them against the database.
+
+Hashes use Python's hash(), which is salted per process, so an index is
+only valid inside the process that built it.
+"""
+
+import hashlib
+from array import array
+
+EMPTY = 0      # DonorIDs are SERIAL, so 0 never occurs
+AMBIGUOUS = -1
+MAX_LOAD = 2 / 3
+
+
+def key_hashes(key):
+    """(64-bit hash, 64-bit fingerprint) of a donor key tuple."""
+    digest = hashlib.blake2b('\x1f'.join(key).encode('utf-8'), digest_size=8).digest()
+    return hash(key), int.from_bytes(digest, 'little')
+
+
+class DonorKeyIndex:
+    """Dict-like map of donor key tuples to DonorIDs (see module docstring)."""
+
+    def __init__(self, capacity=1024):
+        self.clear(capacity)
+
+    def clear(self, capacity=1024):
+        size = 1
+        while size * MAX_LOAD < capacity:
+            size *= 2
+        self._mask = size - 1
+        self._hashes = array('q', bytes(8 * size))
+        self._fingerprints = array('Q', bytes(8 * size))
+        self._ids = array('i', bytes(4 * size))
+        self._used = 0       # occupied slots, ambiguous ones included
+        self._ambiguous = 0
+        self._overflow = {}  # exact keys whose slot is AMBIGUOUS
+
+    def __len__(self):
+        return self._used - self._ambiguous + len(self._overflow)
+
+    def _find(self, key_hash, fingerprint):
+        """Index of the slot holding (key_hash, fingerprint), or of the empty
+        slot where it would go."""
+        ids = self._ids
+        slot = key_hash & self._mask
+        while True:
+            if ids[slot] == EMPTY:
+                return slot
+            if self._hashes[slot] == key_hash and self._fingerprints[slot] == fingerprint:
+                return slot
+            slot = (slot + 1) & self._mask
+
+    def get(self, key, default=None):
+        # _find() inlined: this runs once per parsed donation
+        key_hash, fingerprint = key_hashes(key)
+        hashes, fingerprints, ids, mask = self._hashes, self._fingerprints, self._ids, self._mask
+        slot = key_hash & mask
+        while True:
+            donor_id = ids[slot]
+            if donor_id == EMPTY:
+                return default
+            if hashes[slot] == key_hash and fingerprints[slot] == fingerprint:
+                if donor_id == AMBIGUOUS:
+                    return self._overflow.get(key, default)
+                return donor_id
+            slot = (slot + 1) & mask
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __setitem__(self, key, donor_id):
+        key_hash, fingerprint = key_hashes(key)
+        slot = self._find(key_hash, fingerprint)
+        current = self._ids[slot]
+        if current == AMBIGUOUS:
+            self._overflow[key] = donor_id
+        elif current not in (EMPTY, donor_id):
+            # A different donor with the same hash and fingerprint: stop
+            # trusting this slot. The old key isn't known, so it will be
+            # looked up in the database again.
+            self._ids[slot] = AMBIGUOUS
+            self._ambiguous += 1
+            self._overflow[key] = donor_id
+        elif current == EMPTY:
+            self._hashes[slot] = key_hash
+            self._fingerprints[slot] = fingerprint
+            self._ids[slot] = donor_id
+            self._used += 1
+            if self._used > (self._mask + 1) * MAX_LOAD:
+                self._grow()
+
+    def _grow(self):
+        hashes, fingerprints, ids = self._hashes, self._fingerprints, self._ids
+        size = 2 * (self._mask + 1)
+        self._mask = size - 1
+        self._hashes = array('q', bytes(8 * size))
+        self._fingerprints = array('Q', bytes(8 * size))
+        self._ids = array('i', bytes(4 * size))
+        for key_hash, fingerprint, donor_id in zip(hashes, fingerprints, ids):
+            if donor_id != EMPTY:
+                slot = self._find(key_hash, fingerprint)
+                self._hashes[slot] = key_hash
+                self._fingerprints[slot] = fingerprint
+                self._ids[slot] = donor_id
+
+    def nbytes(self):
+        """Approximate memory held by the slot arrays."""
+        return sum(a.itemsize * len(a) for a in (self._hashes, self._fingerprints, self._ids))
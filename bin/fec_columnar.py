@@ -0,0 +1,99 @@
+"""Optional columnar pre-filter for FEC individual contribution rows.
+
+A batch of split itcont rows is turned into NumPy string/number columns
+and the cheap filters of parse_itcont_row() (SUB_ID floor, committee ->
+candidate -> politician, amount, transaction type, OTHER_ID) are applied
+as array operations. Only rows that survive the mask are handed to the
+row parser, which builds the output tuples exactly as before.
+
+The mask is conservative: it only drops rows the row parser would return
+None for, so the output is identical to parsing every row. Anything the
+mask can't decide (unparseable amounts or SUB_IDs) is kept and left to
+the row parser.
+
+Needs numpy (`pip install numpy`); without it callers use the row loop.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for FEC_COLUMNAR=true
+    np = None
+
+
+def numpy_available():
+    return np is not None
+
+
+def string_column(rows, index):
+    """Column `index` of the rows as a NumPy string array ('' when missing)."""
+    return np.array([row[index] if len(row) > index else '' for row in rows], dtype=str)
+
+
+def numeric_column(values, dtype, missing):
+    """`values` converted to dtype; unparseable or empty entries become `missing`."""
+    try:
+        return np.where(values == '', '0', values).astype(dtype)
+    except (ValueError, OverflowError):
+        converted = []
+        for value in values:
+            try:
+                converted.append(dtype(value) if value else 0)
+            except (ValueError, OverflowError):
+                converted.append(missing)
+        return np.array(converted, dtype=dtype)
+
+
+def committee_array(cmte_to_cand, cand_to_politician):
+    """Sorted array of committee IDs that resolve to a known politician."""
+    return np.array(sorted(c for c, cand in cmte_to_cand.items() if cand in cand_to_politician), dtype=str)
+
+
+class ItcontColumns:
+    """Positions of the columns the mask reads, from the file's header list."""
+
+    def __init__(self, headers):
+        self.cmte_id = headers.index('CMTE_ID')
+        self.amndt_ind = headers.index('AMNDT_IND')
+        self.transaction_tp = headers.index('TRANSACTION_TP')
+        self.transaction_amt = headers.index('TRANSACTION_AMT')
+        self.other_id = headers.index('OTHER_ID')
+        self.tran_id = headers.index('TRAN_ID')
+        self.sub_id = headers.index('SUB_ID')
+
+
+def itcont_keep_mask(rows, columns, committees, sub_id_floor=0, amount_floor=2000.0):
+    """Boolean array, False where parse_itcont_row() would return None."""
+    mask = np.isin(string_column(rows, columns.cmte_id), committees)
+
+    if sub_id_floor:
+        # int64 holds every FEC SUB_ID; unparseable ones (-1) are kept
+        sub_ids = numeric_column(np.char.strip(string_column(rows, columns.sub_id)), np.int64, -1)
+        mask &= (sub_ids <= 0) | (sub_ids > sub_id_floor)
+
+    transaction_tp = np.char.upper(string_column(rows, columns.transaction_tp))
+    amounts = numeric_column(np.char.strip(string_column(rows, columns.transaction_amt)), np.float64, np.nan)
+    other_id = string_column(rows, columns.other_id)
+    qualifies = (
+        (amounts > amount_floor)
+        & np.char.startswith(transaction_tp, '15')
+        & ((other_id == '') | np.isin(transaction_tp, ('15E', '15Z')))
+    )
+    # Amendments and terminations can still delete an earlier version
+    amndt_ind = np.char.upper(np.char.strip(string_column(rows, columns.amndt_ind)))
+    has_tran_id = np.char.strip(string_column(rows, columns.tran_id)) != ''
+    # A bad amount raises before the marker is built, unless it's a 'T'
+    amendment = ((amndt_ind == 'T') | ((amndt_ind == 'A') & ~np.isnan(amounts))) & has_tran_id
+    return mask & (qualifies | amendment)
+
+
+def filter_rows(rows, parse_row, columns, committees, sub_id_floor=0):
+    """parse_row() over the rows that pass the columnar mask, dropping Nones."""
+    if not rows:
+        return []
+    keep = itcont_keep_mask(rows, columns, committees, sub_id_floor)
+    parsed = []
+    for index in np.flatnonzero(keep):
+        item = parse_row(rows[index])
+        if item is not None:
+            parsed.append(item)
+    return parsed
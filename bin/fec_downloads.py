@@ -0,0 +1,258 @@
+"""Download manager and local content cache for FEC bulk files.
+
+Files are stored under their SHA-256 in <cache>/objects/, and index.json
+remembers which URL (and which ETag/size of it) each object came from. A
+rerun asks the server for the current ETag and size with a HEAD request
+and reuses the local object when they match, so an unchanged cycle is
+never downloaded twice.
+
+Interrupted downloads stay in <cache>/partial/ and are resumed with an
+HTTP Range request (guarded by If-Range, so a file that changed upstream
+starts over). Completed objects are checked against Content-Length before
+they are hashed into the cache. Once the cache is over its byte limit,
+the least recently used objects are deleted.
+
+fetch_all() downloads with a small thread pool and hands results back in
+order, so the caller can parse one file while the next ones download. It
+runs at most `workers` downloads ahead of the caller, and every file it
+has fetched but the caller hasn't finished with is pinned: eviction skips
+it even when the cache is over its limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1 << 20
+
+
+def sha256_file(path):
+    """Hex SHA-256 of the file at `path`."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DownloadError(Exception):
+    """Raised when a download can't be completed or fails verification."""
+
+
+def _request(url, method="GET", headers=None, timeout=60):
+    request = urllib.request.Request(url, method=method, headers=headers or {})
+    return urllib.request.urlopen(request, timeout=timeout)
+
+
+class DownloadCache:
+    """Content-addressed cache of downloaded files rooted at `root`."""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(root, "objects")
+        self.partial_dir = os.path.join(root, "partial")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.partial_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._pinned = Counter()  # sha256 -> holders; never evicted
+
+    # --- index ---
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def object_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256)
+
+    def cached_path(self, url, etag=None, size=None, pin=False):
+        """Path of the cached copy of `url` if it matches etag/size, else None.
+        With `pin`, a returned path is pinned (see unpin)."""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            if etag is not None and entry.get("etag") != etag:
+                return None
+            if size is not None and entry.get("size") != size:
+                return None
+            path = self.object_path(entry["sha256"])
+            if not os.path.exists(path):
+                return None
+            entry["used_at"] = time.time()
+            if pin:
+                self._pinned[entry["sha256"]] += 1
+            self._save_index()
+            return path
+
+    def unpin(self, path):
+        """Releases a pin taken by fetch(pin=True) and evicts what is over the limit."""
+        with self._lock:
+            sha256 = os.path.basename(path)
+            self._pinned[sha256] -= 1
+            if self._pinned[sha256] <= 0:
+                del self._pinned[sha256]
+            self._evict(keep=None)
+            self._save_index()
+
+    # --- downloading ---
+
+    def fetch(self, url, pin=False):
+        """Returns a local path holding the current contents of `url`. With
+        `pin`, the file isn't evicted until unpin(path) is called."""
+        etag, size = self._probe(url)
+        # Without any validator there's no way to tell the copy is current
+        path = self.cached_path(url, etag, size, pin) if (etag or size) else None
+        if path is not None:
+            print(f"  Cache hit for {url}.")
+            return path
+
+        partial = os.path.join(self.partial_dir, hashlib.sha1(url.encode()).hexdigest())
+        self._download(url, partial, etag)
+
+        actual_size = os.path.getsize(partial)
+        if size is not None and actual_size != size:
+            os.remove(partial)
+            raise DownloadError(f"{url}: expected {size} bytes, got {actual_size}")
+
+        sha256 = sha256_file(partial)
+        path = self.object_path(sha256)
+        os.replace(partial, path)
+        self._discard_meta(partial)
+
+        with self._lock:
+            self._index[url] = {
+                "sha256": sha256,
+                "size": actual_size,
+                "etag": etag,
+                "fetched_at": time.time(),
+                "used_at": time.time(),
+            }
+            if pin:
+                self._pinned[sha256] += 1
+            self._evict(keep=sha256)
+            self._save_index()
+        return path
+
+    def _probe(self, url):
+        """(ETag, Content-Length) from a HEAD request; either may be None."""
+        try:
+            with _request(url, method="HEAD") as response:
+                length = response.headers.get("Content-Length")
+                return response.headers.get("ETag"), int(length) if length else None
+        except urllib.error.HTTPError as e:
+            if e.code in (403, 405, 501):  # HEAD not allowed; verify after GET
+                return None, None
+            raise
+
+    def _download(self, url, partial, etag):
+        """Downloads into `partial`, resuming a previous attempt when possible."""
+        meta_path = partial + ".json"
+        offset = 0
+        if os.path.exists(partial) and etag is not None:
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    if json.load(f).get("etag") == etag:
+                        offset = os.path.getsize(partial)
+            except (FileNotFoundError, ValueError):
+                pass
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag}, f)
+
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = etag
+        with _request(url, headers=headers) as response:
+            if offset and response.status == 206:
+                print(f"  Resuming {url} at byte {offset}.")
+                mode = "ab"
+            else:
+                mode = "wb"
+            with open(partial, mode) as out:
+                shutil.copyfileobj(response, out, CHUNK_SIZE)
+
+    def _discard_meta(self, partial):
+        try:
+            os.remove(partial + ".json")
+        except FileNotFoundError:
+            pass
+
+    # --- eviction ---
+
+    def _evict(self, keep):
+        """Drops least recently used objects until under max_bytes, skipping
+        `keep` and pinned objects. Caller holds the lock."""
+        entries = sorted(self._index.items(), key=lambda item: item[1].get("used_at", 0))
+        total = sum(entry["size"] for _, entry in entries)
+        for url, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry["sha256"] == keep or entry["sha256"] in self._pinned:
+                continue
+            del self._index[url]
+            total -= entry["size"]
+            if not any(other["sha256"] == entry["sha256"] for other in self._index.values()):
+                try:
+                    os.remove(self.object_path(entry["sha256"]))
+                except FileNotFoundError:
+                    pass
+            print(f"  Evicted {url} from the download cache.")
+
+    def fetch_all(self, urls, workers):
+        """Yields (url, path or exception) in `urls` order, downloading up to
+        `workers` files ahead of the consumer. A yielded path stays pinned
+        until the consumer asks for the next one."""
+        workers = max(1, workers)
+        remaining = iter(urls)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+
+            def submit_next():
+                for url in remaining:
+                    pending.append((url, pool.submit(self.fetch, url, True)))
+                    return
+
+            for _ in range(workers):
+                submit_next()
+            try:
+                while pending:
+                    url, future = pending.popleft()
+                    try:
+                        path = future.result()
+                    except Exception as e:
+                        submit_next()
+                        yield url, e
+                        continue
+                    submit_next()
+                    try:
+                        yield url, path
+                    finally:
+                        self.unpin(path)
+            finally:
+                # Consumer stopped early: release what was fetched for it
+                for _, future in pending:
+                    if not future.cancel():
+                        try:
+                            self.unpin(future.result())
+                        except Exception:
+                            pass
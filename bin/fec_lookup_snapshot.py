@@ -0,0 +1,170 @@
+"""Binary on-disk snapshots of the FEC committee lookups.
+
+load_fec_lookups() in populate_donors_and_donations.py used to rebuild
+the committee-name and committee-to-candidate dicts by parsing every cm
+and ccl archive on each run. load_or_build() compiles a lookup once and
+writes it to <root>/<kind>-<digest>.snap. The digest covers the snapshot
+format version and the name and SHA-256 of every input archive, so any
+changed input produces a new snapshot and old ones are removed.
+
+Layout, little-endian, keys sorted by their UTF-8 bytes:
+
+    8s          magic b'PTFECLK\\0'
+    I           format version
+    I           entry count n
+    (n + 1) I   key offsets into the key blob
+    (n + 1) I   value offsets into the value blob
+    key blob, value blob
+
+SnapshotMap reads the file through mmap and answers lookups with a binary
+search, without loading it. to_dict() turns it into a plain dict for hot
+loops, which takes milliseconds.
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+MAGIC = b'PTFECLK\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+
+
+class SnapshotError(Exception):
+    """Raised for a missing, truncated or incompatible snapshot file."""
+
+
+def snapshot_digest(kind, archives):
+    """Hex digest naming the snapshot of `kind` built from `archives`,
+    a list of (file name, archive sha256)."""
+    digest = hashlib.sha256(f"{kind}:{VERSION}".encode())
+    for name, sha256 in sorted(archives):
+        digest.update(f"\n{name}:{sha256}".encode())
+    return digest.hexdigest()[:32]
+
+
+def write_snapshot(path, mapping):
+    """Writes {str: str} `mapping` to `path` atomically."""
+    items = sorted((str(k).encode('utf-8'), str(v).encode('utf-8')) for k, v in mapping.items())
+    key_offsets, value_offsets = [0], [0]
+    for key, value in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+    offsets = struct.Struct(f'<{len(items) + 1}I')
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(items)))
+        f.write(offsets.pack(*key_offsets))
+        f.write(offsets.pack(*value_offsets))
+        f.write(b''.join(key for key, _ in items))
+        f.write(b''.join(value for _, value in items))
+    os.replace(tmp_path, path)
+
+
+class SnapshotMap(Mapping):
+    """Read-only mapping over a snapshot file, backed by mmap."""
+
+    def __init__(self, path):
+        try:
+            with open(path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"can't map {path}: {e}") from e
+        try:
+            magic, version, count = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise SnapshotError(f"{path} isn't a version {VERSION} snapshot")
+            offsets = struct.Struct(f'<{count + 1}I')
+            self._count = count
+            self._key_offsets = offsets.unpack_from(self._mm, HEADER.size)
+            self._value_offsets = offsets.unpack_from(self._mm, HEADER.size + offsets.size)
+            self._keys_start = HEADER.size + 2 * offsets.size
+            self._values_start = self._keys_start + self._key_offsets[-1]
+            if self._values_start + self._value_offsets[-1] != len(self._mm):
+                raise SnapshotError(f"{path} is truncated")
+        except struct.error as e:
+            self._mm.close()
+            raise SnapshotError(f"{path} is truncated") from e
+        except SnapshotError:
+            self._mm.close()
+            raise
+        self._sorted_keys = _KeyView(self)
+
+    def _key(self, index):
+        start = self._keys_start
+        return self._mm[start + self._key_offsets[index]:start + self._key_offsets[index + 1]]
+
+    def _value(self, index):
+        start = self._values_start
+        return self._mm[start + self._value_offsets[index]:start + self._value_offsets[index + 1]].decode('utf-8')
+
+    def __getitem__(self, key):
+        encoded = str(key).encode('utf-8')
+        index = bisect.bisect_left(self._sorted_keys, encoded)
+        if index < self._count and self._key(index) == encoded:
+            return self._value(index)
+        raise KeyError(key)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._key(index).decode('utf-8')
+
+    def to_dict(self):
+        return {self._key(i).decode('utf-8'): self._value(i) for i in range(self._count)}
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _KeyView:
+    """Sequence of encoded keys, so bisect can search the mapped file."""
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __len__(self):
+        return self._snapshot._count
+
+    def __getitem__(self, index):
+        return self._snapshot._key(index)
+
+
+def load_or_build(root, kind, archives, build):
+    """The lookup of `kind` for `archives` as a dict: read from its snapshot
+    when one exists, else built. build() returns (mapping, complete); the
+    snapshot is only written for a complete mapping."""
+    digest = snapshot_digest(kind, archives)
+    path = os.path.join(root, f"{kind}-{digest}.snap")
+    try:
+        with SnapshotMap(path) as snapshot:
+            mapping = snapshot.to_dict()
+        print(f"Loaded {kind} lookup from snapshot {os.path.basename(path)}.")
+        return mapping
+    except SnapshotError:
+        pass
+
+    mapping, complete = build()
+    if not complete:
+        return mapping
+    os.makedirs(root, exist_ok=True)
+    write_snapshot(path, mapping)
+    for name in os.listdir(root):
+        if name.startswith(f"{kind}-") and name.endswith(".snap") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(root, name))
+            except FileNotFoundError:
+                pass
+    return mapping
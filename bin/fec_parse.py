@@ -0,0 +1,124 @@
+"""Parallel parsing of pipe-delimited FEC bulk files.
+
+A decompressed data file is cut into byte ranges that start and end on
+line boundaries. A pool of worker processes each parses whole ranges with
+the caller's row function, and the parent, the single writer, receives
+the parsed rows in file order.
+
+Workers are forked, so module-level lookups the row function reads (the
+committee and candidate maps in populate_donors_and_donations.py) are
+inherited copy-on-write instead of being pickled into every task. Only
+(path, start, end) goes out and only the qualifying rows come back.
+
+Instead of a per-row function, callers may pass `parse_rows`, which gets
+lists of up to BATCH_ROWS split rows and returns the parsed items (the
+columnar filter in fec_columnar.py works this way).
+"""
+
+import csv
+import mmap
+import multiprocessing
+import os
+import shutil
+import zipfile
+from collections import deque
+
+BATCH_ROWS = 10000
+
+
+def extract_data_file(zip_path, dest_dir):
+    """Decompresses the .txt member of an FEC zip into dest_dir. Returns its path."""
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        member = [f for f in zf.namelist() if f.endswith('.txt')][0]
+        dest = os.path.join(dest_dir, os.path.basename(zip_path) + '.' + os.path.basename(member))
+        with zf.open(member, 'r') as src, open(dest, 'wb') as out:
+            shutil.copyfileobj(src, out, 1 << 20)
+    return dest
+
+
+def shard_ranges(path, shard_bytes):
+    """[(start, end), ...] byte ranges of roughly shard_bytes, each ending
+    just after a newline (or at EOF), covering the whole file."""
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = start + shard_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()  # run on to the end of the current line
+                end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def read_shard_lines(path, start, end):
+    """Decoded lines of the byte range [start, end), read through a
+    read-only mmap so every worker reads the file from the page cache.
+
+    Not zero-copy: readline() copies each line out of the map as bytes, and
+    csv needs it decoded to str, which is a second copy. The map only saves
+    the read() buffers and the re-inflation of the zip."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.seek(start)
+        while mm.tell() < end:
+            line = mm.readline()
+            if not line:
+                break
+            yield line.decode('latin-1')
+
+
+def parse_shard(task):
+    """Worker entry point: parse_row() over every row of one shard, or
+    parse_rows() over batches of them."""
+    parse_row, parse_rows, path, start, end = task
+    parsed = []
+    rows = 0
+    batch = []
+    for row in csv.reader(read_shard_lines(path, start, end), delimiter='|'):
+        rows += 1
+        if parse_rows is not None:
+            batch.append(row)
+            if len(batch) == BATCH_ROWS:
+                parsed.extend(parse_rows(batch))
+                batch = []
+            continue
+        item = parse_row(row)
+        if item is not None:
+            parsed.append(item)
+    if batch:
+        parsed.extend(parse_rows(batch))
+    return rows, parsed
+
+
+def fork_available():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def parse_file_parallel(path, parse_row, workers, shard_bytes, parse_rows=None):
+    """Yields (rows_read, parsed_items) per shard, in file order.
+
+    At most 2 * workers shards are in flight, so a slow writer holds back
+    the parsers rather than letting results pile up in memory.
+    `parse_row` (and `parse_rows`) must be module-level functions; they
+    run in the workers.
+    """
+    ranges = shard_ranges(path, shard_bytes)
+    context = multiprocessing.get_context('fork')
+    with context.Pool(processes=workers) as pool:
+        in_flight = deque()
+        tasks = iter(ranges)
+        for start, end in tasks:
+            in_flight.append(pool.apply_async(parse_shard, ((parse_row, parse_rows, path, start, end),)))
+            if len(in_flight) >= 2 * workers:
+                break
+        while in_flight:
+            result = in_flight.popleft().get()
+            next_range = next(tasks, None)
+            if next_range is not None:
+                in_flight.append(pool.apply_async(parse_shard, ((parse_row, parse_rows, path) + next_range,)))
+            yield result
@@ -0,0 +1,112 @@
+"""Decompressed copies of FEC zip archives, read through mmap.
+
+The bin/ scripts used to re-inflate the same cm, ccl, cn, pas2 and itcont
+zips through zipfile on every run. TextCache keeps each archive's .txt
+payload decompressed once under <root>/<sha256 of the zip>.txt. Readers
+map that file instead, so reruns, the parallel parser's workers and other
+scripts share one copy of the file through the page cache (each line is
+still copied out of the map and decoded before csv splits it).
+
+Hashing a multi-GB zip on every run would cost almost as much as
+inflating it, so stamps.json remembers the hash per (path, size, mtime).
+Files are written under a temporary name and renamed into place, so two
+processes materializing the same archive can't see a partial file. Once
+the cache is over max_bytes, the least recently used payloads are deleted.
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+from bin.fec_downloads import sha256_file
+from bin.fec_parse import extract_data_file, read_shard_lines
+
+
+class TextCache:
+    """Cache of decompressed FEC payloads rooted at `root`."""
+
+    def __init__(self, root, max_bytes):
+        # Directories are created on first write, so importing a script that
+        # builds a TextCache at module level has no side effects
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stamps_path = os.path.join(root, "stamps.json")
+
+    def _load_stamps(self):
+        try:
+            with open(self.stamps_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_stamps(self, stamps):
+        tmp_path = f"{self.stamps_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stamps, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.stamps_path)
+
+    def archive_hash(self, zip_path):
+        """SHA-256 of the zip, recomputed only when its size or mtime changed."""
+        zip_path = os.path.abspath(zip_path)
+        stat = os.stat(zip_path)
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        stamps = self._load_stamps()
+        entry = stamps.get(zip_path)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+        sha256 = sha256_file(zip_path)
+        os.makedirs(self.root, exist_ok=True)
+        stamps = self._load_stamps()
+        stamps[zip_path] = stamp + [sha256]
+        self._save_stamps(stamps)
+        return sha256
+
+    def text_path(self, zip_path):
+        """Path of the decompressed payload of `zip_path`, extracting it if needed."""
+        path = os.path.join(self.root, self.archive_hash(zip_path) + ".txt")
+        if os.path.exists(path):
+            os.utime(path)  # mtime is the LRU clock
+            return path
+        print(f"  Decompressing {os.path.basename(zip_path)} into the text cache...")
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix="extract-", dir=self.root)
+        try:
+            os.replace(extract_data_file(zip_path, tmp_dir), path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._evict(keep=path)
+        return path
+
+    def read_rows(self, zip_path):
+        """csv rows of the archive's pipe-delimited payload, read from the mapped file."""
+        path = self.text_path(zip_path)
+        size = os.path.getsize(path)
+        if not size:
+            return iter(())
+        return csv.reader(read_shard_lines(path, 0, size), delimiter='|')
+
+    def _evict(self, keep):
+        """Deletes least recently used payloads until under max_bytes."""
+        payloads = []
+        for name in os.listdir(self.root):
+            if name.endswith(".txt"):
+                path = os.path.join(self.root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                payloads.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in payloads)
+        for _, size, path in sorted(payloads):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            print(f"  Evicted {os.path.basename(path)} from the text cache.")
@@ -0,0 +1,79 @@
+"""COPY FROM STDIN helpers shared by the bin/populate_* scripts.
+
+COPY streams rows to Postgres in CSV without building the giant VALUES
+strings execute_values produces. Rows usually land in an UNLOGGED
+staging table first and are merged into the real table with one
+INSERT ... SELECT ... ON CONFLICT, so the constraint checks are set-based
+and a bad batch never leaves half its rows behind.
+"""
+
+import io
+
+
+def csv_field(value):
+    """One COPY CSV field. None is an unquoted empty field, which COPY reads
+    as NULL; everything else is quoted, so '' stays an empty string."""
+    if value is None:
+        return ''
+    text = str(value)
+    return '"' + text.replace('"', '""') + '"'
+
+
+def csv_line(row):
+    return ','.join(csv_field(value) for value in row) + '\n'
+
+
+class RowStream(io.TextIOBase):
+    """Read-only text file over an iterable of rows, formatted as COPY CSV.
+
+    copy_expert() pulls from it in blocks, so rows are generated as
+    Postgres consumes them and never all held in memory at once.
+    """
+
+    def __init__(self, rows):
+        self._lines = (csv_line(row) for row in rows)
+        self._buffer = ''
+        self.rows_written = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = float('inf')
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self.rows_written += 1
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size == float('inf'):
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_rows(cur, table, columns, rows):
+    """COPYs `rows` (tuples in `columns` order) into `table`. Returns the row count."""
+    stream = RowStream(rows)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        stream,
+        size=1 << 16,
+    )
+    return stream.rows_written
+
+
+def create_staging_table(cur, name, column_defs):
+    """Creates (or empties) an UNLOGGED staging table.
+
+    Unlogged tables skip the WAL, which is most of the cost of a bulk
+    write; they are emptied after a crash, which is fine for scratch data.
+    """
+    cur.execute(f"CREATE UNLOGGED TABLE IF NOT EXISTS {name} ({column_defs});")
+    cur.execute(f"TRUNCATE {name};")
@@ -0,0 +1,136 @@
+"""Declarative partitioning helpers shared by the bin/populate_* scripts.
+
+Votes are partitioned by Congress and Donations by FEC election cycle,
+both BY LIST with one partition per value, named <table>_<value> (e.g.
+donations_2024). Rows with no partition for their value, or a NULL one,
+land in <table>_default.
+
+An unpartitioned table from an older schema is moved aside with
+set_aside_table() so the partitioned one can take its name (and its index
+and sequence names) while its rows are copied over.
+
+A partition can be replaced as a unit: load the new rows into a table made
+by create_load_table(), then swap_partition() detaches and drops the old
+partition and attaches the loaded table in one transaction. Readers see
+either the old rows or the new ones. detach_partition() takes a partition
+out of the parent but keeps its table, to archive old cycles.
+
+Table and column names are the scripts' own constants, and partition
+values are cast to int before they are put into DDL.
+"""
+
+import re
+
+BOUND = re.compile(r"FOR VALUES IN \((-?\d+)\)")
+
+
+def table_exists(cur, table):
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL;", (table,))
+    return cur.fetchone()[0]
+
+
+def is_partitioned(cur, table):
+    """True if `table` exists and is a partitioned table."""
+    cur.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s);", (table,))
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+
+def set_aside_table(cur, table, suffix):
+    """Renames `table`, its indexes and the sequences it owns to
+    <name>_<suffix>, freeing their names for a replacement table. Returns
+    the table's new name."""
+    cur.execute("""
+        SELECT c.relname, c.relkind
+        FROM pg_class c
+        WHERE c.oid IN (SELECT indexrelid FROM pg_index WHERE indrelid = to_regclass(%s))
+           OR (c.relkind = 'S' AND c.oid IN (SELECT objid FROM pg_depend
+                                             WHERE refobjid = to_regclass(%s) AND classid = 'pg_class'::regclass));
+    """, (table, table))
+    for name, kind in cur.fetchall():
+        cur.execute(f"ALTER {'SEQUENCE' if kind == 'S' else 'INDEX'} {name} RENAME TO {name}_{suffix};")
+    new_name = f"{table.lower()}_{suffix}"
+    cur.execute(f"ALTER TABLE {table} RENAME TO {new_name};")
+    return new_name
+
+
+def partition_name(table, value):
+    return f"{table.lower()}_{int(value)}"
+
+
+def ensure_default_partition(cur, table):
+    cur.execute(f"CREATE TABLE IF NOT EXISTS {table.lower()}_default PARTITION OF {table} DEFAULT;")
+
+
+def ensure_partition(cur, table, value):
+    """Creates the partition of `table` for `value` if it doesn't exist.
+    Returns its name."""
+    name = partition_name(table, value)
+    cur.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES IN ({int(value)});")
+    return name
+
+
+def partitions(cur, table):
+    """{value: partition name} of the list partitions attached to `table`."""
+    cur.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s);
+    """, (table,))
+    found = {}
+    for name, bound in cur.fetchall():
+        match = BOUND.fullmatch(bound or '')
+        if match:
+            found[int(match.group(1))] = name
+    return found
+
+
+def detach_partition(cur, table, value):
+    """Detaches the partition for `value` from `table`, keeping its table.
+    Returns the detached table's name, or None if there was no partition."""
+    name = partitions(cur, table).get(int(value))
+    if name:
+        cur.execute(f"ALTER TABLE {table} DETACH PARTITION {name};")
+    return name
+
+
+def create_load_table(cur, table, column, value):
+    """Creates an empty standalone table shaped like `table` (columns,
+    defaults and indexes) to load the rows of one partition into. Its CHECK
+    matches the partition bound, so attaching it needn't scan it again."""
+    name = f"{partition_name(table, value)}_load"
+    cur.execute(f"DROP TABLE IF EXISTS {name};")
+    cur.execute(f"""
+        CREATE TABLE {name} (
+            LIKE {table} INCLUDING DEFAULTS INCLUDING INDEXES,
+            CHECK ({column} IS NOT NULL AND {column} = {int(value)})
+        );
+    """)
+    return name
+
+
+def swap_partition(cur, table, value, loaded_table):
+    """Replaces the partition of `table` for `value` with `loaded_table`.
+    The caller commits, so the swap is atomic."""
+    old = detach_partition(cur, table, value)
+    if old:
+        cur.execute(f"DROP TABLE {old};")
+    name = partition_name(table, value)
+    cur.execute(f"ALTER TABLE {loaded_table} RENAME TO {name};")
+    cur.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES IN ({int(value)});")
+    return name
+
+
+def cluster_partitions(cur, index):
+    """CLUSTERs each partition on its part of the partitioned `index`
+    (CLUSTER on the partitioned table itself needs PostgreSQL 15)."""
+    cur.execute("""
+        SELECT t.relname, i.relname
+        FROM pg_inherits h
+        JOIN pg_class i ON i.oid = h.inhrelid
+        JOIN pg_index x ON x.indexrelid = i.oid
+        JOIN pg_class t ON t.oid = x.indrelid
+        WHERE h.inhparent = to_regclass(%s);
+    """, (index,))
+    for table, partition_index in cur.fetchall():
+        cur.execute(f"CLUSTER {table} USING {partition_index};")
@@ -10,6 +10,7 @@ from psycopg2.extras import execute_values
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 import app.config as config   # Imports your configuration file
+from app.derived import bump_data_version, refresh_bill_subjects
 
 # --- CONFIGURATION ---
 # All config is now pulled from test.py
@@ -33,11 +34,20 @@ def create_bills_table_if_not_exists(conn):
                 Title TEXT,
                 DateIntroduced DATE,
                 Congress INT,
-                subjects TEXT[]
+                subjects TEXT[],
+                BillType TEXT
             );
         """)
+        # Tables created before BillType existed
+        cur.execute("ALTER TABLE Bills ADD COLUMN IF NOT EXISTS BillType TEXT;")
         # Create the index
         cur.execute("CREATE INDEX IF NOT EXISTS idx_bills_congress ON Bills (Congress);")
+        # Bill type filter of /api/politician/<id>/votes
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_bills_type_congress ON Bills (BillType, Congress);")
+        # Subject overlap filter (subjects && ARRAY[...]) of the same endpoint
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_bills_subjects_gin ON Bills USING GIN (subjects);")
+        # Sort/keyset order of /api/politician/<id>/votes
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_bills_date_id ON Bills (DateIntroduced, BillID);")
         conn.commit()
         print("Table 'Bills' is ready.")
     except Exception as e:
@@ -139,8 +149,8 @@ def parse_and_insert_enacted_laws_fast(base_path):
                                                 except: pass
                                                 
                                             if bill_num_ins and bill_num_ins != 'NoneNone':
-                                                # Add tuple with 5 values
-                                                laws_for_this_congress.append((bill_num_ins, b_title, date_intro, congress_num, subjects_list))
+                                                # Add tuple with 6 values; BillType is the lowercased type code ('hr', 'sjres', ...)
+                                                laws_for_this_congress.append((bill_num_ins, b_title, date_intro, congress_num, subjects_list, b_type.lower() or None))
 
                                     except (ET.ParseError, Exception) as file_err: 
                                         # print(f"Warning: Error parsing {member_filename}: {file_err}") # Uncomment for deep debug
@@ -151,9 +161,9 @@ def parse_and_insert_enacted_laws_fast(base_path):
             # Batch insert after processing all zips for this Congress
             if laws_for_this_congress:
                 print(f"Found {len(laws_for_this_congress)} enacted laws for Congress {congress_num}. Batch inserting...")
-                # SQL now includes the 'subjects' column
+                # SQL now includes the 'subjects' and 'BillType' columns
                 sql = """
-                    INSERT INTO Bills (BillNumber, Title, DateIntroduced, Congress, subjects)
+                    INSERT INTO Bills (BillNumber, Title, DateIntroduced, Congress, subjects, BillType)
                     VALUES %s
                     ON CONFLICT (BillNumber) DO NOTHING;
                 """
@@ -173,6 +183,8 @@ def parse_and_insert_enacted_laws_fast(base_path):
         print(f"Processed {total_xml_files_processed} XML files from all ZIP archives.")
         cur.execute("SELECT COUNT(*) FROM Bills;"); final_count = cur.fetchone()[0]
         print(f"Successfully inserted {final_count} unique laws.")
+        refresh_bill_subjects(conn)
+        bump_data_version(conn, 'bills')
         print(f"Total execution time: {overall_end_time - overall_start_time:.2f}s.")
 
     except psycopg2.OperationalError as db_conn_err: print(f"--- DB CONNECTION ERROR --- Error: {db_conn_err}")
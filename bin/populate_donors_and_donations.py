@@ -1,16 +1,22 @@
 import os
-import zipfile
-import io
+import sys
 import csv # <--- Make sure this is imported
 import psycopg2
 import time
-import requests
-from psycopg2.extras import execute_values
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 import app.config as config  # Imports your configuration file
+from app.derived import bump_data_version, ensure_politician_industry_totals, refresh_politician_industry_totals
+from bin.fec_downloads import DownloadCache, sha256_file
+from bin import fec_columnar
+from bin.donor_index import DonorKeyIndex
+from bin.fec_parse import fork_available, parse_file_parallel
+from bin.fec_lookup_snapshot import load_or_build
+from bin.fec_text_cache import TextCache
+from bin.pg_copy import copy_rows, create_staging_table
+from bin.pg_partitions import (create_load_table, detach_partition, ensure_default_partition, ensure_partition,
+                               is_partitioned, partitions, set_aside_table, swap_partition, table_exists)
 import traceback
-import sys # <--- ADD THIS IMPORT
 
 # --- INCREASE CSV FIELD SIZE LIMIT ---
 # ADD THESE TWO LINES:
@@ -22,18 +28,53 @@ csv.field_size_limit(max_int)
 # All config is now pulled from test.py
 FEC_DATA_FOLDER_PATH = config.FEC_DATA_FOLDER_PATH
 BATCH_SIZE = 5000
+# Parsed donations are flushed to the DB every FEC_CHUNK_ROWS rows, which
+# caps memory per file regardless of cycle size
+FEC_CHUNK_ROWS = config.FEC_CHUNK_ROWS
+# Parser processes per file (1 = parse in this process) and shard size
+FEC_PARSE_WORKERS = config.FEC_PARSE_WORKERS
+FEC_SHARD_BYTES = config.FEC_SHARD_BYTES
+# Pre-filter itcont rows with NumPy column operations (needs numpy)
+FEC_COLUMNAR = config.FEC_COLUMNAR
+# itcont zips are kept in a content-addressed cache instead of being deleted
+FEC_DOWNLOAD_CACHE_PATH = config.FEC_DOWNLOAD_CACHE_PATH
+FEC_DOWNLOAD_CACHE_BYTES = config.FEC_DOWNLOAD_CACHE_BYTES
+FEC_DOWNLOAD_WORKERS = config.FEC_DOWNLOAD_WORKERS
+FEC_LOOKUP_SNAPSHOT_PATH = config.FEC_LOOKUP_SNAPSHOT_PATH
+# Zips are decompressed once into this cache and read through mmap
+text_cache = TextCache(config.FEC_TEXT_CACHE_PATH, config.FEC_TEXT_CACHE_BYTES)
+DONATION_COLUMNS = ('DonorID', 'PoliticianID', 'Amount', 'Date', 'ContributionType', 'SubID', 'TranKey')
+# Incremental mode keeps existing rows and only applies what's new in each
+# file. Also enabled with --incremental on the command line.
+FEC_INCREMENTAL = config.FEC_INCREMENTAL or '--incremental' in sys.argv[1:]
+
+def cycle_option(name, default):
+    # --<name>=YYYY on the command line, else the config value (0 = off)
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='): return int(arg.split('=', 1)[1])
+    return default
+
+# Reload only this cycle's files into a new partition and swap it in
+FEC_RELOAD_CYCLE = cycle_option('reload-cycle', config.FEC_RELOAD_CYCLE)
+# Detach the partitions of cycles before this one, keeping their tables
+FEC_DETACH_BEFORE_CYCLE = cycle_option('detach-before-cycle', config.FEC_DETACH_BEFORE_CYCLE)
 
 # --- Global Lookups ---
 fec_id_to_politician_id_lookup = {} # { fec_candidate_id: politician_id }
 fec_committee_name_lookup = {}      # { fec_committee_id: 'Committee Name' }
 fec_cmte_to_cand_id_lookup = {}     # { fec_committee_id: fec_candidate_id }
-donor_db_lookup = {}                # { (lower_donor_name, lower_type, lower_employer, state): donor_id }
+donor_db_lookup = DonorKeyIndex()   # { (lower_donor_name, lower_type, lower_employer, state): donor_id }, hashed
+sub_id_floor = 0                    # rows with SUB_ID <= this were applied by an earlier run of the same file
+donations_table = 'Donations'       # where donations are written; a cycle's load table during a cycle reload
+failed_files = []                   # FEC files that couldn't be downloaded or loaded this run
+itcont_committees = None            # fec_columnar.committee_array() of the lookups, built once they're loaded
 
 # --- FEC Data File Headers (Simplified) ---
 CM_HEADERS = ['CMTE_ID', 'CMTE_NM', 'CMTE_PTY_AFFILIATION', 'CMTE_TP']
 CCL_HEADERS = ['CAND_ID', 'CAND_ELECTION_YR', 'FEC_ELECTION_YR', 'CMTE_ID', 'CMTE_TP', 'CMTE_DSGN', 'LINKAGE_ID']
 PAS2_HEADERS = ['CMTE_ID', 'AMNDT_IND', 'RPT_TP', 'TRANSACTION_PGI', 'IMAGE_NUM', 'TRANSACTION_TP', 'ENTITY_TP', 'NAME', 'CITY', 'STATE', 'ZIP_CODE', 'EMPLOYER', 'OCCUPATION', 'TRANSACTION_DT', 'TRANSACTION_AMT', 'OTHER_ID', 'CAND_ID', 'TRAN_ID', 'FILE_NUM', 'MEMO_CD', 'MEMO_TEXT', 'SUB_ID']
 ITCONT_HEADERS = ['CMTE_ID', 'AMNDT_IND', 'RPT_TP', 'TRANSACTION_PGI', 'IMAGE_NUM', 'TRANSACTION_TP', 'ENTITY_TP', 'NAME', 'CITY', 'STATE', 'ZIP_CODE', 'EMPLOYER', 'OCCUPATION', 'TRANSACTION_DT', 'TRANSACTION_AMT', 'OTHER_ID', 'TRAN_ID', 'FILE_NUM', 'MEMO_CD', 'MEMO_TEXT', 'SUB_ID']
+ITCONT_COLUMNS = fec_columnar.ItcontColumns(ITCONT_HEADERS)
 
 # URLs for the individual contribution files
 # --- ALL FILES ARE ACTIVE ---
@@ -61,8 +102,75 @@ def parse_fec_date(date_str):
     except: return None
 
 # --- Database Functions ---
+# Donations is partitioned by FEC cycle. Its keys must include the
+# partition key: the primary key is (DonationID, Cycle), and duplicates are
+# detected within a cycle.
+DONATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS Donations (
+        DonationID SERIAL,
+        DonorID INT REFERENCES Donors(DonorID) ON DELETE CASCADE,
+        PoliticianID INT REFERENCES Politicians(PoliticianID) ON DELETE CASCADE,
+        Amount NUMERIC(12, 2),
+        Date DATE,
+        ContributionType TEXT,
+        SubID BIGINT,
+        TranKey TEXT,
+        Cycle INT NOT NULL,
+        PRIMARY KEY (DonationID, Cycle),
+        UNIQUE(DonorID, PoliticianID, Amount, Date, Cycle)
+    ) PARTITION BY LIST (Cycle);
+"""
+
+def partition_donations_by_cycle(cur):
+    # Moves the rows of an unpartitioned Donations table (older schema) into
+    # the partitioned one. A row's cycle is that of the FEC file it was
+    # loaded from: the fec_loaded_files entry whose SUB_ID range holds its
+    # SubID. Rows without exactly one such cycle can't be placed. A full
+    # load, which reloads every cycle anyway, leaves them out; other modes
+    # raise before moving anything and ask for a full load.
+    # politician_industry_totals reads Donations, so it is dropped before the
+    # swap and rebuilt over the partitioned table once the rows are in.
+    print("Moving 'Donations' into a table partitioned by FEC cycle...")
+    columns = ', '.join(DONATION_COLUMNS)
+    cur.execute("ALTER TABLE Donations ADD COLUMN IF NOT EXISTS SubID BIGINT;")
+    cur.execute("ALTER TABLE Donations ADD COLUMN IF NOT EXISTS TranKey TEXT;")
+    cur.execute("""
+        CREATE TEMP TABLE donation_cycles ON COMMIT DROP AS
+        SELECT d.DonationID, MIN(f.cycle) AS cycle, COUNT(DISTINCT f.cycle) AS cycles
+        FROM Donations d
+        LEFT JOIN fec_loaded_files f ON d.SubID BETWEEN f.min_sub_id AND f.max_sub_id
+        GROUP BY d.DonationID;
+    """)
+    cur.execute("SELECT COUNT(*) FROM donation_cycles WHERE cycles <> 1;")
+    unplaced = cur.fetchone()[0]
+    if unplaced and (FEC_INCREMENTAL or FEC_RELOAD_CYCLE):
+        raise RuntimeError(f"{unplaced} rows of the unpartitioned 'Donations' table can't be traced to the cycle of an "
+                           "FEC file in fec_loaded_files. Run a full (non-incremental) load to rebuild Donations.")
+    if unplaced:
+        print(f"  {unplaced} donations can't be traced to the cycle of a loaded FEC file. Leaving them out; this full load reloads every cycle.")
+    had_totals = table_exists(cur, 'politician_industry_totals')
+    cur.execute("DROP MATERIALIZED VIEW IF EXISTS politician_industry_totals;")
+    old_table = set_aside_table(cur, 'Donations', 'unpartitioned')
+    cur.execute(DONATIONS_TABLE_SQL)
+    ensure_default_partition(cur, 'Donations')
+    cur.execute("SELECT DISTINCT cycle FROM donation_cycles WHERE cycles = 1;")
+    for (cycle,) in cur.fetchall(): ensure_partition(cur, 'Donations', cycle)
+    cur.execute(f"""
+        INSERT INTO Donations (DonationID, {columns}, Cycle)
+        SELECT d.DonationID, {', '.join('d.' + column for column in DONATION_COLUMNS)}, c.cycle
+        FROM {old_table} d JOIN donation_cycles c ON c.DonationID = d.DonationID AND c.cycles = 1;
+    """)
+    print(f"  Moved {cur.rowcount} donations.")
+    cur.execute("SELECT setval('donations_donationid_seq', COALESCE((SELECT MAX(DonationID) FROM Donations), 0) + 1, false);")
+    cur.execute(f"DROP TABLE {old_table};")
+    if had_totals:
+        # Commits the move along with the view
+        ensure_politician_industry_totals(cur.connection)
+        refresh_politician_industry_totals(cur.connection)
+
 def create_tables_if_not_exists(conn):
-    """Creates the Donors and Donations tables if they don't already exist."""
+    """Creates the Donors and Donations tables if they don't already exist.
+    An unpartitioned Donations table is moved to the partitioned schema."""
     print("Ensuring 'Donors' and 'Donations' tables exist...")
     try:
         cur = conn.cursor()
@@ -77,20 +185,36 @@ def create_tables_if_not_exists(conn):
                 UNIQUE(Name, DonorType, Employer, State)
             );
         """)
-        # Donations Table
+        # One row per FEC file version loaded
         cur.execute("""
-            CREATE TABLE IF NOT EXISTS Donations (
-                DonationID SERIAL PRIMARY KEY,
-                DonorID INT REFERENCES Donors(DonorID) ON DELETE CASCADE,
-                PoliticianID INT REFERENCES Politicians(PoliticianID) ON DELETE CASCADE,
-                Amount NUMERIC(12, 2),
-                Date DATE,
-                ContributionType TEXT,
-                UNIQUE(DonorID, PoliticianID, Amount, Date)
+            CREATE TABLE IF NOT EXISTS fec_loaded_files (
+                file_name TEXT NOT NULL,
+                cycle INT,
+                sha256 TEXT NOT NULL,
+                min_sub_id BIGINT,
+                max_sub_id BIGINT,
+                donation_rows BIGINT,
+                loaded_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (file_name, sha256)
             );
         """)
+        # Donations Table
+        if table_exists(cur, 'Donations') and not is_partitioned(cur, 'Donations'):
+            partition_donations_by_cycle(cur)
+        cur.execute(DONATIONS_TABLE_SQL)
+        ensure_default_partition(cur, 'Donations')
+        # FEC row identity, used by incremental loads: SUB_ID is unique per
+        # row, and amendments reuse the committee's TRAN_ID ('CMTE_ID:TRAN_ID')
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_donations_sub_id ON Donations (SubID, Cycle);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_donations_tran_key ON Donations (TranKey);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_donations_donor_id ON Donations (DonorID);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_donations_politician_id ON Donations (PoliticianID);")
+        # Indexes for /api/donors/search: trigram GIN on Name and Employer
+        # serve the ILIKE filters, and State is an equality filter.
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_donors_name_trgm ON Donors USING GIN (Name gin_trgm_ops);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_donors_employer_trgm ON Donors USING GIN (Employer gin_trgm_ops);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_donors_state ON Donors (State);")
         conn.commit()
         print("Tables 'Donors' and 'Donations' are ready.")
     except Exception as e:
@@ -100,13 +224,50 @@ def clear_donation_tables(conn):
     # Clears Donors and Donations tables.
     print("Clearing 'Donations' and 'Donors' tables..."); cur = conn.cursor()
     try:
-        cur.execute("DELETE FROM Donations;"); cur.execute("DELETE FROM Donors;");
+        cur.execute("TRUNCATE Donations;"); cur.execute("DELETE FROM Donors;"); cur.execute("DELETE FROM fec_loaded_files;");
         cur.execute("ALTER SEQUENCE Donations_DonationID_seq RESTART WITH 1;");
         cur.execute("ALTER SEQUENCE Donors_DonorID_seq RESTART WITH 1;");
         conn.commit(); print("Tables cleared successfully.")
     except Exception as e: print(f"Error clearing tables: {e}"); conn.rollback(); raise e
     finally: cur.close()
 
+def lookup_archives(fec_folder_path, filenames):
+    # [(filename, sha256)] identifying the inputs of a lookup snapshot
+    return [(f, text_cache.archive_hash(os.path.join(fec_folder_path, f))) for f in filenames]
+
+def read_committee_names(fec_folder_path, cm_files):
+    # ({ fec_committee_id: 'Committee Name' }, complete) parsed from the cm
+    # zips, later files winning. complete is False if a file couldn't be
+    # read, so no snapshot is written for the partial lookup.
+    lookup = {}; complete = True
+    for filename in cm_files:
+        filepath = os.path.join(fec_folder_path, filename)
+        try:
+            for row in text_cache.read_rows(filepath):
+                try:
+                    record = dict(zip(CM_HEADERS, row))
+                    if record.get('CMTE_ID') and record.get('CMTE_NM'):
+                        lookup[record['CMTE_ID']] = record['CMTE_NM'].strip()
+                except: continue
+        except Exception as e: print(f"    Warning: Could not process {filename}: {e}"); complete = False
+    return lookup, complete
+
+def read_committee_candidates(fec_folder_path, ccl_files):
+    # ({ fec_committee_id: fec_candidate_id }, complete) parsed from the ccl
+    # zips, like read_committee_names.
+    lookup = {}; complete = True
+    for filename in ccl_files:
+        filepath = os.path.join(fec_folder_path, filename)
+        try:
+            for row in text_cache.read_rows(filepath):
+                try:
+                    record = dict(zip(CCL_HEADERS, row))
+                    cmte_id = record.get('CMTE_ID'); cand_id = record.get('CAND_ID')
+                    if cmte_id and cand_id: lookup[cmte_id] = cand_id
+                except: continue
+        except Exception as e: print(f"    Warning: Could not process {filename}: {e}"); complete = False
+    return lookup, complete
+
 def load_fec_lookups(conn, fec_folder_path):
     # Loads all FEC lookup maps: Politician Map (DB), Committees (file), and Committee-to-Candidate (file).
     global fec_id_to_politician_id_lookup, fec_committee_name_lookup, fec_cmte_to_cand_id_lookup
@@ -120,99 +281,82 @@ def load_fec_lookups(conn, fec_folder_path):
     print(f"Loaded {len(fec_id_to_politician_id_lookup)} FEC ID-to-PoliticianID mappings.")
     cur.close()
 
-    # 2. Build Committee Name lookup from local cm.zip files
-    print("Building FEC Committee lookup from local files...")
+    # 2. Committee Name lookup from local cm.zip files (snapshotted)
+    print("Loading FEC Committee lookup from local files...")
     cm_files = sorted([f for f in os.listdir(fec_folder_path) if f.startswith('cm') and f.endswith('.zip')])
     if not cm_files: print("Error: 'cm.zip' files not found."); raise FileNotFoundError
-
-    for filename in cm_files:
-        filepath = os.path.join(fec_folder_path, filename)
-        try:
-            with zipfile.ZipFile(filepath, 'r') as zf:
-                data_filename = [f for f in zf.namelist() if f.endswith('.txt')][0]
-                with zf.open(data_filename, 'r') as f:
-                    reader = csv.reader(io.TextIOWrapper(f, encoding='latin-1'), delimiter='|')
-                    for row in reader:
-                        try:
-                            record = dict(zip(CM_HEADERS, row))
-                            if record.get('CMTE_ID') and record.get('CMTE_NM'):
-                                fec_committee_name_lookup[record['CMTE_ID']] = record['CMTE_NM'].strip()
-                        except: continue
-        except Exception as e: print(f"    Warning: Could not process {filename}: {e}")
+    fec_committee_name_lookup.update(load_or_build(
+        FEC_LOOKUP_SNAPSHOT_PATH, 'cm', lookup_archives(fec_folder_path, cm_files),
+        lambda: read_committee_names(fec_folder_path, cm_files)))
     print(f"Loaded {len(fec_committee_name_lookup)} committee names.")
 
-    # 3. Build Committee-to-Candidate lookup from local ccl.zip files
-    print("Building FEC Committee-to-Candidate lookup from local files...")
+    # 3. Committee-to-Candidate lookup from local ccl.zip files (snapshotted)
+    print("Loading FEC Committee-to-Candidate lookup from local files...")
     ccl_files = sorted([f for f in os.listdir(fec_folder_path) if f.startswith('ccl') and f.endswith('.zip')])
     if not ccl_files: print("Error: 'ccl.zip' files not found."); raise FileNotFoundError
-
-    for filename in ccl_files:
-        filepath = os.path.join(fec_folder_path, filename)
-        try:
-            with zipfile.ZipFile(filepath, 'r') as zf:
-                data_filename = [f for f in zf.namelist() if f.endswith('.txt')][0]
-                with zf.open(data_filename, 'r') as f:
-                    reader = csv.reader(io.TextIOWrapper(f, encoding='latin-1'), delimiter='|')
-                    for row in reader:
-                        try:
-                            record = dict(zip(CCL_HEADERS, row))
-                            cmte_id = record.get('CMTE_ID'); cand_id = record.get('CAND_ID')
-                            if cmte_id and cand_id: fec_cmte_to_cand_id_lookup[cmte_id] = cand_id
-                        except: continue
-        except Exception as e: print(f"    Warning: Could not process {filename}: {e}")
+    fec_cmte_to_cand_id_lookup.update(load_or_build(
+        FEC_LOOKUP_SNAPSHOT_PATH, 'ccl', lookup_archives(fec_folder_path, ccl_files),
+        lambda: read_committee_candidates(fec_folder_path, ccl_files)))
     print(f"Loaded {len(fec_cmte_to_cand_id_lookup)} committee-to-candidate links.")
 
 
-def update_donor_lookup(conn, cur, new_donor_keys):
-    # Batch inserts new donors and updates the global donor_db_lookup cache.
-    global donor_db_lookup
-    if not new_donor_keys:
-        return
-
-    donors_to_insert = [
-        (key[0], key[1], key[2] if key[2] else None, key[3] if key[3] else None)
-        for key in new_donor_keys
-    ]
-
-    print(f"  Found {len(donors_to_insert)} new unique donors. Batch inserting them...")
+def donor_key(name, donor_type, employer, state):
+    # Normalized donor identity: the donor_db_lookup key, mirrored by the
+    # idx_donors_normalized_key expressions (see donor_key_sql)
+    return (str(name or '').strip().lower(), str(donor_type or '').strip().lower(),
+            str(employer or '').strip().lower(), str(state or '').strip().lower())
 
-    sql_insert_donors = """
-        INSERT INTO Donors (Name, DonorType, Employer, State)
-        VALUES %s
-        ON CONFLICT (Name, DonorType, Employer, State) DO NOTHING;
-    """
-    temp_table_name = "new_donor_keys_temp"
+def donor_key_sql(name, donor_type, employer, state):
+    # SQL form of donor_key() over the given column names
+    return ", ".join(f"lower(btrim(COALESCE({column}, '')))" for column in (name, donor_type, employer, state))
 
+def ensure_donor_key_index(conn):
+    # Unique index on the normalized donor key; the upsert's conflict target.
+    # Fails if Donors already holds duplicates under the normalized key (a
+    # full reload, which empties the table first, fixes that).
+    cur = conn.cursor()
     try:
-        execute_values(cur, sql_insert_donors, donors_to_insert, template=None, page_size=BATCH_SIZE)
+        cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_donors_normalized_key ON Donors ({donor_key_sql('Name', 'DonorType', 'Employer', 'State')});")
         conn.commit()
+    except psycopg2.Error as e:
+        print(f"Error creating the normalized donor key index: {e}. Run a full (non-incremental) load to rebuild Donors.")
+        conn.rollback(); raise e
+    finally: cur.close()
 
-        print("  Refreshing donor cache (single join query)...")
-        cur.execute(f"DROP TABLE IF EXISTS {temp_table_name};")
-        cur.execute(f"CREATE TEMPORARY TABLE {temp_table_name} (name TEXT, donortype TEXT, employer TEXT, state TEXT) ON COMMIT DROP;")
-
-        if donors_to_insert: # Only insert if list is not empty
-            execute_values(cur, f"INSERT INTO {temp_table_name} (name, donortype, employer, state) VALUES %s",
-                           donors_to_insert, template=None, page_size=BATCH_SIZE)
+def update_donor_lookup(conn, cur, new_donors):
+    # Inserts (Name, DonorType, Employer, State) donors and caches their IDs
+    # in donor_db_lookup, in one statement per batch. New donors come back
+    # from INSERT ... ON CONFLICT DO NOTHING RETURNING; the ones that already
+    # existed are read from Donors by the normalized key in the same
+    # statement, so they aren't rewritten.
+    if not new_donors:
+        return
 
+    print(f"  Found {len(new_donors)} new unique donors. Upserting them...")
+    names, donor_types, employers, states = (list(column) for column in zip(*new_donors))
+    try:
         cur.execute(f"""
+            WITH batch AS (
+                SELECT DISTINCT ON ({donor_key_sql('name', 'donortype', 'employer', 'state')})
+                       name, donortype, NULLIF(employer, '') AS employer, NULLIF(state, '') AS state
+                FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[]) AS new (name, donortype, employer, state)
+            ), inserted AS (
+                INSERT INTO Donors (Name, DonorType, Employer, State)
+                SELECT name, donortype, employer, state FROM batch
+                ON CONFLICT ({donor_key_sql('Name', 'DonorType', 'Employer', 'State')}) DO NOTHING
+                RETURNING DonorID, Name, DonorType, Employer, State
+            )
+            SELECT DonorID, Name, DonorType, Employer, State FROM inserted
+            UNION ALL
             SELECT d.DonorID, d.Name, d.DonorType, d.Employer, d.State
-            FROM Donors d
-            JOIN {temp_table_name} temp
-            ON d.Name = temp.name
-            AND d.DonorType = temp.donortype
-            AND COALESCE(d.Employer, '') = COALESCE(temp.employer, '')
-            AND COALESCE(d.State, '') = COALESCE(temp.state, '');
-        """)
+            FROM Donors d JOIN batch b
+              ON ({donor_key_sql('d.Name', 'd.DonorType', 'd.Employer', 'd.State')})
+               = ({donor_key_sql('b.name', 'b.donortype', 'b.employer', 'b.state')});
+        """, (names, donor_types, employers, states))
 
         rows = cur.fetchall()
-        for row in rows:
-            donor_id, name, donortype, employer, state = row
-            key = (str(name or '').strip().lower(),
-                   str(donortype or '').strip().lower(),
-                   str(employer or '').strip().lower(),
-                   str(state or '').strip().lower())
-            donor_db_lookup[key] = donor_id
+        for donor_id, name, donortype, employer, state in rows:
+            donor_db_lookup[donor_key(name, donortype, employer, state)] = donor_id
 
         print(f"  Donor cache updated with {len(rows)} new/found IDs.")
         conn.commit()
@@ -220,60 +364,333 @@ def update_donor_lookup(conn, cur, new_donor_keys):
     except psycopg2.Error as e:
         print(f"  DB error in update_donor_lookup: {e}. Rolling back.");
         conn.rollback()
-        cur = conn.cursor()
         return
 
+def insert_donations(conn, cur, donations, cycle):
+    # COPYs donation tuples (DONATION_COLUMNS order plus AMNDT_IND) into an
+    # unlogged staging table and merges them into donations_table, with
+    # Cycle set to `cycle`, set-based:
+    #   - an amendment ('A') or termination ('T') removes the older rows
+    #     with the same TranKey in the same cycle, whether already loaded or
+    #     in this batch (TRAN_IDs can be reused in another cycle);
+    #   - every row except terminations is then inserted.
+    # The Cycle predicate also limits the DELETE to the cycle's partition.
+    # Returns the number of new rows.
+    columns = ', '.join(DONATION_COLUMNS)
+    try:
+        create_staging_table(cur, "donations_staging",
+                             "DonorID INT, PoliticianID INT, Amount NUMERIC(12, 2), Date DATE, ContributionType TEXT, "
+                             "SubID BIGINT, TranKey TEXT, AmndtInd TEXT, Cycle INT")
+        # Staging tables persist between runs; older ones predate Cycle
+        cur.execute("ALTER TABLE donations_staging ADD COLUMN IF NOT EXISTS Cycle INT;")
+        staged = copy_rows(cur, "donations_staging", DONATION_COLUMNS + ('AmndtInd', 'Cycle'),
+                           (donation + (cycle,) for donation in donations))
+        cur.execute(f"""
+            DELETE FROM {donations_table} d
+            USING donations_staging s
+            WHERE s.AmndtInd IN ('A', 'T') AND s.TranKey IS NOT NULL
+              AND d.Cycle = %s AND d.Cycle = s.Cycle
+              AND d.TranKey = s.TranKey
+              AND (d.SubID IS NULL OR d.SubID < s.SubID);
+        """, (cycle,))
+        superseded = cur.rowcount
+        cur.execute(f"""
+            INSERT INTO {donations_table} ({columns}, Cycle)
+            SELECT {columns}, Cycle FROM donations_staging s
+            WHERE s.AmndtInd IS DISTINCT FROM 'T'
+              AND NOT EXISTS (
+                  SELECT 1 FROM donations_staging newer
+                  WHERE newer.TranKey = s.TranKey AND newer.Cycle = s.Cycle
+                    AND newer.AmndtInd IN ('A', 'T') AND newer.SubID > s.SubID
+              )
+            ON CONFLICT DO NOTHING;
+        """)
+        inserted = cur.rowcount
+        cur.execute("TRUNCATE donations_staging;")
+        conn.commit()
+        print(f"  Staged {staged} donation records, {inserted} new, {superseded} superseded by amendments.")
+        return inserted
+    except psycopg2.Error as e:
+        print(f"  DB error in insert_donations: {e}. Rolling back.")
+        conn.rollback()
+        return 0
+
+def flush_donations(conn, cur, pending, cycle):
+    # Resolves/creates the donors of one chunk of parsed donations and
+    # writes the chunk. `pending` holds
+    # (politician_id, amount, date, donor_type, donor_key, donor_row, sub_id, tran_key, amndt_ind)
+    # tuples, where donor_row is the (Name, DonorType, Employer, State) to
+    # insert if donor_key isn't known yet. Termination markers carry only
+    # the last three. Returns the number of new donations.
+    if not pending:
+        return 0
+    new_donors = {item[5] for item in pending if item[4] is not None and item[4] not in donor_db_lookup}
+    update_donor_lookup(conn, cur, new_donors)
+
+    donations_to_batch_insert = []
+    for pol_id, amount, date, donor_type, key, _, sub_id, tran_key, amndt_ind in pending:
+        if key is None:
+            donations_to_batch_insert.append((None, None, None, None, None, sub_id, tran_key, 'T'))
+            continue
+        donor_id = donor_db_lookup.get(key)
+        if donor_id:
+            donations_to_batch_insert.append((donor_id, pol_id, amount, date, donor_type, sub_id, tran_key, amndt_ind))
+    if not donations_to_batch_insert:
+        return 0
+    print(f"  Inserting {len(donations_to_batch_insert)} donation records...")
+    return insert_donations(conn, cur, donations_to_batch_insert, cycle)
+
+def fec_row_identity(record):
+    # (sub_id, tran_key, amndt_ind) of a parsed FEC record
+    sub_id = int(record.get('SUB_ID') or 0) or None
+    tran_id = (record.get('TRAN_ID') or '').strip()
+    tran_key = f"{record.get('CMTE_ID')}:{tran_id}" if tran_id else None
+    return sub_id, tran_key, (record.get('AMNDT_IND') or 'N').strip().upper()
+
+def termination_marker(identity):
+    # Pending tuple that only deletes earlier versions of a transaction:
+    # used for 'T' rows and for amendments that no longer qualify.
+    sub_id, tran_key, amndt_ind = identity
+    if amndt_ind in ('A', 'T') and tran_key:
+        return (None, None, None, None, None, None, sub_id, tran_key, 'T')
+    return None
+
+def parse_pas2_row(row):
+    # Returns the pending-donation tuple (see flush_donations) for a pas2 row
+    # over $2000 to a mapped candidate, else None. Runs in parser workers too.
+    try:
+        record = dict(zip(PAS2_HEADERS, row))
+        identity = fec_row_identity(record)
+        if identity[0] and identity[0] <= sub_id_floor: return None # applied by an earlier run
+        fec_cand_id = record.get('CAND_ID')
+        politician_id = fec_id_to_politician_id_lookup.get(fec_cand_id)
+        if not politician_id: return None
+        if identity[2] == 'T': return termination_marker(identity)
+        amount = float(record.get('TRANSACTION_AMT', 0))
+        if amount <= 2000.0: return termination_marker(identity)
+        date = parse_fec_date(record.get('TRANSACTION_DT')); fec_cmte_id = record.get('CMTE_ID')
+
+        donor_name = fec_committee_name_lookup.get(fec_cmte_id, record.get('NAME', 'Unknown Committee')); donor_type = 'PAC/Party'
+        key = donor_key(donor_name, donor_type, None, None) # Employer/State are blank for PACs
+
+        if politician_id and date:
+            return (politician_id, amount, date, donor_type, key, (donor_name, donor_type, None, None)) + identity
+    except: pass
+    return None
+
+def parse_itcont_row(row):
+    # Returns the pending-donation tuple (see flush_donations) for a
+    # qualifying itcont row, else None. Runs in parser workers too.
+    try:
+        record = dict(zip(ITCONT_HEADERS, row))
+        identity = fec_row_identity(record)
+        if identity[0] and identity[0] <= sub_id_floor: return None # applied by an earlier run
+        fec_cmte_id = record.get('CMTE_ID')
+        fec_cand_id = fec_cmte_to_cand_id_lookup.get(fec_cmte_id)
+        if not fec_cand_id: return None
+        politician_id = fec_id_to_politician_id_lookup.get(fec_cand_id)
+        if not politician_id: return None
+        if identity[2] == 'T': return termination_marker(identity)
+
+        amount = float(record.get('TRANSACTION_AMT', 0))
+        transaction_type = record.get('TRANSACTION_TP', '').upper()
+
+        # --- CORRECTED FILTER ---
+        if amount <= 2000.0 or not transaction_type.startswith('15'):
+            return termination_marker(identity)
+        is_earmarked = transaction_type in ['15E', '15Z']
+        if record.get('OTHER_ID') and not is_earmarked:
+            return termination_marker(identity) # Skip if it has an OTHER_ID but isn't earmarked
+        # --- END CORRECTION ---
+
+        date = parse_fec_date(record.get('TRANSACTION_DT'))
+        donor_name, donor_employer, donor_state = record.get('NAME'), record.get('EMPLOYER'), record.get('STATE')
+        donor_type = 'Individual'
+
+        # Type and state come from tiny vocabularies; intern them so pending
+        # chunks share one copy of each
+        name_key, type_key, employer_key, state_key = donor_key(donor_name, donor_type, donor_employer, donor_state)
+        key = (name_key, sys.intern(type_key), employer_key, sys.intern(state_key))
+
+        if politician_id and date and donor_name and donor_state:
+            return (politician_id, amount, date, donor_type, key, (donor_name, donor_type, donor_employer, donor_state)) + identity
+    except: pass
+    return None
+
+def parse_itcont_rows(rows):
+    # Batch form of parse_itcont_row: the same items, in the same order.
+    # Uses the NumPy columnar filter when FEC_COLUMNAR is on.
+    if itcont_committees is None:
+        return [item for item in map(parse_itcont_row, rows) if item is not None]
+    return fec_columnar.filter_rows(rows, parse_itcont_row, ITCONT_COLUMNS, itcont_committees, sub_id_floor)
+
+def prepare_columnar_filter():
+    # Builds the committee array the columnar filter matches against.
+    # Called after the lookups are loaded, before workers are forked.
+    global itcont_committees
+    if not FEC_COLUMNAR: return
+    if not fec_columnar.numpy_available():
+        print("FEC_COLUMNAR is set but numpy isn't installed. Using the row-by-row filter."); return
+    itcont_committees = fec_columnar.committee_array(fec_cmte_to_cand_id_lookup, fec_id_to_politician_id_lookup)
+    print(f"Columnar filter enabled ({len(itcont_committees)} committees map to politicians).")
+
+def read_parsed_rows(filepath, parse_row, parse_rows=None):
+    # Yields (rows_read, parsed_items) batches from an FEC zip, read from
+    # its decompressed copy in text_cache. With FEC_PARSE_WORKERS > 1 the
+    # copy is parsed by a process pool in newline-aligned shards; otherwise
+    # in this process. `parse_rows`, if given, parses whole batches of rows
+    # instead of parse_row.
+    if FEC_PARSE_WORKERS > 1 and fork_available():
+        yield from parse_file_parallel(text_cache.text_path(filepath), parse_row, FEC_PARSE_WORKERS, FEC_SHARD_BYTES, parse_rows)
+        return
+
+    batch_rows = 10000 if parse_rows else 1000
+    batch = []; rows = 0; raw_rows = []
+    for row in text_cache.read_rows(filepath):
+        rows += 1
+        if parse_rows: raw_rows.append(row)
+        else:
+            item = parse_row(row)
+            if item is not None: batch.append(item)
+        if rows == batch_rows:
+            if parse_rows: batch = parse_rows(raw_rows); raw_rows = []
+            yield rows, batch
+            batch = []; rows = 0
+    if parse_rows: batch = parse_rows(raw_rows)
+    yield rows, batch
+
+def fec_file_cycle(filename):
+    # 'indiv24.zip' / 'pas224.zip' -> 2024
+    digits = os.path.splitext(filename)[0][-2:]
+    return 2000 + int(digits) if digits.isdigit() else None
+
+def cycle_selected(filename):
+    # False for the files of other cycles while one cycle is being reloaded
+    return not FEC_RELOAD_CYCLE or fec_file_cycle(filename) == FEC_RELOAD_CYCLE
+
+def start_cycle_reload(conn, cycle):
+    # Points the load at an empty copy of the cycle's partition and forgets
+    # the cycle's loaded files, so all of them are read again.
+    global donations_table
+    print(f"Reloading cycle {cycle} into a new partition...")
+    cur = conn.cursor()
+    try:
+        donations_table = create_load_table(cur, 'Donations', 'Cycle', cycle)
+        cur.execute("DELETE FROM fec_loaded_files WHERE cycle = %s;", (cycle,))
+        conn.commit()
+    except Exception as e: print(f"Error preparing the reload of cycle {cycle}: {e}"); conn.rollback(); raise e
+    finally: cur.close()
+
+def finish_cycle_reload(conn, cycle):
+    # Swaps the freshly loaded table in for the cycle's partition. Donors
+    # only the old partition referenced are left in Donors. If a file of the
+    # cycle failed, the old partition stays and the load table is kept.
+    global donations_table
+    if failed_files:
+        print(f"Not swapping in cycle {cycle}: {', '.join(failed_files)} failed. Partial load left in {donations_table}.")
+        donations_table = 'Donations'; return
+    cur = conn.cursor()
+    try:
+        swap_partition(cur, 'Donations', cycle, donations_table)
+        conn.commit(); print(f"Swapped in the new partition for cycle {cycle}.")
+    except Exception as e: print(f"Error swapping in cycle {cycle}: {e}"); conn.rollback(); raise e
+    finally: cur.close(); donations_table = 'Donations'
+
+def detach_cycles_before(conn, first_cycle):
+    # Detaches the partitions of cycles before first_cycle. Their tables are
+    # kept (as donations_<cycle>) but no longer part of Donations.
+    cur = conn.cursor()
+    try:
+        for cycle in sorted(partitions(cur, 'Donations')):
+            if cycle < first_cycle:
+                print(f"Detaching cycle {cycle} ({detach_partition(cur, 'Donations', cycle)})...")
+        conn.commit()
+    except Exception as e: print(f"Error detaching old cycles: {e}"); conn.rollback(); raise e
+    finally: cur.close()
+
+def loaded_file_state(cur, filename):
+    # (hashes of this file already loaded, highest SUB_ID applied from it)
+    cur.execute("SELECT sha256, max_sub_id FROM fec_loaded_files WHERE file_name = %s;", (filename,))
+    rows = cur.fetchall()
+    return {row[0] for row in rows}, max([row[1] or 0 for row in rows], default=0)
+
+def record_loaded_file(conn, cur, filename, sha256, stats):
+    cur.execute("""
+        INSERT INTO fec_loaded_files (file_name, cycle, sha256, min_sub_id, max_sub_id, donation_rows)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (file_name, sha256) DO UPDATE
+        SET min_sub_id = EXCLUDED.min_sub_id, max_sub_id = GREATEST(fec_loaded_files.max_sub_id, EXCLUDED.max_sub_id),
+            donation_rows = EXCLUDED.donation_rows, loaded_at = now();
+    """, (filename, fec_file_cycle(filename), sha256, stats['min_sub_id'], stats['max_sub_id'], stats['found']))
+    conn.commit()
+
+def load_fec_file(conn, cur, filepath, parse_row, progress_every, filename=None, sha256=None, parse_rows=None):
+    # Parses one FEC zip with parse_row and writes qualifying donations in
+    # FEC_CHUNK_ROWS chunks. This process is the only DB writer.
+    # In incremental mode a file whose hash was already loaded is skipped,
+    # and rows at or below the file's previous max SUB_ID are ignored.
+    # Returns (donations_found, donations_added).
+    global sub_id_floor
+    filename = filename or os.path.basename(filepath)
+    sha256 = sha256 or sha256_file(filepath)
+    cycle = fec_file_cycle(filename)
+    if cycle is None:
+        raise ValueError(f"Can't tell the FEC cycle of {filename} from its name")
+    if donations_table == 'Donations':
+        ensure_partition(cur, 'Donations', cycle); conn.commit()
+    sub_id_floor = 0
+    if FEC_INCREMENTAL:
+        loaded_hashes, sub_id_floor = loaded_file_state(cur, filename)
+        if sha256 in loaded_hashes:
+            print(f"  {filename} is unchanged since it was last loaded. Skipping.")
+            return 0, 0
+        if sub_id_floor:
+            print(f"  Applying rows of {filename} after SUB_ID {sub_id_floor}.")
+
+    stats = {'found': 0, 'min_sub_id': None, 'max_sub_id': None}
+    added = 0; rows_read = 0; next_progress = progress_every
+    pending = []
+
+    def flush():
+        sub_ids = [item[6] for item in pending if item[6]]
+        if sub_ids:
+            stats['min_sub_id'] = min(sub_ids + ([stats['min_sub_id']] if stats['min_sub_id'] else []))
+            stats['max_sub_id'] = max(sub_ids + ([stats['max_sub_id']] if stats['max_sub_id'] else []))
+        stats['found'] += len(pending)
+        return flush_donations(conn, cur, pending, cycle)
+
+    for rows, items in read_parsed_rows(filepath, parse_row, parse_rows):
+        rows_read += rows
+        if rows_read >= next_progress:
+            print(f"  Processed {rows_read} rows...", end='\r'); next_progress += progress_every
+        pending.extend(items)
+        # Flush per chunk so memory stays flat however big the cycle is
+        if len(pending) >= FEC_CHUNK_ROWS:
+            added += flush(); pending = []
+    added += flush()
+
+    if stats['max_sub_id'] is None: stats['max_sub_id'] = sub_id_floor or None
+    record_loaded_file(conn, cur, filename, sha256, stats)
+    return stats['found'], added
+
 def process_pas2_files(conn, cur, fec_folder_path):
     # Processes all local pas2.zip files.
     print(f"\n--- Stage 1: Processing local PAC-to-Candidate files (pas2) ---")
-    pas2_files = sorted([f for f in os.listdir(fec_folder_path) if f.startswith('pas2') and f.endswith('.zip')])
+    pas2_files = sorted([f for f in os.listdir(fec_folder_path) if f.startswith('pas2') and f.endswith('.zip') and cycle_selected(f)])
     if not pas2_files: print("No local 'pas2XX.zip' files found."); return 0
 
     total_pas2_inserted = 0
 
     for filename in pas2_files:
         filepath = os.path.join(fec_folder_path, filename); print(f"Processing {filename}...")
-        file_start_time = time.time(); file_donations_added = 0
-        donations_to_process = []
-        new_donor_keys = set()
+        file_start_time = time.time(); file_donations_added = 0; file_donations_found = 0
 
         try:
-            with zipfile.ZipFile(filepath, 'r') as zf:
-                data_filename = [f for f in zf.namelist() if f.endswith('.txt')][0]
-                with zf.open(data_filename, 'r') as f:
-                    reader = csv.reader(io.TextIOWrapper(f, encoding='latin-1'), delimiter='|')
-                    for i, row in enumerate(reader):
-                        if (i+1) % 10000 == 0: print(f"  Processed {i+1} rows...", end='\r')
-                        try:
-                            record = dict(zip(PAS2_HEADERS, row))
-                            amount = float(record.get('TRANSACTION_AMT', 0))
-                            if amount <= 2000.0: continue
-                            date = parse_fec_date(record.get('TRANSACTION_DT')); fec_cmte_id = record.get('CMTE_ID'); fec_cand_id = record.get('CAND_ID')
-                            politician_id = fec_id_to_politician_id_lookup.get(fec_cand_id)
-                            if not politician_id: continue
-
-                            donor_name = fec_committee_name_lookup.get(fec_cmte_id, record.get('NAME', 'Unknown Committee')); donor_type = 'PAC/Party'
-                            donor_key = (donor_name.lower(), donor_type.lower(), '', '') # Employer/State are blank for PACs
-
-                            if politician_id and date:
-                                donations_to_process.append((politician_id, amount, date, donor_type, donor_key))
-                                if donor_key not in donor_db_lookup: new_donor_keys.add((donor_name, donor_type, None, None))
-                        except: continue
-        except Exception as e: print(f"  Error processing {filename}: {e}"); continue
-
-        print(f"\n  Finished reading {filename}. Found {len(donations_to_process)} donations > $2000.")
-
-        update_donor_lookup(conn, cur, new_donor_keys)
-
-        donations_to_batch_insert = []
-        for pol_id, amount, date, donor_type, donor_key in donations_to_process:
-            donor_id = donor_db_lookup.get(donor_key)
-            if donor_id:
-                donations_to_batch_insert.append((donor_id, pol_id, amount, date, donor_type)); file_donations_added += 1
-        if donations_to_batch_insert:
-            print(f"  Inserting {len(donations_to_batch_insert)} donation records...")
-            execute_values(cur, "INSERT INTO Donations (DonorID, PoliticianID, Amount, Date, ContributionType) VALUES %s ON CONFLICT (DonorID, PoliticianID, Amount, Date) DO NOTHING;", donations_to_batch_insert)
-            total_pas2_inserted += len(donations_to_batch_insert)
+            file_donations_found, file_donations_added = load_fec_file(conn, cur, filepath, parse_pas2_row, 10000)
+        except Exception as e: print(f"  Error processing {filename}: {e}"); failed_files.append(filename)
+
+        total_pas2_inserted += file_donations_added
+        print(f"\n  Finished reading {filename}. Found {file_donations_found} donations > $2000.")
 
         conn.commit(); print(f"--- Finished {filename} in {time.time() - file_start_time:.2f}s. Added {file_donations_added} donations. ---")
 
@@ -281,81 +698,31 @@ def process_pas2_files(conn, cur, fec_folder_path):
     return total_pas2_inserted
 
 def process_indiv_files(conn, cur, fec_folder_path):
-    # Downloads, processes, and deletes individual (itcont) zip files one by one.
+    # Processes the individual (itcont) zip files. They are fetched through
+    # the local download cache, a few ahead of the file being parsed.
     print(f"\n--- Stage 2: Processing Individual Contribution files (itcont) ---")
     total_indiv_inserted = 0
+    download_cache = DownloadCache(FEC_DOWNLOAD_CACHE_PATH, FEC_DOWNLOAD_CACHE_BYTES)
+    prepare_columnar_filter()
 
-    for url in INDIV_FILE_URLS:
-        filename = url.split('/')[-1]; filepath = os.path.join(fec_folder_path, filename); file_start_time = time.time()
-
-        print(f"\nDownloading {filename}...")
-        try:
-            with requests.get(url, stream=True) as r:
-                r.raise_for_status()
-                with open(filepath, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192*10): f.write(chunk)
-            print("Download complete.")
-        except Exception as e: print(f"  Error downloading {filename}: {e}. Skipping."); continue
+    indiv_urls = [url for url in INDIV_FILE_URLS if cycle_selected(url.split('/')[-1])]
+    for url, filepath in download_cache.fetch_all(indiv_urls, FEC_DOWNLOAD_WORKERS):
+        filename = url.split('/')[-1]; file_start_time = time.time()
+        if isinstance(filepath, Exception):
+            print(f"  Error downloading {filename}: {filepath}. Skipping."); failed_files.append(filename); continue
 
         print(f"Processing {filename}...")
-        file_donations_added = 0; donations_to_process = []; new_donor_keys = set()
+        file_donations_added = 0; file_donations_found = 0
         try:
-            with zipfile.ZipFile(filepath, 'r') as zf:
-                data_filename = [f for f in zf.namelist() if f.endswith('.txt')][0]
-                with zf.open(data_filename, 'r') as f:
-                    reader = csv.reader(io.TextIOWrapper(f, encoding='latin-1'), delimiter='|')
-                    for i, row in enumerate(reader):
-                        if (i+1) % 50000 == 0: print(f"  Processed {i+1} rows...", end='\r')
-                        try:
-                            record = dict(zip(ITCONT_HEADERS, row))
-                            amount = float(record.get('TRANSACTION_AMT', 0))
-                            transaction_type = record.get('TRANSACTION_TP', '').upper()
-
-                            # --- CORRECTED FILTER ---
-                            if amount <= 2000.0 or not transaction_type.startswith('15'):
-                                continue
-                            is_earmarked = transaction_type in ['15E', '15Z']
-                            if record.get('OTHER_ID') and not is_earmarked:
-                                continue # Skip if it has an OTHER_ID but isn't earmarked
-                            # --- END CORRECTION ---
-
-                            date = parse_fec_date(record.get('TRANSACTION_DT')); fec_cmte_id = record.get('CMTE_ID')
-                            donor_name, donor_employer, donor_state = record.get('NAME'), record.get('EMPLOYER'), record.get('STATE')
-                            donor_type = 'Individual'
-
-                            fec_cand_id = fec_cmte_to_cand_id_lookup.get(fec_cmte_id)
-                            if not fec_cand_id: continue
-                            politician_id = fec_id_to_politician_id_lookup.get(fec_cand_id)
-                            if not politician_id: continue
-
-                            donor_key = (str(donor_name or '').strip().lower(), donor_type.lower(), str(donor_employer or '').strip().lower(), str(donor_state or '').strip().lower())
-
-                            if politician_id and date and donor_name and donor_state:
-                                donations_to_process.append((politician_id, amount, date, donor_type, donor_key))
-                                if donor_key not in donor_db_lookup:
-                                    new_donor_keys.add((donor_name, donor_type, donor_employer, donor_state))
-                        except: continue
-        except Exception as e: print(f"  Error processing {filename}: {e}") # Keep processing other files
-
-        print(f"\n  Finished reading {filename}. Found {len(donations_to_process)} donations > $2000.")
-
-        update_donor_lookup(conn, cur, new_donor_keys)
-
-        donations_to_batch_insert = []
-        for pol_id, amount, date, donor_type, donor_key in donations_to_process:
-            donor_id = donor_db_lookup.get(donor_key)
-            if donor_id:
-                donations_to_batch_insert.append((donor_id, pol_id, amount, date, donor_type)); file_donations_added += 1
-
-        if donations_to_batch_insert:
-            print(f"  Inserting {len(donations_to_batch_insert)} donation records...")
-            execute_values(cur, "INSERT INTO Donations (DonorID, PoliticianID, Amount, Date, ContributionType) VALUES %s ON CONFLICT (DonorID, PoliticianID, Amount, Date) DO NOTHING;", donations_to_batch_insert)
-            total_indiv_inserted += len(donations_to_batch_insert)
+            file_donations_found, file_donations_added = load_fec_file(conn, cur, filepath, parse_itcont_row, 50000,
+                                                                       filename=filename, sha256=os.path.basename(filepath),
+                                                                       parse_rows=parse_itcont_rows)
+        except Exception as e: print(f"  Error processing {filename}: {e}"); failed_files.append(filename) # Keep processing other files
 
-        conn.commit(); print(f"--- Finished {filename} in {time.time() - file_start_time:.2f}s. Added {file_donations_added} donations. ---")
+        total_indiv_inserted += file_donations_added
+        print(f"\n  Finished reading {filename}. Found {file_donations_found} donations > $2000.")
 
-        try: os.remove(filepath); print(f"Successfully deleted {filename}.")
-        except Exception as e: print(f"  Warning: Could not delete {filename}: {e}")
+        conn.commit(); print(f"--- Finished {filename} in {time.time() - file_start_time:.2f}s. Added {file_donations_added} donations. ---")
 
     print(f"\nStage 2 Complete. Inserted {total_indiv_inserted} individual donations.")
     return total_indiv_inserted
@@ -374,8 +741,11 @@ def main():
         load_fec_lookups(conn, FEC_DATA_FOLDER_PATH)
 
         # --- THIS LINE CLEARS DATA ---
-        clear_donation_tables(conn);
+        if FEC_RELOAD_CYCLE: start_cycle_reload(conn, FEC_RELOAD_CYCLE)
+        elif FEC_INCREMENTAL: print("Incremental mode: keeping existing donations.")
+        else: clear_donation_tables(conn)
         # --- END MODIFICATION ---
+        ensure_donor_key_index(conn)
 
         cur = conn.cursor()
         overall_start_time = time.time()
@@ -386,6 +756,12 @@ def main():
 
         indiv_donations = process_indiv_files(conn, cur, FEC_DATA_FOLDER_PATH)
 
+        if FEC_RELOAD_CYCLE: finish_cycle_reload(conn, FEC_RELOAD_CYCLE)
+        if FEC_DETACH_BEFORE_CYCLE: detach_cycles_before(conn, FEC_DETACH_BEFORE_CYCLE)
+
+        refresh_politician_industry_totals(conn)
+        bump_data_version(conn, 'donations')
+
         print(f"\n--- OVERALL SUCCESS ---")
         cur.execute("SELECT COUNT(*) FROM Donors;"); final_donor_count = cur.fetchone()[0]
         cur.execute("SELECT COUNT(*) FROM Donations;"); final_donation_count = cur.fetchone()[0]
@@ -5,6 +5,7 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 import app.config as config  # Or 'import test' if this file is in data_scripts
+from app.derived import bump_data_version, refresh_politician_industry_totals
 import time
 
 # --- Comprehensive Industry Mapping ---
@@ -232,6 +233,10 @@ def populate_donor_industries():
             conn.commit()
             updated_count = len(donors_to_update)
             print(f"Batch update committed. {updated_count} rows updated.")
+
+            # Industry totals depend on Donors.Industry
+            refresh_politician_industry_totals(conn)
+            bump_data_version(conn, 'industries')
         else:
             print("No new industries assigned in this run.")
 
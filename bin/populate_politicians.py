@@ -6,6 +6,7 @@ import re
 import sys
 import os
 import app.config as config  # Imports your new test.py file
+from app.derived import bump_data_version
 
 # --- CONFIGURATION ---
 # All config is now pulled from test.py
@@ -39,6 +40,13 @@ def create_politicians_table_if_not_exists(conn):
                 UNIQUE(FirstName, LastName, State)
             );
         """)
+        # Trigram index for /api/politicians/search. The indexed expression
+        # must match the one in the API's WHERE clause exactly.
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_politicians_full_name_trgm
+            ON Politicians USING GIN ((FirstName || ' ' || LastName) gin_trgm_ops);
+        """)
         conn.commit()
         print("Table 'Politicians' is ready.")
     except Exception as e:
@@ -284,6 +292,9 @@ def insert_politicians_final_active():
         
         update_active_status(conn, cur, current_officials_keys)
 
+        # Tell running API workers to rebuild their politician search index
+        bump_data_version(conn, 'politicians')
+
         # --- Final Report ---
         end_time = time.time(); print(f"\n--- OVERALL SUCCESS ---")
         cur.execute("SELECT COUNT(*) FROM Politicians;"); final_db_count = cur.fetchone()[0]
@@ -1,20 +1,26 @@
 import os
-import json
+import multiprocessing
+from array import array
 import psycopg2
 import time
-from psycopg2.extras import execute_values
+import datetime
 import re
 import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 import app.config as config  # Imports your configuration file
+from app.derived import bump_data_version
+from bin.pg_copy import copy_rows, create_staging_table
+from bin.pg_partitions import cluster_partitions, ensure_default_partition, ensure_partition, is_partitioned, set_aside_table, table_exists
+from bin.voteview_reader import iter_voteview_records, voteview_files
 import traceback
 
 # --- CONFIGURATION ---
 # All config is now pulled from test.py
 VOTE_DATA_FOLDER_PATH = config.VOTE_DATA_FOLDER_PATH
 MEMBER_FILE_PATH = config.MEMBER_FILE_PATH
-BATCH_SIZE = 5000 
+# Vote files parsed in parallel (1 = serial, in this process)
+VOTE_PARSE_WORKERS = config.VOTE_PARSE_WORKERS
 START_CONGRESS = 108 # Required for the bill lookup
 
 # --- STATE ABBREVIATION MAP ---
@@ -40,7 +46,8 @@ STATE_ABBREVIATION_MAP.update({k.lower(): v for k, v in STATE_ABBREVIATION_MAP.i
 politician_db_lookup = {}
 bill_db_lookup = {}       # {normalized_bill_number: bill_id}
 icpsr_lookup = {}         # {icpsr_id: (cleaned_firstname, cleaned_lastname, cleaned_full_state_name)}
-rollcall_lookup = {}      # {(congress, rollnumber, chamber): bill_id}
+rollcall_lookup = {}      # {(congress, rollnumber, chamber): (roll_call_id, bill_id)}
+icpsr_politician_ids = array('i')  # [icpsr] -> PoliticianID (0 = unmatched), see build_icpsr_index
 
 # Voteview cast_code mapping
 VOTEVIEW_CODE_MAP = {
@@ -79,32 +86,143 @@ def normalize_voteview_bioname(bioname_str):
     return (cleaned_fname, cleaned_lname)
 
 # --- Database Functions ---
-def create_votes_table_if_not_exists(conn):
-    """Creates the Votes table if it doesn't already exist."""
-    print("Ensuring 'Votes' table exists...")
+# Votes.SortDate orders the votes page: the bill's DateIntroduced, or
+# 'infinity' when it has none, which sorts where PostgreSQL sorts NULLs.
+# Bills are only ever replaced along with their votes (ON DELETE CASCADE),
+# so the copy stays in step.
+VOTE_SORT_DATE_SQL = "COALESCE(b.DateIntroduced, 'infinity'::date)"
+
+def create_rollcalls_table_if_not_exists(conn):
+    """Creates the RollCalls table if it doesn't already exist."""
+    print("Ensuring 'RollCalls' table exists...")
     try:
         cur = conn.cursor()
         cur.execute("""
-            CREATE TABLE IF NOT EXISTS Votes (
-                VoteID SERIAL PRIMARY KEY,
-                PoliticianID INT REFERENCES Politicians(PoliticianID) ON DELETE CASCADE,
+            CREATE TABLE IF NOT EXISTS RollCalls (
+                RollCallID SERIAL PRIMARY KEY,
+                Congress INT NOT NULL,
+                Chamber TEXT NOT NULL,
+                RollNumber INT NOT NULL,
+                VoteDate DATE,
+                Question TEXT,
                 BillID INT REFERENCES Bills(BillID) ON DELETE CASCADE,
-                Vote TEXT,
-                UNIQUE(PoliticianID, BillID)
+                UNIQUE(Congress, Chamber, RollNumber)
             );
         """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_rollcalls_bill_id ON RollCalls (BillID);")
+        conn.commit()
+        print("Table 'RollCalls' is ready.")
+    except Exception as e:
+        print(f"Error creating table: {e}"); conn.rollback(); raise e
+
+# Votes is partitioned by Congress. Keys of a partitioned table include the
+# partition key, so the primary key is (VoteID, Congress); VoteID alone
+# stays unique through its sequence.
+VOTES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS Votes (
+        VoteID SERIAL,
+        PoliticianID INT REFERENCES Politicians(PoliticianID) ON DELETE CASCADE,
+        RollCallID INT REFERENCES RollCalls(RollCallID) ON DELETE CASCADE,
+        BillID INT REFERENCES Bills(BillID) ON DELETE CASCADE,
+        Congress INT NOT NULL,
+        Vote TEXT,
+        SortDate DATE NOT NULL,
+        PRIMARY KEY (VoteID, Congress)
+    ) PARTITION BY LIST (Congress);
+"""
+
+def partition_votes_by_congress(cur):
+    """Moves the rows of an unpartitioned Votes table (older schema) into the
+    partitioned one. Each vote takes the Congress of its roll call, or else
+    of its bill. If some vote has neither, raises before moving anything."""
+    print("Moving 'Votes' into a table partitioned by Congress...")
+    cur.execute("ALTER TABLE Votes ADD COLUMN IF NOT EXISTS RollCallID INT;")
+    congress_sql = "COALESCE(r.Congress, b.Congress)"
+    joins = "LEFT JOIN RollCalls r ON r.RollCallID = v.RollCallID LEFT JOIN Bills b ON b.BillID = v.BillID"
+    cur.execute(f"SELECT {congress_sql}, COUNT(*) FROM Votes v {joins} GROUP BY 1;")
+    counts = dict(cur.fetchall())
+    if None in counts:
+        raise RuntimeError(f"{counts[None]} votes in the unpartitioned 'Votes' table have no roll call or bill to take "
+                           "a Congress from. Delete them (every vote is reloaded by this script) and run it again.")
+    old_table = set_aside_table(cur, 'Votes', 'unpartitioned')
+    cur.execute(VOTES_TABLE_SQL)
+    ensure_default_partition(cur, 'Votes')
+    for congress in counts: ensure_partition(cur, 'Votes', congress)
+    cur.execute(f"""
+        INSERT INTO Votes (VoteID, PoliticianID, RollCallID, BillID, Congress, Vote, SortDate)
+        SELECT v.VoteID, v.PoliticianID, v.RollCallID, v.BillID, {congress_sql}, v.Vote, {VOTE_SORT_DATE_SQL}
+        FROM {old_table} v {joins};
+    """)
+    print(f"  Moved {cur.rowcount} votes.")
+    cur.execute("SELECT setval('votes_voteid_seq', COALESCE((SELECT MAX(VoteID) FROM Votes), 0) + 1, false);")
+    cur.execute(f"DROP TABLE {old_table};")
+
+def create_votes_table_if_not_exists(conn):
+    """Creates the Votes table, partitioned by Congress, if it doesn't
+    already exist. The rows of an unpartitioned Votes table from an older
+    schema are moved into it."""
+    print("Ensuring 'Votes' table exists...")
+    try:
+        cur = conn.cursor()
+        if table_exists(cur, 'Votes') and not is_partitioned(cur, 'Votes'):
+            partition_votes_by_congress(cur)
+        cur.execute(VOTES_TABLE_SQL)
+        ensure_default_partition(cur, 'Votes')
+        if not votes_have_sort_date(cur): add_vote_sort_date(cur)
+        # One vote per politician and roll call; several roll calls on one bill are separate votes
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_votes_politician_rollcall ON Votes (PoliticianID, RollCallID, Congress);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_votes_politician_id ON Votes (PoliticianID);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_votes_bill_id ON Votes (BillID);")
+        # The votes page walks a politician's votes in (SortDate, VoteID)
+        # order and stops after one page, instead of sorting all of them
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_votes_politician_sort ON Votes (PoliticianID, SortDate, VoteID);")
+        # Covering index for the per-politician votes page: the join to Bills
+        # and the keyset/COUNT queries can run as index-only scans.
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_votes_politician_covering
+            ON Votes (PoliticianID, BillID) INCLUDE (VoteID, RollCallID, Vote);
+        """)
         conn.commit()
         print("Table 'Votes' is ready.")
     except Exception as e:
         print(f"Error creating table: {e}"); conn.rollback(); raise e
 
+def votes_have_sort_date(cur):
+    cur.execute("SELECT 1 FROM pg_attribute WHERE attrelid = to_regclass('Votes') AND attname = 'sortdate' AND NOT attisdropped;")
+    return cur.fetchone() is not None
+
+def add_vote_sort_date(cur):
+    """Adds SortDate to a Votes table that predates it, filled in from Bills."""
+    print("Adding 'SortDate' to 'Votes'...")
+    cur.execute("ALTER TABLE Votes ADD COLUMN SortDate DATE;")
+    cur.execute(f"UPDATE Votes v SET SortDate = {VOTE_SORT_DATE_SQL} FROM Bills b WHERE b.BillID = v.BillID;")
+    cur.execute("UPDATE Votes SET SortDate = 'infinity' WHERE SortDate IS NULL;")
+    cur.execute("ALTER TABLE Votes ALTER COLUMN SortDate SET NOT NULL;")
+
+def create_icpsr_map_table_if_not_exists(conn):
+    """Creates the icpsr_politician_map table if it doesn't already exist."""
+    print("Ensuring 'icpsr_politician_map' table exists...")
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS icpsr_politician_map (
+                icpsr INT PRIMARY KEY,
+                politician_id INT REFERENCES Politicians(PoliticianID) ON DELETE CASCADE
+            );
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_icpsr_map_politician_id ON icpsr_politician_map (politician_id);")
+        conn.commit()
+        print("Table 'icpsr_politician_map' is ready.")
+    except Exception as e:
+        print(f"Error creating table: {e}"); conn.rollback(); raise e
+
 def clear_votes_table(conn):
     print("Clearing 'Votes' table..."); cur = conn.cursor()
     try:
-        cur.execute("DELETE FROM Votes;");
+        cur.execute("TRUNCATE Votes;");
         cur.execute("ALTER SEQUENCE Votes_VoteID_seq RESTART WITH 1;");
+        cur.execute("DELETE FROM RollCalls;");
+        cur.execute("ALTER SEQUENCE RollCalls_RollCallID_seq RESTART WITH 1;");
         conn.commit(); print("Table cleared.")
     except Exception as e: print(f"Error clearing: {e}"); conn.rollback(); raise e
 
@@ -135,12 +253,11 @@ def load_db_lookups(conn):
     print(f"Loaded {len(bill_db_lookup)} enacted bills."); cur.close()
 
 def load_icpsr_lookup(member_filepath):
-    """Loads the Voteview member file (HSall_members.json)."""
+    """Loads the Voteview member file (HSall_members.json or .csv), streamed."""
     global icpsr_lookup
     print(f"Loading ICPSR mapping from {member_filepath}...")
     try:
-        with open(member_filepath, 'r', encoding='utf-8') as f: member_data = json.load(f)
-        for member in member_data:
+        for member in iter_voteview_records(member_filepath):
             icpsr = member.get('icpsr')
             state_abbr = member.get('state_abbrev', '').strip().upper()
             bioname = member.get('bioname', '') 
@@ -154,26 +271,60 @@ def load_icpsr_lookup(member_filepath):
     except FileNotFoundError: print(f"Error: Member file not found at '{member_filepath}'"); raise
     except Exception as e: print(f"Error reading member file: {e}"); raise
 
-def load_rollcall_lookup(vote_folder_path):
-    """Loads all _rollcalls.json files to map (congress, rollnumber) to BillID."""
-    global rollcall_lookup
-    print("Loading roll call to bill lookup...")
-    rollcall_files = sorted([f for f in os.listdir(vote_folder_path) if f.startswith('HS') and f.endswith('_rollcalls.json')])
+def parse_vote_date(value):
+    """Voteview's 'YYYY-MM-DD' roll call date, or None if it isn't one."""
+    try: return datetime.date.fromisoformat(str(value or '').strip()).isoformat()
+    except ValueError: return None
+
+def read_rollcalls(vote_folder_path):
+    """Reads all _rollcalls files (JSON or CSV). Returns the roll calls on
+    enacted bills as (congress, chamber, rollnumber, date, question, BillID)."""
+    print("Reading roll calls...")
+    roll_calls = []
+    rollcall_files = voteview_files(vote_folder_path, 'rollcalls')
     if not rollcall_files: print(f"Error: No '*_rollcalls.json' files found in '{vote_folder_path}'"); raise FileNotFoundError
     
     for filename in rollcall_files:
         filepath = os.path.join(vote_folder_path, filename)
         print(f"  Reading {filename}...")
         try:
-            with open(filepath, 'r', encoding='utf-8') as f: data = json.load(f)
-            for roll_call in data:
+            for roll_call in iter_voteview_records(filepath):
                 bill_number = roll_call.get('bill_number')
                 bill_key = str(bill_number or '').strip().lower().replace(" ", "").replace(".", "")
                 bill_id = bill_db_lookup.get(bill_key)
-                if bill_id:
-                    key = (roll_call.get('congress'), roll_call.get('rollnumber'), roll_call.get('chamber'))
-                    rollcall_lookup[key] = bill_id
+                congress = roll_call.get('congress'); rollnumber = roll_call.get('rollnumber')
+                chamber = roll_call.get('chamber')
+                if bill_id and isinstance(congress, int) and isinstance(rollnumber, int) and chamber:
+                    roll_calls.append((congress, chamber, rollnumber, parse_vote_date(roll_call.get('date')),
+                                       roll_call.get('vote_question') or None, bill_id))
         except Exception as e: print(f"    Warning: Error reading {filename}: {e}. Skipping file.")
+    print(f"Read {len(roll_calls)} roll calls linked to enacted bills.")
+    return roll_calls
+
+def load_rollcall_lookup(conn, roll_calls):
+    """Saves the roll calls to RollCalls and maps (congress, rollnumber,
+    chamber) to their (RollCallID, BillID)."""
+    global rollcall_lookup
+    print("Saving roll calls and loading the roll call lookup...")
+    cur = conn.cursor()
+    try:
+        create_staging_table(cur, "rollcalls_staging",
+                             "Congress INT, Chamber TEXT, RollNumber INT, VoteDate DATE, Question TEXT, BillID INT")
+        copy_rows(cur, "rollcalls_staging", ('Congress', 'Chamber', 'RollNumber', 'VoteDate', 'Question', 'BillID'), roll_calls)
+        cur.execute("""
+            INSERT INTO RollCalls (Congress, Chamber, RollNumber, VoteDate, Question, BillID)
+            SELECT DISTINCT ON (Congress, Chamber, RollNumber) Congress, Chamber, RollNumber, VoteDate, Question, BillID
+            FROM rollcalls_staging
+            ON CONFLICT (Congress, Chamber, RollNumber) DO NOTHING;
+        """)
+        cur.execute("TRUNCATE rollcalls_staging;")
+        conn.commit()
+        cur.execute("SELECT RollCallID, Congress, RollNumber, Chamber, BillID FROM RollCalls;")
+        for roll_call_id, congress, rollnumber, chamber, bill_id in cur.fetchall():
+            rollcall_lookup[(congress, rollnumber, chamber)] = (roll_call_id, bill_id)
+    except psycopg2.Error as e:
+        print(f"Error saving roll calls: {e}"); conn.rollback(); raise e
+    finally: cur.close()
     print(f"Loaded {len(rollcall_lookup)} roll calls linked to enacted bills.")
 
 def find_politician_id(icpsr):
@@ -190,88 +341,168 @@ def find_politician_id(icpsr):
             if fname_clean == fname_db_clean: return pid
     return None
 
+def resolve_icpsr_map():
+    """{icpsr: PoliticianID} for every member find_politician_id can match,
+    resolved once per run instead of once per vote."""
+    icpsr_map = {}
+    for icpsr in icpsr_lookup:
+        politician_id = find_politician_id(icpsr)
+        if politician_id: icpsr_map[icpsr] = politician_id
+    return icpsr_map
+
+def build_icpsr_index(icpsr_map):
+    """Flat array indexed by icpsr holding the PoliticianID (0 = no match)."""
+    icpsr_ids = [icpsr for icpsr in icpsr_map if isinstance(icpsr, int) and icpsr >= 0]
+    index = array('i', bytes(4 * (max(icpsr_ids, default=-1) + 1)))
+    for icpsr in icpsr_ids: index[icpsr] = icpsr_map[icpsr]
+    return index
+
+def resolve_politician_id(icpsr):
+    """PoliticianID for a vote record's icpsr: one array lookup."""
+    if isinstance(icpsr, int) and 0 <= icpsr < len(icpsr_politician_ids):
+        return icpsr_politician_ids[icpsr] or None
+    return None
+
+def save_icpsr_politician_map(conn, icpsr_map):
+    """Replaces the contents of icpsr_politician_map with this run's matches."""
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM icpsr_politician_map;")
+        copy_rows(cur, "icpsr_politician_map", ('icpsr', 'politician_id'), sorted(icpsr_map.items()))
+        conn.commit()
+        print(f"Saved {len(icpsr_map)} ICPSR-to-PoliticianID matches to 'icpsr_politician_map'.")
+    except psycopg2.Error as e:
+        print(f"Error saving icpsr_politician_map: {e}"); conn.rollback(); raise e
+    finally: cur.close()
+
+def load_icpsr_politician_map(conn):
+    """Resolves every member once, persists the matches and builds the
+    icpsr_politician_ids index the vote parsers read."""
+    global icpsr_politician_ids
+    icpsr_map = resolve_icpsr_map()
+    print(f"Matched {len(icpsr_map)} of {len(icpsr_lookup)} ICPSR members to politicians.")
+    save_icpsr_politician_map(conn, icpsr_map)
+    icpsr_politician_ids = build_icpsr_index(icpsr_map)
+
+def parse_vote_file(filepath):
+    """Matches one Voteview votes file against the lookups.
+
+    In parallel mode this runs in a forked worker and reads the lookups it
+    inherited copy-on-write. Returns (records_read, [(PoliticianID,
+    RollCallID, BillID, Congress, Vote)], error or None). A read error keeps
+    the records before it.
+    """
+    records_read = 0; matched_votes = []; error = None
+    records = iter_voteview_records(filepath)
+    while True:
+        try: vote_record = next(records)
+        except StopIteration: break
+        except Exception as e: error = str(e); break
+        records_read += 1
+
+        try:
+            congress = vote_record.get('congress'); rollnumber = vote_record.get('rollnumber')
+            chamber = vote_record.get('chamber'); icpsr = vote_record.get('icpsr')
+            cast_code = vote_record.get('cast_code')
+
+            rollcall_key = (congress, rollnumber, chamber)
+            roll_call = rollcall_lookup.get(rollcall_key)
+            if not roll_call: continue
+            roll_call_id, bill_id = roll_call
+
+            politician_id = resolve_politician_id(icpsr)
+            vote_string = VOTEVIEW_CODE_MAP.get(cast_code)
+
+            if politician_id and bill_id and vote_string:
+                matched_votes.append((politician_id, roll_call_id, bill_id, congress, vote_string))
+        except: continue
+    return records_read, matched_votes, error
+
+def parse_vote_files(filepaths):
+    """Yields (filepath, parse_vote_file(filepath)) in file order.
+
+    With VOTE_PARSE_WORKERS > 1 the files (one per Congress and chamber) are
+    parsed by a pool of forked workers. The lookups are built once in this
+    process before the fork, and this process remains the only DB writer.
+    """
+    if VOTE_PARSE_WORKERS <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        for filepath in filepaths:
+            yield filepath, parse_vote_file(filepath)
+        return
+    with multiprocessing.get_context('fork').Pool(processes=VOTE_PARSE_WORKERS) as pool:
+        yield from zip(filepaths, pool.imap(parse_vote_file, filepaths))
+
+def write_votes(conn, cur, votes):
+    """COPYs matched votes into a staging table and inserts them into Votes,
+    one per politician and roll call (the first one wins), creating the
+    partitions of their Congresses. Returns the number of rows inserted."""
+    if not votes: return 0
+    first_votes = {}
+    for vote in votes: first_votes.setdefault(vote[:2], vote)
+    try:
+        for congress in {vote[3] for vote in first_votes.values()}: ensure_partition(cur, 'Votes', congress)
+        create_staging_table(cur, "votes_staging", "PoliticianID INT, RollCallID INT, BillID INT, Congress INT, Vote TEXT")
+        copy_rows(cur, "votes_staging", ('PoliticianID', 'RollCallID', 'BillID', 'Congress', 'Vote'), first_votes.values())
+        cur.execute(f"""
+            INSERT INTO Votes (PoliticianID, RollCallID, BillID, Congress, Vote, SortDate)
+            SELECT s.PoliticianID, s.RollCallID, s.BillID, s.Congress, s.Vote, {VOTE_SORT_DATE_SQL}
+            FROM votes_staging s LEFT JOIN Bills b ON b.BillID = s.BillID
+            ON CONFLICT (PoliticianID, RollCallID, Congress) DO NOTHING;
+        """)
+        inserted = cur.rowcount
+        cur.execute("TRUNCATE votes_staging;")
+        conn.commit()
+        return inserted
+    except psycopg2.Error as db_err:
+        print(f"\n  DB error writing votes: {db_err}. Rolling back."); conn.rollback()
+        return 0
+
 def process_and_insert_votes():
-    """Reads _votes.json files, uses lookups, and batch inserts votes."""
+    """Streams the _votes files (JSON or CSV), uses lookups, and batch inserts votes."""
     conn = None; total_inserted_votes = 0; total_votes_processed = 0
     try:
         # Connect using the details from test.py
         print("Connecting to PostgreSQL..."); conn = psycopg2.connect(**config.conn_params)
         
+        create_rollcalls_table_if_not_exists(conn)
         create_votes_table_if_not_exists(conn)
+        create_icpsr_map_table_if_not_exists(conn)
         load_db_lookups(conn)
         load_icpsr_lookup(MEMBER_FILE_PATH)
-        load_rollcall_lookup(VOTE_DATA_FOLDER_PATH)
+        load_icpsr_politician_map(conn)
+        roll_calls = read_rollcalls(VOTE_DATA_FOLDER_PATH)
         clear_votes_table(conn)
+        load_rollcall_lookup(conn, roll_calls)
         cur = conn.cursor()
         overall_start_time = time.time()
 
-        vote_files = sorted([f for f in os.listdir(VOTE_DATA_FOLDER_PATH) if f.startswith('HS') and f.endswith('_votes.json')])
+        vote_files = voteview_files(VOTE_DATA_FOLDER_PATH, 'votes')
         if not vote_files: 
             print(f"Error: No '*_votes.json' files found in '{VOTE_DATA_FOLDER_PATH}'"); return
             
-        print(f"Found {len(vote_files)} Voteview *votes* JSON files to process.")
-        votes_to_batch_insert = []
+        print(f"Found {len(vote_files)} Voteview *votes* files to process ({max(1, VOTE_PARSE_WORKERS)} at a time).")
+        filepaths = [os.path.join(VOTE_DATA_FOLDER_PATH, filename) for filename in vote_files]
+        file_start_time = time.time()
 
-        for filename in vote_files:
-            filepath = os.path.join(VOTE_DATA_FOLDER_PATH, filename)
-            print(f"\n--- Processing File: {filename} ---")
-            file_start_time = time.time(); file_votes_matched = 0
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f: data = json.load(f)
-            except Exception as e: print(f"Error reading file {filename}: {e}. Skipping."); continue
-            if not isinstance(data, list): print(f"Warning: Expected list in {filename}. Skipping."); continue
-
-            print(f"Processing {len(data)} individual vote records...")
-            for i, vote_record in enumerate(data):
-                total_votes_processed += 1
-                if (i + 1) % 50000 == 0: print(f"  Processed {i+1}/{len(data)} records...", end='\r')
-
-                try:
-                    congress = vote_record.get('congress'); rollnumber = vote_record.get('rollnumber')
-                    chamber = vote_record.get('chamber'); icpsr = vote_record.get('icpsr')
-                    cast_code = vote_record.get('cast_code')
-
-                    rollcall_key = (congress, rollnumber, chamber)
-                    bill_id = rollcall_lookup.get(rollcall_key)
-                    if not bill_id: continue
-                    
-                    politician_id = find_politician_id(icpsr)
-                    vote_string = VOTEVIEW_CODE_MAP.get(cast_code)
-                    
-                    if politician_id and bill_id and vote_string:
-                        votes_to_batch_insert.append((politician_id, bill_id, vote_string))
-                        file_votes_matched += 1
-                except: continue 
-
-                if len(votes_to_batch_insert) >= BATCH_SIZE:
-                    print(" " * 80, end='\r'); print(f"  Inserting batch of {len(votes_to_batch_insert)} votes...")
-                    sql_insert = "INSERT INTO Votes (PoliticianID, BillID, Vote) VALUES %s ON CONFLICT (PoliticianID, BillID) DO NOTHING;"
-                    try:
-                        execute_values(cur, sql_insert, votes_to_batch_insert, page_size=BATCH_SIZE)
-                        conn.commit(); total_inserted_votes += len(votes_to_batch_insert)
-                        votes_to_batch_insert = []
-                    except psycopg2.Error as db_err:
-                        print(f"\n  DB batch error: {db_err}. Rolling back."); conn.rollback(); cur = conn.cursor()
-                        votes_to_batch_insert = []
-            
-            if votes_to_batch_insert:
-                print(" " * 80, end='\r'); print(f"  Inserting final batch of {len(votes_to_batch_insert)} votes...")
-                sql_insert = "INSERT INTO Votes (PoliticianID, BillID, Vote) VALUES %s ON CONFLICT (PoliticianID, BillID) DO NOTHING;"
-                try:
-                    execute_values(cur, sql_insert, votes_to_batch_insert, page_size=BATCH_SIZE)
-                    conn.commit(); total_inserted_votes += len(votes_to_batch_insert)
-                except psycopg2.Error as db_err:
-                    print(f"\n  DB final batch error: {db_err}. Rolling back."); conn.rollback(); cur = conn.cursor()
-
-            print(" " * 80, end='\r')
-            print(f"  Matched {file_votes_matched} votes in this file.")
+        for filepath, (records_read, matched_votes, error) in parse_vote_files(filepaths):
+            filename = os.path.basename(filepath)
+            print(f"\n--- Processed File: {filename} ---")
+            if error: print(f"Error reading file {filename}: {error}. Skipped the rest of it.")
+            total_votes_processed += records_read
+            print(f"  Matched {len(matched_votes)} of {records_read} vote records. Writing them...")
+            total_inserted_votes += write_votes(conn, cur, matched_votes)
             print(f"--- Finished file {filename} in {time.time() - file_start_time:.2f}s ---")
+            file_start_time = time.time()
 
         print(f"\n--- OVERALL SUCCESS ---")
         print(f"Processed {total_votes_processed} individual vote records from {len(vote_files)} files.")
         cur.execute("SELECT COUNT(*) FROM Votes;"); final_count = cur.fetchone()[0]
-        print(f"Successfully inserted {final_count} vote records linked to enacted laws.")
+        # Store each member's votes together within each Congress's
+        # partition, so the votes page reads contiguous runs of them
+        print("Clustering 'Votes' partitions by politician..."); cluster_partitions(cur, 'idx_votes_politician_rollcall')
+        cur.execute("ANALYZE Votes;"); conn.commit()
+        print(f"Successfully inserted {final_count} vote records linked to enacted laws ({total_inserted_votes} this run).")
+        bump_data_version(conn, 'votes')
         print(f"Total execution time: {time.time() - overall_start_time:.2f} seconds.")
 
     except Exception as e:
@@ -0,0 +1,118 @@
+"""Streaming readers for Voteview vote, roll call and member files.
+
+Voteview publishes each file as one JSON array, and the loaders used to
+json.load() it, building every record before the first one was used. The
+largest HS*_votes.json files set the peak memory of a whole vote load.
+
+iter_json_array() decodes the array one element at a time from a sliding
+text buffer, so memory is bounded by the buffer plus a single record.
+Voteview's CSV exports of the same data can be read instead.
+iter_voteview_records() picks the reader from the file extension and
+yields dicts with the same keys and value types either way.
+"""
+
+import csv
+import json
+import os
+import re
+
+CHUNK_CHARS = 1 << 16
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Columns that are numbers in the JSON files, converted when reading CSV
+INT_FIELDS = {'congress', 'rollnumber', 'icpsr', 'cast_code', 'district_code', 'state_icpsr', 'party_code'}
+
+
+def iter_json_array(path, chunk_chars=CHUNK_CHARS):
+    """Yields the elements of the top-level JSON array in `path` one by one.
+    Raises ValueError if the file isn't a JSON array."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buffer, pos, eof
+            more = f.read(chunk_chars)
+            if not more:
+                eof = True
+            buffer = buffer[pos:] + more
+            pos = 0
+            return bool(more)
+
+        def next_char():
+            """First non-whitespace character at or after pos (None at EOF)."""
+            nonlocal pos
+            while True:
+                pos = WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return None
+
+        if next_char() != '[':
+            raise ValueError(f"{path}: expected a JSON array")
+        pos += 1
+        expect_value = True
+        while True:
+            char = next_char()
+            if char is None:
+                raise ValueError(f"{path}: unterminated JSON array")
+            if char == ']':
+                return
+            if not expect_value:
+                if char != ',':
+                    raise ValueError(f"{path}: expected ',' or ']' between array elements")
+                pos += 1
+                expect_value = True
+                continue
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            if end == len(buffer) and not eof:
+                # A number may continue in the next chunk
+                if fill():
+                    continue
+            pos = end
+            expect_value = False
+            yield element
+
+
+def iter_csv_records(path):
+    """Yields the rows of a Voteview CSV export as dicts, with the numeric
+    columns converted the way they appear in the JSON files."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            for field in INT_FIELDS & row.keys():
+                value = row[field]
+                if value:
+                    try:
+                        row[field] = int(float(value))
+                    except ValueError:
+                        pass
+                else:
+                    row[field] = None
+            yield row
+
+
+def iter_voteview_records(path):
+    """Records of a Voteview .json or .csv file, one at a time."""
+    if path.lower().endswith('.csv'):
+        return iter_csv_records(path)
+    return iter_json_array(path)
+
+
+def voteview_files(folder, kind):
+    """Sorted 'HS*_<kind>.json' / '.csv' file names in `folder`. When both
+    formats of one file exist, the CSV is used."""
+    by_stem = {}
+    for name in os.listdir(folder):
+        stem, ext = os.path.splitext(name)
+        if name.startswith('HS') and stem.endswith(f'_{kind}') and ext.lower() in ('.json', '.csv'):
+            if stem not in by_stem or ext.lower() == '.csv':
+                by_stem[stem] = name
+    return [by_stem[stem] for stem in sorted(by_stem)]
@@ -15,7 +15,8 @@ import psycopg2
 os.environ["TESTING"] = "true"
 
 from app.main import app as flask_app
-from app import config
+from app import config, derived
+from bin import populate_votes
 
 
 # Test database configuration
@@ -25,6 +26,7 @@ DUMP_ARCHIVE = Path(__file__).parent.parent / "bin" / "pg-dump.tar.bz2"
 TABLES = [
     "pt.fec_politician_map",
     "pt.Votes",
+    "pt.RollCalls",
     "pt.Donations",
     "pt.Donors",
     "pt.Bills",
@@ -32,6 +34,16 @@ TABLES = [
 ]
 
 
+def refresh_derived_data(conn):
+    """Rebuild derived tables and invalidate the app's in-process caches.
+
+    Mirrors what the bin/populate_* scripts do at the end of a run.
+    """
+    derived.refresh_politician_industry_totals(conn)
+    derived.refresh_bill_subjects(conn)
+    derived.bump_data_version(conn, "tests")
+
+
 def verify_test_database():
     """Ensure we're using the test database to prevent data loss."""
     if config.conn_params["dbname"] != "paper_trail_test":
@@ -201,6 +213,8 @@ def setup_test_db():
         # Create schema
         cursor.execute("CREATE SCHEMA IF NOT EXISTS pt")
         cursor.execute("SET search_path TO pt, public")
+        # Search endpoints rank with pg_trgm's similarity()
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
 
         # Drop existing tables
         for table in TABLES:
@@ -209,6 +223,17 @@ def setup_test_db():
         # Restore schema from dump
         restore_schema_from_dump(cursor)
 
+        # Columns the populate scripts add but the dump predates
+        cursor.execute("ALTER TABLE pt.Bills ADD COLUMN IF NOT EXISTS BillType TEXT")
+        # RollCalls, and the Votes.RollCallID column keyed on it
+        populate_votes.create_rollcalls_table_if_not_exists(conn)
+        populate_votes.create_votes_table_if_not_exists(conn)
+
+        # Derived tables the API reads but the dump predates
+        derived.ensure_data_versions_table(conn)
+        derived.ensure_politician_industry_totals(conn)
+        derived.ensure_bill_subjects_table(conn)
+
         print("Test database schema created successfully")
 
     finally:
@@ -251,6 +276,8 @@ def clean_db(db_connection):
     finally:
         cursor.close()
 
+    refresh_derived_data(db_connection)
+
     yield db_connection
 
 
@@ -273,6 +300,8 @@ def seed_test_data(clean_db):
     finally:
         cursor.close()
 
+    refresh_derived_data(clean_db)
+
     return clean_db
 
 
@@ -1,3 +1,4 @@
+import re
 from datetime import date, timedelta
 
 
@@ -753,12 +754,14 @@ def seed_bills(cursor):
     ]
 
     for bill in bills:
+        # BillType is the type code ingest stores, e.g. "H.R.1" -> "hr"
+        bill_type = re.sub(r"[^A-Za-z]", "", bill[0]).lower()
         cursor.execute(
             """
-            INSERT INTO pt.Bills (BillNumber, Title, DateIntroduced, Congress, Subjects)
-            VALUES (%s, %s, %s, %s, %s)
+            INSERT INTO pt.Bills (BillNumber, Title, DateIntroduced, Congress, Subjects, BillType)
+            VALUES (%s, %s, %s, %s, %s, %s)
         """,
-            bill,
+            (*bill, bill_type),
         )
 
 
@@ -1082,13 +1085,15 @@ def seed_votes(cursor):
         bill_id = bill_ids[i % len(bill_ids)]
         vote = votes_list[i % len(votes_list)]
 
-        votes.append((politician_id, bill_id, vote))
+        votes.append((politician_id, vote, bill_id))
 
+    # Congress and SortDate are filled in from the bill, as populate_votes.py does
     for vote in votes:
         cursor.execute(
             """
-            INSERT INTO pt.Votes (PoliticianID, BillID, Vote)
-            VALUES (%s, %s, %s)
+            INSERT INTO pt.Votes (PoliticianID, BillID, Vote, Congress, SortDate)
+            SELECT %s, BillID, %s, Congress, COALESCE(DateIntroduced, 'infinity'::date)
+            FROM pt.Bills WHERE BillID = %s
         """,
             vote,
         )
@@ -141,6 +141,62 @@ class TestBillSubjects:
         assert len(data) <= 150, "Expected less than 150 unique subjects"
 
 
+class TestBillSubjectsCaching:
+    """Tests for the bill_subjects vocabulary table and HTTP caching."""
+
+    def test_response_has_etag_and_cache_control(self, client, seed_test_data):
+        """Responses are cacheable and carry an ETag."""
+        response = client.get("/api/bills/subjects")
+        assert response.status_code == 200
+        assert response.headers.get("ETag")
+        assert "max-age=" in response.headers.get("Cache-Control", "")
+
+    def test_if_none_match_returns_304(self, client, seed_test_data):
+        """A matching If-None-Match is answered with 304 and no body."""
+        etag = client.get("/api/bills/subjects").headers["ETag"]
+        response = client.get("/api/bills/subjects", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_vocabulary_table_matches_bills(self, client, seed_test_data):
+        """bill_subjects holds exactly the distinct subjects of Bills."""
+        cursor = seed_test_data.cursor()
+        cursor.execute(
+            "SELECT DISTINCT UNNEST(subjects) FROM pt.Bills ORDER BY 1"
+        )
+        expected = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT subject FROM pt.bill_subjects ORDER BY subject")
+        assert [row[0] for row in cursor.fetchall()] == expected
+        cursor.close()
+
+        assert json.loads(client.get("/api/bills/subjects").data) == expected
+
+    def test_refresh_picks_up_new_subjects(self, client, seed_test_data):
+        """A refreshed vocabulary and bumped data version change the response."""
+        from app import derived
+
+        before = client.get("/api/bills/subjects")
+
+        cursor = seed_test_data.cursor()
+        cursor.execute(
+            """
+            INSERT INTO pt.Bills (BillNumber, Title, DateIntroduced, Congress, Subjects, BillType)
+            VALUES ('HR9999', 'New Bill', '2023-01-01', 118, ARRAY['Zoology'], 'hr')
+            """
+        )
+        seed_test_data.commit()
+        cursor.close()
+        derived.refresh_bill_subjects(seed_test_data)
+        derived.bump_data_version(seed_test_data, "bills")
+
+        after = client.get(
+            "/api/bills/subjects", headers={"If-None-Match": before.headers["ETag"]}
+        )
+        assert after.status_code == 200
+        assert "Zoology" in json.loads(after.data)
+        assert after.headers["ETag"] != before.headers["ETag"]
+
+
 class TestBillSubjectsEdgeCases:
     """Edge case and error handling tests for /api/bills/subjects endpoint."""
 
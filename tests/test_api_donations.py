@@ -104,6 +104,25 @@ class TestDonationSummary:
 
         assert data1 == data2 == data3, "Results should be consistent"
 
+    def test_summary_matches_live_aggregate(self, client, seed_test_data, db_connection):
+        """Precomputed totals equal a live SUM over Donations joined to Donors."""
+        cursor = db_connection.cursor()
+        cursor.execute(
+            """
+            SELECT d.Industry, SUM(t.Amount)
+            FROM pt.Donations t
+            JOIN pt.Donors d ON t.DonorID = d.DonorID
+            WHERE t.PoliticianID = 1 AND d.Industry IS NOT NULL
+            GROUP BY d.Industry
+            """
+        )
+        expected = {industry: float(total) for industry, total in cursor.fetchall()}
+        cursor.close()
+
+        response = client.get("/api/politician/1/donations/summary")
+        data = json.loads(response.data)
+        assert {item["industry"]: item["totalamount"] for item in data} == expected
+
 
 class TestDonationSummarySQLInjection:
     """SQL injection protection tests for donation summary endpoint."""
@@ -144,6 +144,85 @@ class TestDonorsSearch:
             assert names == sorted(names), "Results should be sorted alphabetically"
 
 
+class TestDonorsSearchRanked:
+    """Test suite for ranked, cursor-paginated donor search (?mode=ranked)."""
+
+    def test_ranked_mode_returns_donors_and_cursor(self, client, seed_test_data):
+        """Ranked mode wraps results with a next-page cursor."""
+        response = client.get("/api/donors/search?name=Google&mode=ranked")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        assert set(data.keys()) == {"donors", "next"}
+        assert len(data["donors"]) >= 1
+        assert data["next"] is None, "Single page of results should have no cursor"
+
+    def test_ranked_mode_orders_by_similarity(self, client, seed_test_data):
+        """The closest name match is returned first."""
+        response = client.get("/api/donors/search?name=Google LLC&mode=ranked")
+        data = json.loads(response.data)
+        assert data["donors"][0]["name"] == "Google LLC"
+
+    def test_ranked_mode_cursor_walks_all_results(self, client, seed_test_data):
+        """Following ?after= cursors returns every match exactly once."""
+        full = json.loads(
+            client.get("/api/donors/search?name=Inc&mode=ranked").data
+        )["donors"]
+        assert len(full) >= 3, "Expected several 'Inc' donors in seed data"
+
+        seen = []
+        url = "/api/donors/search?name=Inc&mode=ranked&limit=2"
+        next_cursor = ""
+        for _ in range(len(full)):
+            response = client.get(url + (f"&after={next_cursor}" if next_cursor else ""))
+            assert response.status_code == 200
+            page = json.loads(response.data)
+            assert len(page["donors"]) <= 2
+            seen.extend(d["donorid"] for d in page["donors"])
+            next_cursor = page["next"]
+            if not next_cursor:
+                break
+
+        assert seen == [d["donorid"] for d in full]
+
+    def test_state_filter(self, client, seed_test_data):
+        """?state= restricts results to donors in that state."""
+        response = client.get("/api/donors/search?name=Energy&mode=ranked&state=nc")
+        data = json.loads(response.data)
+        assert [d["name"] for d in data["donors"]] == ["Duke Energy"]
+
+    def test_employer_filter(self, client, seed_test_data):
+        """?employer= restricts results by employer substring."""
+        response = client.get("/api/donors/search?name=Jam&employer=jpmorgan")
+        data = json.loads(response.data)
+        assert len(data) >= 1
+        for donor in data:
+            assert "jpmorgan" in (donor["employer"] or "").lower()
+
+    def test_invalid_cursor_rejected(self, client, seed_test_data):
+        """Malformed ?after= tokens return 400 instead of a server error."""
+        response = client.get("/api/donors/search?name=Inc&mode=ranked&after=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_results_are_capped(self, client, seed_test_data):
+        """Neither mode returns more than DONOR_SEARCH_LIMIT rows."""
+        from app import config
+
+        original_limit = config.DONOR_SEARCH_LIMIT
+        config.DONOR_SEARCH_LIMIT = 2
+        try:
+            default_data = json.loads(client.get("/api/donors/search?name=Inc").data)
+            ranked_data = json.loads(
+                client.get("/api/donors/search?name=Inc&mode=ranked&limit=50").data
+            )
+        finally:
+            config.DONOR_SEARCH_LIMIT = original_limit
+
+        assert len(default_data) == 2
+        assert len(ranked_data["donors"]) == 2
+        assert ranked_data["next"] is not None
+
+
 class TestDonorsSearchSQLInjection:
     """SQL injection protection tests for /api/donors/search endpoint."""
 
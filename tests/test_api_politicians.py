@@ -160,6 +160,95 @@ class TestPoliticiansSearch:
             assert max(active_indices) < min(inactive_indices), \
                 "Active politicians should appear before inactive"
 
+    def test_search_ranks_closest_match_first(self, client, seed_test_data):
+        """Closer trigram matches rank ahead of alphabetical order."""
+        response = client.get("/api/politicians/search?name=Scott")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        # 'Tim Scott' shares the largest fraction of trigrams with 'Scott';
+        # plain LastName ordering would have put 'Scott Perry' first.
+        assert len(data) >= 3, "Expected Rick Scott, Tim Scott and Scott Perry"
+        assert data[0]['firstname'] == 'Tim'
+        assert data[0]['lastname'] == 'Scott'
+
+    def test_search_caps_result_count(self, client, seed_test_data):
+        """Search never returns more than POLITICIAN_SEARCH_LIMIT rows."""
+        from app import config
+
+        original_limit = config.POLITICIAN_SEARCH_LIMIT
+        config.POLITICIAN_SEARCH_LIMIT = 2
+        try:
+            response = client.get("/api/politicians/search?name=an")
+        finally:
+            config.POLITICIAN_SEARCH_LIMIT = original_limit
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data) == 2
+
+
+class TestPoliticianSearchIndex:
+    """Test suite for the in-process index behind /api/politicians/search."""
+
+    ROWS = [
+        (1, "Tim", "Scott", "Republican", "South Carolina", "Senator", True),
+        (2, "Rick", "Scott", "Republican", "Florida", "Senator", True),
+        (3, "Scott", "Perry", "Republican", "Pennsylvania", "Representative", True),
+        (4, "Walter", "Scott", "Democrat", "Ohio", "Representative", False),
+    ]
+
+    def test_index_matches_substrings(self):
+        """Index returns every row whose full name contains the query."""
+        from app.search_index import PoliticianIndex
+
+        index = PoliticianIndex(self.ROWS, version=1)
+        ids = {p["politicianid"] for p in index.search("cot", limit=10)}
+        assert ids == {1, 2, 3, 4}
+        assert index.search("xyz", limit=10) == []
+
+    def test_index_ranking_matches_sql_order(self):
+        """Ranking is similarity DESC, then IsActive DESC, LastName, FirstName."""
+        from app.search_index import PoliticianIndex
+
+        index = PoliticianIndex(self.ROWS, version=1)
+        names = [(p["firstname"], p["lastname"]) for p in index.search("Scott", limit=10)]
+        assert names[0] == ("Tim", "Scott")
+        # Shorter names share a larger fraction of their trigrams with 'Scott'
+        assert names.index(("Rick", "Scott")) < names.index(("Walter", "Scott"))
+
+    def test_index_respects_limit(self):
+        """Index never returns more than `limit` rows."""
+        from app.search_index import PoliticianIndex
+
+        index = PoliticianIndex(self.ROWS, version=1)
+        assert len(index.search("sc", limit=2)) == 2
+
+    def test_index_refreshes_when_data_version_changes(
+        self, client, seed_test_data, db_connection
+    ):
+        """Rows added by a populate run appear once the data version is bumped."""
+        from app import derived
+
+        assert json.loads(client.get("/api/politicians/search?name=Zyxwv").data) == []
+
+        cursor = db_connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO pt.Politicians (FirstName, LastName, Party, Chamber, State, IsActive, Role)
+            VALUES ('Quinn', 'Zyxwvut', 'Independent', 'House', 'Ohio', TRUE, 'Representative')
+            """
+        )
+        db_connection.commit()
+        cursor.close()
+
+        # Without a bump the cached index is still served
+        assert json.loads(client.get("/api/politicians/search?name=Zyxwv").data) == []
+
+        derived.bump_data_version(db_connection, "politicians")
+        data = json.loads(client.get("/api/politicians/search?name=Zyxwv").data)
+        assert [p["lastname"] for p in data] == ["Zyxwvut"]
+
 
 class TestPoliticiansSearchSQLInjection:
     """SQL injection protection tests for /api/politicians/search endpoint."""
@@ -205,6 +205,176 @@ class TestPoliticianVotes:
             assert first >= last, "Should default to DESC order"
 
 
+class TestPoliticianVotesKeyset:
+    """Test suite for cursor (?after=) pagination of the votes endpoint."""
+
+    def _add_votes_for_politician_one(self, db_connection):
+        """Give politician 1 a vote on every seeded bill so results span pages."""
+        from app import derived
+
+        cursor = db_connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO pt.Votes (PoliticianID, BillID, Vote, Congress, SortDate)
+            SELECT 1, BillID, 'Yea', Congress, COALESCE(DateIntroduced, 'infinity'::date) FROM pt.Bills
+            ON CONFLICT DO NOTHING
+            """
+        )
+        db_connection.commit()
+        cursor.close()
+        derived.bump_data_version(db_connection, "votes")
+
+    def _walk_cursor(self, client, base_url):
+        vote_ids = []
+        url = base_url + "&after="
+        for _ in range(100):
+            response = client.get(url)
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert len(data["votes"]) <= 10
+            vote_ids.extend(v["VoteID"] for v in data["votes"])
+            next_cursor = data["pagination"]["nextCursor"]
+            if not next_cursor:
+                break
+            url = base_url + f"&after={next_cursor}"
+        return vote_ids
+
+    def test_first_page_has_cursor_pagination(self, client, seed_test_data, db_connection):
+        """Empty ?after= returns the first page with a nextCursor."""
+        self._add_votes_for_politician_one(db_connection)
+        response = client.get("/api/politician/1/votes?after=")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        assert len(data["votes"]) == 10
+        assert data["pagination"]["nextCursor"]
+        assert data["pagination"]["totalVotes"] > 10
+
+    def test_cursor_pages_match_offset_pages(self, client, seed_test_data, db_connection):
+        """Walking cursors yields the same rows, in order, as OFFSET paging."""
+        self._add_votes_for_politician_one(db_connection)
+
+        for sort in ("desc", "asc"):
+            keyset_ids = self._walk_cursor(client, f"/api/politician/1/votes?sort={sort}")
+
+            offset_ids = []
+            first = json.loads(client.get(f"/api/politician/1/votes?sort={sort}").data)
+            for page in range(1, first["pagination"]["totalPages"] + 1):
+                data = json.loads(
+                    client.get(f"/api/politician/1/votes?sort={sort}&page={page}").data
+                )
+                offset_ids.extend(v["VoteID"] for v in data["votes"])
+
+            assert keyset_ids == offset_ids
+            assert len(keyset_ids) == first["pagination"]["totalVotes"]
+
+    def test_undated_bills_sort_first_when_descending(
+        self, client, seed_test_data, db_connection
+    ):
+        """Bills without an introduced date lead a descending list, in both modes."""
+        cursor = db_connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO pt.Bills (BillNumber, Title, DateIntroduced, Congress, Subjects, BillType)
+            VALUES ('HR9998', 'Undated Act', NULL, 118, ARRAY['Health'], 'hr')
+            """
+        )
+        db_connection.commit()
+        cursor.close()
+        self._add_votes_for_politician_one(db_connection)
+
+        offset_first = json.loads(client.get("/api/politician/1/votes").data)["votes"][0]
+        keyset_first = json.loads(client.get("/api/politician/1/votes?after=").data)["votes"][0]
+        assert offset_first["BillNumber"] == keyset_first["BillNumber"] == "HR9998"
+        assert offset_first["DateIntroduced"] is None
+
+        for sort in ("desc", "asc"):
+            keyset_ids = self._walk_cursor(client, f"/api/politician/1/votes?sort={sort}")
+            total = json.loads(
+                client.get(f"/api/politician/1/votes?sort={sort}").data
+            )["pagination"]["totalVotes"]
+            assert len(keyset_ids) == len(set(keyset_ids)) == total
+
+    def test_cursor_respects_filters(self, client, seed_test_data, db_connection):
+        """Cursor pages keep applying the type filter."""
+        self._add_votes_for_politician_one(db_connection)
+        for vote_id in self._walk_cursor(client, "/api/politician/1/votes?type=hr"):
+            assert isinstance(vote_id, int)
+
+        response = client.get("/api/politician/1/votes?type=hr&after=")
+        for vote in json.loads(response.data)["votes"]:
+            assert vote["BillNumber"].startswith("H.R.")
+
+    def test_invalid_cursor_rejected(self, client, seed_test_data):
+        """Malformed cursors return 400."""
+        response = client.get("/api/politician/1/votes?after=garbage")
+        assert response.status_code == 400
+
+    def test_total_refreshes_after_data_version_bump(
+        self, client, seed_test_data, db_connection
+    ):
+        """Cached totals are recomputed once the data version changes."""
+        before = json.loads(client.get("/api/politician/1/votes").data)
+        self._add_votes_for_politician_one(db_connection)
+        after = json.loads(client.get("/api/politician/1/votes").data)
+        assert after["pagination"]["totalVotes"] > before["pagination"]["totalVotes"]
+
+
+class TestPoliticianVotesRollCalls:
+    """Test suite for votes keyed by roll call."""
+
+    def test_each_roll_call_on_a_bill_is_listed(self, client, seed_test_data, db_connection):
+        """Two roll calls on one bill are two votes, each with its roll call."""
+        from app import derived
+
+        cursor = db_connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO pt.Bills (BillNumber, Title, DateIntroduced, Congress, Subjects, BillType)
+            VALUES ('HR9999', 'Twice Voted Act', '2023-02-01', 118, ARRAY['Health'], 'hr')
+            RETURNING BillID
+            """
+        )
+        bill_id = cursor.fetchone()[0]
+        for rollnumber, vote_date, question, vote in (
+            (41, "2023-03-01", "On Motion to Recommit", "Nay"),
+            (42, "2023-03-01", "On Passage", "Yea"),
+        ):
+            cursor.execute(
+                """
+                INSERT INTO pt.RollCalls (Congress, Chamber, RollNumber, VoteDate, Question, BillID)
+                VALUES (118, 'House', %s, %s, %s, %s)
+                RETURNING RollCallID
+                """,
+                (rollnumber, vote_date, question, bill_id),
+            )
+            cursor.execute(
+                "INSERT INTO pt.Votes (PoliticianID, RollCallID, BillID, Vote, Congress, SortDate) "
+                "VALUES (1, %s, %s, %s, 118, '2023-02-01')",
+                (cursor.fetchone()[0], bill_id, vote),
+            )
+        db_connection.commit()
+        cursor.close()
+        derived.bump_data_version(db_connection, "votes")
+
+        votes = json.loads(client.get("/api/politician/1/votes?subject=Health&type=hr").data)["votes"]
+        roll_calls = {
+            v["RollCall"]["RollNumber"]: (v["Vote"], v["RollCall"]["Question"], v["RollCall"]["Date"])
+            for v in votes
+            if v["BillNumber"] == "HR9999"
+        }
+        assert roll_calls == {
+            41: ("Nay", "On Motion to Recommit", "2023-03-01"),
+            42: ("Yea", "On Passage", "2023-03-01"),
+        }
+
+    def test_votes_without_roll_call_have_null(self, client, seed_test_data):
+        """Votes loaded without a roll call report RollCall as null."""
+        data = json.loads(client.get("/api/politician/1/votes").data)
+        for vote in data["votes"]:
+            assert vote["RollCall"] is None
+
+
 class TestPoliticianVotesFiltering:
     """Test suite for filtering functionality of votes endpoint."""
 
@@ -304,6 +474,36 @@ class TestPoliticianVotesFiltering:
         # Should return valid structure, possibly empty votes
         assert isinstance(data["votes"], list)
 
+    def test_bill_type_filter_uses_bill_type_column(
+        self, client, seed_test_data, db_connection
+    ):
+        """Type filter matches Bills.BillType, not a BillNumber prefix."""
+        from app import derived
+
+        cursor = db_connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO pt.Bills (BillNumber, Title, DateIntroduced, Congress, Subjects, BillType)
+            VALUES ('SJRES7', 'Joint Resolution', '2022-06-01', 118, ARRAY['Health'], 'sjres')
+            RETURNING BillID
+            """
+        )
+        bill_id = cursor.fetchone()[0]
+        cursor.execute(
+            "INSERT INTO pt.Votes (PoliticianID, BillID, Vote, Congress, SortDate) "
+            "VALUES (1, %s, 'Yea', 118, '2022-06-01')",
+            (bill_id,),
+        )
+        db_connection.commit()
+        cursor.close()
+        derived.bump_data_version(db_connection, "bills")
+
+        data = json.loads(client.get("/api/politician/1/votes?type=SJRES").data)
+        assert [v["BillNumber"] for v in data["votes"]] == ["SJRES7"]
+
+        data = json.loads(client.get("/api/politician/1/votes?type=s").data)
+        assert "SJRES7" not in [v["BillNumber"] for v in data["votes"]]
+
     def test_filter_with_invalid_subject(self, client, seed_test_data):
         """Invalid subject filter returns empty or no matches."""
         response = client.get("/api/politician/1/votes?subject=NonexistentSubject123")
@@ -0,0 +1,193 @@
+"""Tests for the cache backends in app/cache.py.
+
+These don't need the database. The Redis backend runs against a small
+in-memory stand-in that speaks the same client API.
+"""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import fnmatch
+import sqlite3
+import time
+
+import pytest
+
+from app import cache
+
+
+class LocalRedis:
+    """Stand-in for redis.Redis covering what RedisCache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class BrokenRedis:
+    """A client whose server is unreachable."""
+
+    def get(self, key):
+        raise ConnectionError("connection refused")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("connection refused")
+
+
+class TestTTLCache:
+    """Test suite for the in-process LRU."""
+
+    def test_evicts_least_recently_used(self):
+        """The entry read least recently goes first."""
+        lru = cache.TTLCache(maxsize=2, ttl=0)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        assert lru.get("a") == 1
+        assert lru.get("b") is None
+        assert lru.get("c") == 3
+
+    def test_entries_expire(self):
+        """Entries older than ttl are misses."""
+        lru = cache.TTLCache(maxsize=2, ttl=0.01)
+        lru.set("a", 1)
+        time.sleep(0.02)
+        assert lru.get("a") is None
+        assert len(lru) == 0
+
+
+class TestSQLiteCache:
+    """Test suite for the file-backed shared cache."""
+
+    def test_round_trip(self, tmp_path):
+        """Stored bytes come back unchanged."""
+        shared = cache.SQLiteCache(str(tmp_path / "cache.sqlite3"), maxsize=10, ttl=60)
+        shared.set("k", b"\x00payload")
+        assert shared.get("k") == b"\x00payload"
+        assert shared.get("missing") is None
+
+    def test_shared_between_instances(self, tmp_path):
+        """A value written by one worker is visible to another."""
+        path = str(tmp_path / "cache.sqlite3")
+        worker_a = cache.SQLiteCache(path, maxsize=10, ttl=60)
+        worker_b = cache.SQLiteCache(path, maxsize=10, ttl=60)
+        worker_a.set("page", b"rendered once")
+        assert worker_b.get("page") == b"rendered once"
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """The table never grows past maxsize."""
+        shared = cache.SQLiteCache(
+            str(tmp_path / "cache.sqlite3"), maxsize=2, ttl=0, touch_interval=0
+        )
+        shared.set("a", b"1")
+        time.sleep(0.01)
+        shared.set("b", b"2")
+        time.sleep(0.01)
+        shared.get("a")
+        time.sleep(0.01)
+        shared.set("c", b"3")
+        assert len(shared) == 2
+        assert shared.get("b") is None
+        assert shared.get("a") == b"1"
+
+    def test_entries_expire(self, tmp_path):
+        """Entries older than ttl are misses."""
+        shared = cache.SQLiteCache(str(tmp_path / "cache.sqlite3"), maxsize=10, ttl=0.01)
+        shared.set("a", b"1")
+        time.sleep(0.02)
+        assert shared.get("a") is None
+
+    def test_recent_hit_does_not_write(self, tmp_path):
+        """Hits within touch_interval leave the access time alone."""
+        shared = cache.SQLiteCache(str(tmp_path / "cache.sqlite3"), maxsize=10, ttl=60)
+        shared.set("a", b"1")
+        before = shared._connection().execute("SELECT accessed_at FROM cache_entries;").fetchone()
+        time.sleep(0.01)
+        assert shared.get("a") == b"1"
+        after = shared._connection().execute("SELECT accessed_at FROM cache_entries;").fetchone()
+        assert after == before
+
+    def test_hit_while_another_worker_writes(self, tmp_path):
+        """A hit doesn't wait for, or fail on, another worker's write lock."""
+        path = str(tmp_path / "cache.sqlite3")
+        shared = cache.SQLiteCache(path, maxsize=10, ttl=60, touch_interval=0)
+        shared.set("a", b"1")
+
+        writer = sqlite3.connect(path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE;")
+        try:
+            started = time.monotonic()
+            assert shared.get("a") == b"1"
+            assert time.monotonic() - started < 1
+        finally:
+            writer.execute("ROLLBACK;")
+            writer.close()
+
+    def test_clear(self, tmp_path):
+        """clear() empties the file for every worker."""
+        shared = cache.SQLiteCache(str(tmp_path / "cache.sqlite3"), maxsize=10, ttl=60)
+        shared.set("a", b"1")
+        shared.clear()
+        assert len(shared) == 0
+
+
+class TestRedisCache:
+    """Test suite for the Redis-compatible backend."""
+
+    def test_round_trip_with_prefix_and_ttl(self):
+        """Keys are namespaced and stored with an expiry."""
+        server = LocalRedis()
+        shared = cache.RedisCache(server, ttl=60)
+        shared.set("k", b"v")
+        assert shared.get("k") == b"v"
+        value, expires_at = server.data["paper-trail:k"]
+        assert value == b"v" and expires_at is not None
+
+    def test_clear_only_touches_own_prefix(self):
+        """clear() leaves other applications' keys alone."""
+        server = LocalRedis()
+        server.set("other-app:k", b"keep")
+        shared = cache.RedisCache(server, ttl=60)
+        shared.set("k", b"v")
+        shared.clear()
+        assert len(shared) == 0
+        assert server.get("other-app:k") == b"keep"
+
+    def test_unreachable_server_is_a_miss(self):
+        """Connection errors don't take the API down."""
+        shared = cache.RedisCache(BrokenRedis(), ttl=60)
+        shared.set("k", b"v")
+        assert shared.get("k") is None
+
+
+class TestMakeCacheBackend:
+    """Test suite for backend selection."""
+
+    def test_memory_backend(self):
+        assert isinstance(cache.make_cache_backend("memory", 10, 60), cache.TTLCache)
+
+    def test_sqlite_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache.config, "CACHE_SQLITE_PATH", str(tmp_path / "c.sqlite3"))
+        assert isinstance(cache.make_cache_backend("sqlite", 10, 60), cache.SQLiteCache)
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            cache.make_cache_backend("memcached", 10, 60)
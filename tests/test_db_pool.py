@@ -0,0 +1,62 @@
+"""Tests for the pooled database connections in app/db.py.
+
+Verifies per-request checkout/return, connection reuse, and the
+search_path set at connect time.
+"""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import json
+
+from app import db
+
+
+class TestConnectionPool:
+    """Test suite for the per-process connection pool."""
+
+    def test_connection_reused_within_app_context(self, app, seed_test_data):
+        """Repeated calls in one app context return the same connection."""
+        with app.app_context():
+            first = db.get_db_connection()
+            second = db.get_db_connection()
+            assert first is second
+
+    def test_connection_returned_after_request(self, client, seed_test_data):
+        """Connections go back to the pool once a request finishes."""
+        pool = db.get_pool()
+        response = client.get("/api/politician/1")
+        assert response.status_code == 200
+        assert not pool._used, "Pool should have no checked-out connections"
+
+    def test_connection_reused_across_requests(self, app, seed_test_data):
+        """A returned connection is handed out again on the next checkout."""
+        with app.app_context():
+            first = db.get_db_connection()
+        with app.app_context():
+            second = db.get_db_connection()
+        assert first is second
+
+    def test_search_path_set_on_connect(self, app, seed_test_data):
+        """Pooled connections resolve unqualified names in the pt schema."""
+        with app.app_context():
+            cur = db.get_db_connection().cursor()
+            cur.execute("SHOW search_path;")
+            search_path = cur.fetchone()[0]
+            cur.close()
+        assert search_path.replace(" ", "").startswith("pt,")
+
+    def test_failed_query_does_not_poison_pool(self, app, client, seed_test_data):
+        """A request that errors leaves a usable connection behind."""
+        with app.app_context():
+            cur = db.get_db_connection().cursor()
+            try:
+                cur.execute("SELECT * FROM table_that_does_not_exist;")
+            except Exception:
+                pass
+            cur.close()
+
+        response = client.get("/api/politician/1")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["politicianid"] == 1
@@ -0,0 +1,86 @@
+"""Tests for the compact donor-key index in bin/donor_index.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import sys
+import zlib
+
+from bin import donor_index
+from bin.donor_index import DonorKeyIndex
+
+
+def donor_key(i):
+    return (f"donor {i}", "individual", f"employer {i % 50}", "oh")
+
+
+class TestDonorKeyIndex:
+    """Test suite for the open-addressing donor index."""
+
+    def test_get_and_contains(self):
+        """Stored keys map to their IDs; unknown keys are missing."""
+        index = DonorKeyIndex()
+        index[("acme pac", "pac/party", "", "")] = 7
+        assert index.get(("acme pac", "pac/party", "", "")) == 7
+        assert ("acme pac", "pac/party", "", "") in index
+        assert ("acme pac", "pac/party", "", "tx") not in index
+        assert index.get(("nobody", "individual", "", ""), 0) == 0
+
+    def test_growth_keeps_every_key(self):
+        """Resizing past the load factor rehashes every entry."""
+        index = DonorKeyIndex(capacity=4)
+        for i in range(1, 5001):
+            index[donor_key(i)] = i
+        assert len(index) == 5000
+        assert all(index.get(donor_key(i)) == i for i in range(1, 5001))
+
+    def test_clear(self):
+        """clear() forgets every key."""
+        index = DonorKeyIndex()
+        index[donor_key(1)] = 1
+        index.clear()
+        assert len(index) == 0
+        assert donor_key(1) not in index
+
+    def test_full_collision_falls_back_to_exact_keys(self, monkeypatch):
+        """Two donors with the same hash and fingerprint aren't confused."""
+        monkeypatch.setattr(donor_index, "key_hashes", lambda key: (42, 42))
+        index = DonorKeyIndex()
+        index[donor_key(1)] = 1
+        index[donor_key(2)] = 2
+
+        assert index.get(donor_key(2)) == 2
+        # The first key's ID can't be told apart any more: report it as
+        # unknown so the caller asks the database again
+        assert index.get(donor_key(1)) is None
+        index[donor_key(1)] = 1
+        assert index.get(donor_key(1)) == 1
+        assert len(index) == 2
+
+    def test_crc32_collision_is_not_a_hit(self, monkeypatch):
+        """A key looked up before it's set doesn't borrow another donor's ID
+        when the hash and a 32-bit CRC of the two keys collide."""
+        monkeypatch.setattr(donor_index, "hash", lambda key: 42, raising=False)
+        first = ("uablaijhsa", "individual", "", "oh")
+        second = ("pfcxpytzcn", "individual", "", "oh")
+        assert zlib.crc32("\x1f".join(first).encode()) == zlib.crc32("\x1f".join(second).encode())
+
+        index = DonorKeyIndex()
+        index[first] = 1
+        assert index.get(second) is None
+        assert second not in index
+        index[second] = 2
+        assert (index.get(first), index.get(second)) == (1, 2)
+
+    def test_smaller_than_a_dict_of_tuples(self):
+        """The slot arrays are a fraction of the dict they replace."""
+        keys = [donor_key(i) for i in range(1, 20001)]
+        index = DonorKeyIndex()
+        plain = {}
+        for i, key in enumerate(keys, start=1):
+            index[key] = i
+            plain[key] = i
+        dict_bytes = sys.getsizeof(plain) + sum(
+            sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) for key in keys
+        )
+        assert index.nbytes() * 5 < dict_bytes
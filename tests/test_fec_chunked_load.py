@@ -0,0 +1,180 @@
+"""Tests for the chunked donation flush in populate_donors_and_donations.py.
+
+load_fec_file writes a file's donations every FEC_CHUNK_ROWS parsed rows.
+These load the same pas2 file with a tiny chunk size and with one chunk
+for the whole file, into tables of their own schema, and compare the rows.
+Also checks that amendments only replace rows of their own cycle.
+"""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import zipfile
+
+import pytest
+
+from bin import populate_donors_and_donations as ingest
+from bin.donor_index import DonorKeyIndex
+from bin.fec_text_cache import TextCache
+from bin.pg_partitions import ensure_default_partition
+
+SCHEMA = "fec_load_test"
+ROWS = 2500
+COMMITTEES = 40
+CANDIDATES = {"H0OH01001": 1, "S0OH00002": 2}
+
+
+def pas2_line(**fields):
+    return "|".join(fields.get(header, "") for header in ingest.PAS2_HEADERS)
+
+
+def write_pas2_zip(path):
+    """A pas2 file with ROWS donations over $2000, then amendments of two of
+    them (one early, one late in the file) and a termination of a third."""
+    candidates = sorted(CANDIDATES)
+    lines = []
+    for i in range(ROWS):
+        lines.append(pas2_line(
+            CMTE_ID=f"C{i % COMMITTEES:03d}", AMNDT_IND="N", TRANSACTION_DT=f"01{i % 28 + 1:02d}2024",
+            TRANSACTION_AMT=str(2001 + i), CAND_ID=candidates[i % 2], TRAN_ID=f"T{i}", SUB_ID=str(1000 + i),
+        ))
+    for i, amndt_ind, amount in ((5, "A", 9005), (1500, "A", 9150), (7, "T", 0)):
+        lines.append(pas2_line(
+            CMTE_ID=f"C{i % COMMITTEES:03d}", AMNDT_IND=amndt_ind, TRANSACTION_DT="03012024",
+            TRANSACTION_AMT=str(amount), CAND_ID=candidates[i % 2], TRAN_ID=f"T{i}", SUB_ID=str(10000 + i),
+        ))
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("itpas2.txt", "".join(line + "\n" for line in lines).encode("latin-1"))
+    return str(path)
+
+
+@pytest.fixture
+def fec_tables(db_connection):
+    """Politicians, Donors and the partitioned Donations in their own schema."""
+    cursor = db_connection.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"SET search_path TO {SCHEMA}, public")
+    cursor.execute("CREATE TABLE Politicians (PoliticianID INT PRIMARY KEY)")
+    cursor.execute("INSERT INTO Politicians VALUES (1), (2)")
+    cursor.execute(
+        "CREATE TABLE Donors (DonorID SERIAL PRIMARY KEY, Name TEXT, DonorType TEXT, Employer TEXT, State TEXT)"
+    )
+    cursor.execute(ingest.DONATIONS_TABLE_SQL)
+    ensure_default_partition(cursor, "Donations")
+    db_connection.commit()
+    ingest.ensure_donor_key_index(db_connection)
+    yield db_connection
+    db_connection.rollback()
+    cursor.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    cursor.execute("SET search_path TO pt, public")
+    db_connection.commit()
+    cursor.close()
+
+
+@pytest.fixture
+def loader(fec_tables, tmp_path, monkeypatch):
+    """Loads a file with a given FEC_CHUNK_ROWS into emptied tables.
+
+    Returns (flushed chunk sizes, recorded file stats, donor rows, donation rows).
+    """
+    path = write_pas2_zip(tmp_path / "pas224.zip")
+    monkeypatch.setattr(ingest, "text_cache", TextCache(str(tmp_path / "text"), 1 << 30))
+    monkeypatch.setattr(ingest, "FEC_PARSE_WORKERS", 1)
+    monkeypatch.setattr(ingest, "FEC_INCREMENTAL", False)
+    monkeypatch.setattr(ingest, "donations_table", "Donations")
+    monkeypatch.setattr(ingest, "fec_id_to_politician_id_lookup", dict(CANDIDATES))
+    monkeypatch.setattr(
+        ingest, "fec_committee_name_lookup", {f"C{i:03d}": f"Committee {i} PAC" for i in range(COMMITTEES)}
+    )
+
+    real_flush = ingest.flush_donations
+
+    def load(chunk_rows):
+        flushes = []
+        recorded = []
+
+        def counting_flush(conn, cur, pending, cycle):
+            if pending:
+                flushes.append(len(pending))
+            return real_flush(conn, cur, pending, cycle)
+
+        monkeypatch.setattr(ingest, "flush_donations", counting_flush)
+        monkeypatch.setattr(
+            ingest, "record_loaded_file", lambda conn, cur, filename, sha256, stats: recorded.append(dict(stats))
+        )
+        monkeypatch.setattr(ingest, "FEC_CHUNK_ROWS", chunk_rows)
+        monkeypatch.setattr(ingest, "donor_db_lookup", DonorKeyIndex())
+
+        cursor = fec_tables.cursor()
+        cursor.execute("TRUNCATE Donations, Donors RESTART IDENTITY CASCADE")
+        fec_tables.commit()
+        ingest.load_fec_file(fec_tables, cursor, path, ingest.parse_pas2_row, 10000, sha256="test")
+
+        cursor.execute("SELECT Name, DonorType, Employer, State FROM Donors ORDER BY Name")
+        donors = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT r.Name, d.PoliticianID, d.Amount, d.Date, d.ContributionType, d.SubID, d.TranKey, d.Cycle
+            FROM Donations d JOIN Donors r ON r.DonorID = d.DonorID
+            ORDER BY d.SubID
+            """
+        )
+        donations = cursor.fetchall()
+        cursor.close()
+        return flushes, recorded, donors, donations
+
+    return load
+
+
+class TestChunkedLoad:
+    """Test suite for flushing a file's donations in FEC_CHUNK_ROWS chunks."""
+
+    def test_small_chunks_match_single_chunk(self, loader):
+        """A file flushed in many chunks leaves the same rows as one flush."""
+        chunked = loader(50)
+        single = loader(ROWS * 10)
+
+        assert len(chunked[0]) >= 3
+        assert len(single[0]) == 1
+        assert sum(chunked[0]) == sum(single[0]) == ROWS + 3
+        # Same donors and donations, and the same file stats recorded
+        assert chunked[1] == single[1]
+        assert chunked[2] == single[2]
+        assert chunked[3] == single[3]
+
+    def test_amendments_apply_across_chunks(self, loader):
+        """An amendment flushed after the row it amends still replaces it."""
+        _, recorded, donors, donations = loader(50)
+
+        assert len(donors) == COMMITTEES
+        by_tran_key = {row[6]: row for row in donations}
+        assert len(donations) == ROWS - 1
+        assert "C007:T7" not in by_tran_key
+        assert by_tran_key["C005:T5"][2] == 9005 and by_tran_key["C005:T5"][5] == 10005
+        assert by_tran_key["C020:T1500"][2] == 9150
+        assert {row[7] for row in donations} == {2024}
+        assert recorded == [{"found": ROWS + 3, "min_sub_id": 1000, "max_sub_id": 10000 + 1500}]
+
+
+class TestAmendmentCycles:
+    """Test suite for keeping amendments within their FEC cycle."""
+
+    def test_amendment_leaves_other_cycles_alone(self, fec_tables, monkeypatch):
+        """A TRAN_ID reused in another cycle isn't superseded by this cycle's amendment."""
+        monkeypatch.setattr(ingest, "donations_table", "Donations")
+        cursor = fec_tables.cursor()
+        cursor.execute("INSERT INTO Donors (Name, DonorType) VALUES ('Acme PAC', 'PAC/Party') RETURNING DonorID")
+        donor_id = cursor.fetchone()[0]
+        fec_tables.commit()
+
+        def donation(amount, sub_id, amndt_ind):
+            return (donor_id, 1, amount, "2022-01-05", "PAC/Party", sub_id, "C001:T1", amndt_ind)
+
+        ingest.insert_donations(fec_tables, cursor, [donation(3000, 100, "N")], 2022)
+        ingest.insert_donations(fec_tables, cursor, [donation(4000, 200, "N")], 2024)
+        ingest.insert_donations(fec_tables, cursor, [donation(4500, 300, "A")], 2024)
+
+        cursor.execute("SELECT Cycle, Amount, SubID FROM Donations ORDER BY Cycle")
+        assert cursor.fetchall() == [(2022, 3000, 100), (2024, 4500, 300)]
+        cursor.close()
@@ -0,0 +1,112 @@
+"""Tests for the columnar itcont filter in bin/fec_columnar.py.
+
+The columnar path must produce exactly what parse_itcont_row() produces
+row by row, so each test compares the two on the same synthetic rows.
+"""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import itertools
+
+import pytest
+
+from bin import fec_columnar
+from bin import populate_donors_and_donations as ingest
+
+needs_numpy = pytest.mark.skipif(not fec_columnar.numpy_available(), reason="needs numpy")
+
+
+def itcont_row(**fields):
+    record = {header: "" for header in ingest.ITCONT_HEADERS}
+    record.update(fields)
+    return [record[header] for header in ingest.ITCONT_HEADERS]
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    monkeypatch.setattr(ingest, "fec_cmte_to_cand_id_lookup", {"C1": "H1", "C2": "H2", "C3": "H_UNKNOWN"})
+    monkeypatch.setattr(ingest, "fec_id_to_politician_id_lookup", {"H1": 10, "H2": 20})
+    monkeypatch.setattr(ingest, "sub_id_floor", 0)
+    monkeypatch.setattr(ingest, "itcont_committees", None)
+
+
+@pytest.fixture
+def mixed_rows():
+    """Every combination of the fields the filters look at, plus oddities."""
+    rows = []
+    combos = itertools.product(
+        ("C1", "C2", "C3", "C9"),
+        ("2500", "2000", "150", "bad", ""),
+        ("15", "15E", "15Z", "15C", "24K", "15e"),
+        ("", "C00OTHER"),
+        ("N", "A", "T", " a", ""),
+        ("TX1", ""),
+    )
+    for sub_id, (cmte, amt, tp, other, amndt, tran) in enumerate(combos, start=1000):
+        rows.append(
+            itcont_row(
+                CMTE_ID=cmte,
+                TRANSACTION_AMT=amt,
+                TRANSACTION_TP=tp,
+                OTHER_ID=other,
+                AMNDT_IND=amndt,
+                TRAN_ID=tran,
+                SUB_ID=str(sub_id),
+                TRANSACTION_DT="03152024",
+                NAME="DOE, JANE",
+                EMPLOYER="ACME",
+                STATE="OH",
+            )
+        )
+    rows.append(["C1", "N", "short row"])
+    rows.append(itcont_row(CMTE_ID="C1", TRANSACTION_AMT="5000", TRANSACTION_TP="15", SUB_ID="not a number"))
+    return rows
+
+
+def row_loop(rows):
+    return [item for item in map(ingest.parse_itcont_row, rows) if item is not None]
+
+
+class TestColumnarFilter:
+    """Test suite for cross-checking the columnar and row-by-row filters."""
+
+    def test_row_loop_used_when_disabled(self, lookups, mixed_rows):
+        """Without a committee array the batch parser is the plain row loop."""
+        assert ingest.parse_itcont_rows(mixed_rows) == row_loop(mixed_rows)
+
+    @needs_numpy
+    def test_matches_row_loop(self, lookups, mixed_rows, monkeypatch):
+        """The columnar filter yields the same items in the same order."""
+        expected = row_loop(mixed_rows)
+        committees = fec_columnar.committee_array(
+            ingest.fec_cmte_to_cand_id_lookup, ingest.fec_id_to_politician_id_lookup
+        )
+        monkeypatch.setattr(ingest, "itcont_committees", committees)
+
+        assert list(committees) == ["C1", "C2"]
+        assert expected  # the fixture must exercise both outcomes
+        assert ingest.parse_itcont_rows(mixed_rows) == expected
+
+    @needs_numpy
+    def test_matches_row_loop_above_sub_id_floor(self, lookups, mixed_rows, monkeypatch):
+        """Rows already applied by an earlier run are dropped by both paths."""
+        monkeypatch.setattr(ingest, "sub_id_floor", 1500)
+        monkeypatch.setattr(
+            ingest,
+            "itcont_committees",
+            fec_columnar.committee_array(ingest.fec_cmte_to_cand_id_lookup, ingest.fec_id_to_politician_id_lookup),
+        )
+        expected = row_loop(mixed_rows)
+        assert all(item[6] is None or item[6] > 1500 for item in expected)
+        assert ingest.parse_itcont_rows(mixed_rows) == expected
+
+    @needs_numpy
+    def test_mask_only_keeps_candidates(self, lookups, mixed_rows):
+        """Most rows are rejected by the mask without reaching the row parser."""
+        committees = fec_columnar.committee_array(
+            ingest.fec_cmte_to_cand_id_lookup, ingest.fec_id_to_politician_id_lookup
+        )
+        keep = fec_columnar.itcont_keep_mask(mixed_rows, ingest.ITCONT_COLUMNS, committees)
+        assert keep.sum() < len(mixed_rows) / 2
+        assert keep.sum() >= len(row_loop(mixed_rows))
@@ -0,0 +1,77 @@
+"""Tests for the FEC lookup snapshots in bin/fec_lookup_snapshot.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import os
+
+import pytest
+
+from bin.fec_lookup_snapshot import SnapshotError, SnapshotMap, load_or_build, snapshot_digest, write_snapshot
+
+COMMITTEES = {"C00000042": "Friends of Zoë", "C00000001": "Acme PAC", "C00000100": ""}
+
+
+class TestSnapshotFile:
+    """Test suite for writing and mapping snapshot files."""
+
+    def test_round_trip(self, tmp_path):
+        """Every entry reads back, through lookups and to_dict()."""
+        path = str(tmp_path / "cm.snap")
+        write_snapshot(path, COMMITTEES)
+        with SnapshotMap(path) as snapshot:
+            assert len(snapshot) == 3
+            assert snapshot["C00000042"] == "Friends of Zoë"
+            assert snapshot.get("C00000100") == ""
+            assert snapshot.get("C99999999") is None
+            assert list(snapshot) == sorted(COMMITTEES)
+            assert snapshot.to_dict() == COMMITTEES
+
+    def test_empty_mapping(self, tmp_path):
+        """A snapshot with no entries is valid."""
+        path = str(tmp_path / "empty.snap")
+        write_snapshot(path, {})
+        with SnapshotMap(path) as snapshot:
+            assert snapshot.to_dict() == {}
+
+    def test_truncated_file_rejected(self, tmp_path):
+        """A cut-off snapshot raises SnapshotError rather than misreading."""
+        path = tmp_path / "cm.snap"
+        write_snapshot(str(path), COMMITTEES)
+        path.write_bytes(path.read_bytes()[:-3])
+        with pytest.raises(SnapshotError):
+            SnapshotMap(str(path))
+
+
+class TestLoadOrBuild:
+    """Test suite for snapshot reuse keyed by input archive hashes."""
+
+    def test_built_once_then_loaded(self, tmp_path):
+        """The second load with the same inputs doesn't call build()."""
+        builds = []
+
+        def build():
+            builds.append(1)
+            return dict(COMMITTEES), True
+
+        archives = [("cm24.zip", "a" * 64)]
+        first = load_or_build(str(tmp_path), "cm", archives, build)
+        second = load_or_build(str(tmp_path), "cm", archives, build)
+
+        assert first == second == COMMITTEES
+        assert len(builds) == 1
+
+    def test_changed_input_rebuilds_and_drops_old_snapshot(self, tmp_path):
+        """A new archive hash means a new snapshot; the stale one is removed."""
+        load_or_build(str(tmp_path), "cm", [("cm24.zip", "a" * 64)], lambda: ({"C1": "Old"}, True))
+        rebuilt = load_or_build(str(tmp_path), "cm", [("cm24.zip", "b" * 64)], lambda: ({"C1": "New"}, True))
+
+        assert rebuilt == {"C1": "New"}
+        snapshots = [name for name in os.listdir(tmp_path) if name.endswith(".snap")]
+        assert snapshots == [f"cm-{snapshot_digest('cm', [('cm24.zip', 'b' * 64)])}.snap"]
+
+    def test_incomplete_build_not_snapshotted(self, tmp_path):
+        """A lookup built while an input failed to read isn't persisted."""
+        archives = [("ccl24.zip", "c" * 64)]
+        assert load_or_build(str(tmp_path), "ccl", archives, lambda: ({"C1": "H1"}, False)) == {"C1": "H1"}
+        assert not any(name.endswith(".snap") for name in os.listdir(tmp_path))
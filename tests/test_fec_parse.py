@@ -0,0 +1,97 @@
+"""Tests for sharded, multi-process FEC parsing in bin/fec_parse.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import zipfile
+
+import pytest
+
+from bin import fec_parse
+
+# Read-only lookup the workers inherit from the parent at fork time
+committee_lookup = {}
+
+
+def parse_test_row(row):
+    """Keeps rows whose committee is in committee_lookup."""
+    candidate = committee_lookup.get(row[0])
+    if candidate is None:
+        return None
+    return (candidate, int(row[1]))
+
+
+def write_fec_file(path, rows):
+    with open(path, "w", encoding="latin-1") as f:
+        for committee, amount in rows:
+            f.write(f"{committee}|{amount}|Café Owner\n")
+
+
+@pytest.fixture
+def fec_file(tmp_path):
+    rows = [(f"C{i % 7:03d}", i) for i in range(5000)]
+    path = tmp_path / "itcont.txt"
+    write_fec_file(path, rows)
+    return str(path), rows
+
+
+class TestShardRanges:
+    """Test suite for newline-aligned byte ranges."""
+
+    def test_ranges_cover_file_without_gaps(self, fec_file):
+        """Shards are contiguous and span the whole file."""
+        path, _ = fec_file
+        ranges = fec_parse.shard_ranges(path, 1000)
+        assert ranges[0][0] == 0
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+        with open(path, "rb") as f:
+            assert ranges[-1][1] == len(f.read())
+
+    def test_ranges_end_on_newlines(self, fec_file):
+        """Every shard ends just after a newline."""
+        path, _ = fec_file
+        with open(path, "rb") as f:
+            data = f.read()
+        for _, end in fec_parse.shard_ranges(path, 777):
+            assert data[end - 1:end] == b"\n"
+
+    def test_shard_lines_reassemble_file(self, fec_file):
+        """Reading every shard yields every line exactly once."""
+        path, rows = fec_file
+        lines = []
+        for start, end in fec_parse.shard_ranges(path, 500):
+            lines.extend(fec_parse.read_shard_lines(path, start, end))
+        assert len(lines) == len(rows)
+        assert lines[0].startswith("C000|0|Café")
+
+
+class TestParseFileParallel:
+    """Test suite for the process-pool parser."""
+
+    @pytest.mark.skipif(not fec_parse.fork_available(), reason="needs fork")
+    def test_matches_serial_parse_in_order(self, fec_file, monkeypatch):
+        """Parallel results equal a serial parse, in file order."""
+        path, rows = fec_file
+        monkeypatch.setitem(committee_lookup, "C001", "P1")
+        monkeypatch.setitem(committee_lookup, "C004", "P4")
+
+        rows_read = 0
+        parsed = []
+        for count, items in fec_parse.parse_file_parallel(path, parse_test_row, 3, 2048):
+            rows_read += count
+            parsed.extend(items)
+
+        expected = [parse_test_row([c, str(a)]) for c, a in rows]
+        assert rows_read == len(rows)
+        assert parsed == [item for item in expected if item is not None]
+
+    def test_extract_data_file(self, fec_file, tmp_path):
+        """The .txt member of an FEC zip is decompressed to disk."""
+        path, _ = fec_file
+        zip_path = tmp_path / "indiv24.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(path, "itcont.txt")
+        extracted = fec_parse.extract_data_file(str(zip_path), str(tmp_path))
+        with open(extracted, "rb") as a, open(path, "rb") as b:
+            assert a.read() == b.read()
@@ -0,0 +1,81 @@
+"""Tests for the decompressed FEC payload cache in bin/fec_text_cache.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import os
+import zipfile
+
+import pytest
+
+from bin import fec_text_cache
+from bin.fec_text_cache import TextCache
+
+
+def write_zip(path, member, lines):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(member, "".join(line + "\n" for line in lines).encode("latin-1"))
+
+
+@pytest.fixture
+def extractions(monkeypatch):
+    """Counts calls to the real extract_data_file."""
+    calls = []
+    real = fec_text_cache.extract_data_file
+
+    def counting(zip_path, dest_dir):
+        calls.append(zip_path)
+        return real(zip_path, dest_dir)
+
+    monkeypatch.setattr(fec_text_cache, "extract_data_file", counting)
+    return calls
+
+
+class TestTextCache:
+    """Test suite for decompress-once, mmap-read FEC payloads."""
+
+    def test_rows_read_from_cached_payload(self, tmp_path, extractions):
+        """Rows come back decoded and the zip is only inflated once."""
+        zip_path = tmp_path / "cm24.zip"
+        write_zip(zip_path, "cm.txt", ["C001|Friends of Zoë|X", "C002|Acme PAC|Y"])
+        cache = TextCache(str(tmp_path / "cache"), max_bytes=10**6)
+
+        first = list(cache.read_rows(str(zip_path)))
+        second = list(TextCache(str(tmp_path / "cache"), max_bytes=10**6).read_rows(str(zip_path)))
+
+        assert first == second == [["C001", "Friends of Zoë", "X"], ["C002", "Acme PAC", "Y"]]
+        assert len(extractions) == 1
+
+    def test_changed_archive_gets_new_payload(self, tmp_path, extractions):
+        """Rewriting the zip invalidates the cached copy."""
+        zip_path = tmp_path / "ccl24.zip"
+        write_zip(zip_path, "ccl.txt", ["C001|H1"])
+        cache = TextCache(str(tmp_path / "cache"), max_bytes=10**6)
+        old_path = cache.text_path(str(zip_path))
+
+        write_zip(zip_path, "ccl.txt", ["C001|H1", "C002|H2"])
+        os.utime(zip_path, ns=(0, os.stat(zip_path).st_mtime_ns + 10**9))
+
+        assert cache.text_path(str(zip_path)) != old_path
+        assert list(cache.read_rows(str(zip_path))) == [["C001", "H1"], ["C002", "H2"]]
+
+    def test_empty_payload(self, tmp_path):
+        """An archive with an empty data file yields no rows."""
+        zip_path = tmp_path / "cn24.zip"
+        write_zip(zip_path, "cn.txt", [])
+        assert list(TextCache(str(tmp_path / "cache"), max_bytes=10**6).read_rows(str(zip_path))) == []
+
+    def test_least_recently_used_payload_evicted(self, tmp_path):
+        """Going over max_bytes drops the oldest payload, not the new one."""
+        cache = TextCache(str(tmp_path / "cache"), max_bytes=1500)
+        paths = []
+        for name in ("a.zip", "b.zip"):
+            write_zip(tmp_path / name, "x.txt", [name * 200])
+            paths.append(cache.text_path(str(tmp_path / name)))
+            os.utime(paths[-1], (len(paths), len(paths)))
+
+        write_zip(tmp_path / "c.zip", "x.txt", ["c" * 400])
+        newest = cache.text_path(str(tmp_path / "c.zip"))
+
+        assert not os.path.exists(paths[0])
+        assert os.path.exists(paths[1]) and os.path.exists(newest)
@@ -0,0 +1,101 @@
+"""Tests for the response cache in app/http_cache.py.
+
+Verifies ETag/If-None-Match handling, that repeat requests are served
+from the cache, and that bumping the data version invalidates it.
+"""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import json
+import sqlite3
+
+from app import cache, derived, http_cache
+
+
+class TestResponseCache:
+    """Test suite for cached read-only API responses."""
+
+    def test_response_has_strong_etag(self, client, seed_test_data):
+        """Cached routes return a strong (non-weak) ETag."""
+        response = client.get("/api/politician/1")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag and not etag.startswith("W/")
+
+    def test_if_none_match_returns_304(self, client, seed_test_data):
+        """A matching If-None-Match gets 304 with an empty body."""
+        etag = client.get("/api/politician/1").headers["ETag"]
+        response = client.get("/api/politician/1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_stale_etag_returns_full_response(self, client, seed_test_data):
+        """A non-matching If-None-Match gets the full body."""
+        response = client.get("/api/politician/1", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert json.loads(response.data)["politicianid"] == 1
+
+    def test_repeat_request_served_from_cache(self, client, seed_test_data):
+        """Until the data version moves, database changes aren't visible."""
+        before = json.loads(client.get("/api/politician/1").data)
+
+        cursor = seed_test_data.cursor()
+        cursor.execute("UPDATE pt.Politicians SET LastName = 'Renamed' WHERE PoliticianID = 1")
+        seed_test_data.commit()
+        cursor.close()
+
+        assert json.loads(client.get("/api/politician/1").data) == before
+
+        derived.bump_data_version(seed_test_data, "politicians")
+        after = json.loads(client.get("/api/politician/1").data)
+        assert after["lastname"] == "Renamed"
+
+    def test_query_arg_order_shares_entry(self, client, seed_test_data):
+        """Reordered query args hit the same cache entry."""
+        first = client.get("/api/politician/1/votes?type=hr&sort=asc")
+        second = client.get("/api/politician/1/votes?sort=asc&type=hr")
+        assert first.headers["ETag"] == second.headers["ETag"]
+
+    def test_errors_are_not_cached(self, client, seed_test_data):
+        """Non-200 responses pass through without an ETag."""
+        response = client.get("/api/politician/999999")
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
+
+    def test_disabled_cache_skips_etag(self, client, seed_test_data, monkeypatch):
+        """RESPONSE_CACHE_ENABLED=false serves views directly."""
+        monkeypatch.setattr(http_cache.config, "RESPONSE_CACHE_ENABLED", False)
+        response = client.get("/api/politician/1")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+    def test_shared_backend_serves_other_workers(
+        self, client, seed_test_data, monkeypatch, tmp_path
+    ):
+        """With a SQLite backend, one worker's render is reused by another."""
+        path = str(tmp_path / "cache.sqlite3")
+        monkeypatch.setattr(http_cache, "response_cache", cache.SQLiteCache(path, 100, 60))
+        etag = client.get("/api/politician/1").headers["ETag"]
+
+        other_worker = cache.SQLiteCache(path, 100, 60)
+        assert len(other_worker) == 1
+        monkeypatch.setattr(http_cache, "response_cache", other_worker)
+        response = client.get("/api/politician/1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_backend_errors_are_misses(self, client, seed_test_data, monkeypatch):
+        """A failing cache backend doesn't turn into a 500."""
+
+        class LockedCache:
+            def get(self, key, default=None):
+                raise sqlite3.OperationalError("database is locked")
+
+            def set(self, key, value):
+                raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(http_cache, "response_cache", LockedCache())
+        response = client.get("/api/politician/1")
+        assert response.status_code == 200
+        assert json.loads(response.data)["politicianid"] == 1
+        assert response.headers.get("ETag")
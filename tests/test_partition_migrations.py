@@ -0,0 +1,166 @@
+"""Tests for moving unpartitioned Votes and Donations tables (older schema)
+into their partitioned replacements, in populate_votes.py and
+populate_donors_and_donations.py. Runs against tables in a scratch schema.
+"""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import pytest
+
+from app.derived import ensure_politician_industry_totals
+from bin import populate_donors_and_donations as donations_ingest
+from bin import populate_votes
+from bin.pg_partitions import is_partitioned, partitions
+
+SCHEMA = "partition_migration_test"
+
+
+@pytest.fixture
+def old_schema(db_connection):
+    """Politicians, Bills, RollCalls and fec_loaded_files, plus Votes and
+    Donations tables in their old, unpartitioned shape."""
+    cursor = db_connection.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"SET search_path TO {SCHEMA}, public")
+    cursor.execute("CREATE TABLE Politicians (PoliticianID INT PRIMARY KEY)")
+    cursor.execute("INSERT INTO Politicians VALUES (1), (2)")
+    cursor.execute(
+        "CREATE TABLE Bills (BillID INT PRIMARY KEY, DateIntroduced DATE, Congress INT)"
+    )
+    cursor.execute("INSERT INTO Bills VALUES (10, '2021-03-01', 117), (20, NULL, 118)")
+    db_connection.commit()
+    populate_votes.create_rollcalls_table_if_not_exists(db_connection)
+    cursor.execute(
+        "INSERT INTO RollCalls (RollCallID, Congress, Chamber, RollNumber, BillID) VALUES (1, 118, 'House', 5, 10)"
+    )
+    cursor.execute("""
+        CREATE TABLE Votes (
+            VoteID SERIAL PRIMARY KEY,
+            PoliticianID INT REFERENCES Politicians(PoliticianID),
+            BillID INT REFERENCES Bills(BillID),
+            Vote TEXT,
+            UNIQUE(PoliticianID, BillID)
+        )
+    """)
+    cursor.execute("CREATE INDEX idx_votes_bill_id ON Votes (BillID)")
+    cursor.execute("INSERT INTO Votes (PoliticianID, BillID, Vote) VALUES (1, 10, 'Yea'), (2, 20, 'Nay')")
+    cursor.execute(
+        "CREATE TABLE Donors (DonorID SERIAL PRIMARY KEY, Name TEXT, DonorType TEXT, Employer TEXT, State TEXT)"
+    )
+    cursor.execute("INSERT INTO Donors (Name) VALUES ('Acme PAC')")
+    cursor.execute("""
+        CREATE TABLE Donations (
+            DonationID SERIAL PRIMARY KEY,
+            DonorID INT REFERENCES Donors(DonorID),
+            PoliticianID INT REFERENCES Politicians(PoliticianID),
+            Amount NUMERIC(12, 2),
+            Date DATE,
+            ContributionType TEXT,
+            SubID BIGINT,
+            TranKey TEXT
+        )
+    """)
+    # Dated in 2023, but loaded from the 2022 cycle's file
+    cursor.execute("""
+        INSERT INTO Donations (DonorID, PoliticianID, Amount, Date, SubID)
+        VALUES (1, 1, 5000, '2023-01-05', 150), (1, 2, 6000, '2024-02-01', 250)
+    """)
+    cursor.execute("""
+        CREATE TABLE fec_loaded_files (
+            file_name TEXT NOT NULL, cycle INT, sha256 TEXT NOT NULL, min_sub_id BIGINT, max_sub_id BIGINT,
+            donation_rows BIGINT, loaded_at TIMESTAMPTZ NOT NULL DEFAULT now(), PRIMARY KEY (file_name, sha256)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO fec_loaded_files (file_name, cycle, sha256, min_sub_id, max_sub_id)
+        VALUES ('pas222.zip', 2022, 'a', 100, 199), ('pas224.zip', 2024, 'b', 200, 299)
+    """)
+    db_connection.commit()
+    yield cursor
+    db_connection.rollback()
+    cursor.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    cursor.execute("SET search_path TO pt, public")
+    db_connection.commit()
+    cursor.close()
+
+
+class TestVotesMigration:
+    """Test suite for partitioning an older Votes table by Congress."""
+
+    def test_rows_move_under_their_congress(self, old_schema, db_connection):
+        """Votes keep their IDs and take the roll call's, else the bill's, Congress."""
+        old_schema.execute("ALTER TABLE Votes ADD COLUMN RollCallID INT")
+        old_schema.execute("UPDATE Votes SET RollCallID = 1 WHERE PoliticianID = 1")
+        db_connection.commit()
+        populate_votes.create_votes_table_if_not_exists(db_connection)
+
+        assert is_partitioned(old_schema, "Votes")
+        assert set(partitions(old_schema, "Votes")) == {118}
+        old_schema.execute("SELECT VoteID, Congress, SortDate::text, Vote FROM Votes ORDER BY VoteID")
+        assert old_schema.fetchall() == [(1, 118, "2021-03-01", "Yea"), (2, 118, "infinity", "Nay")]
+        old_schema.execute("INSERT INTO Votes (PoliticianID, BillID, Congress, Vote, SortDate) "
+                           "VALUES (1, 20, 118, 'Yea', 'infinity') RETURNING VoteID")
+        assert old_schema.fetchone()[0] == 3
+
+    def test_votes_without_a_congress_stop_the_move(self, old_schema, db_connection):
+        """A vote with neither a roll call nor a bill leaves the old table as it was."""
+        old_schema.execute("INSERT INTO Votes (PoliticianID, BillID, Vote) VALUES (1, NULL, 'Yea')")
+        db_connection.commit()
+        with pytest.raises(RuntimeError, match="no roll call or bill"):
+            populate_votes.create_votes_table_if_not_exists(db_connection)
+
+        assert not is_partitioned(old_schema, "Votes")
+        old_schema.execute("SELECT COUNT(*) FROM Votes")
+        assert old_schema.fetchone()[0] == 3
+
+
+class TestDonationsMigration:
+    """Test suite for partitioning an older Donations table by FEC cycle."""
+
+    def test_rows_take_the_cycle_of_their_file(self, old_schema, db_connection, monkeypatch):
+        """The cycle comes from the loaded file covering the SubID, not the date."""
+        monkeypatch.setattr(donations_ingest, "FEC_INCREMENTAL", True)
+        donations_ingest.partition_donations_by_cycle(old_schema)
+        db_connection.commit()
+
+        assert is_partitioned(old_schema, "Donations")
+        old_schema.execute("SELECT DonationID, SubID, Cycle FROM Donations ORDER BY DonationID")
+        assert old_schema.fetchall() == [(1, 150, 2022), (2, 250, 2024)]
+
+    def test_untraceable_rows_need_a_full_load(self, old_schema, db_connection, monkeypatch):
+        """Outside a full load, rows with no matching file stop the move."""
+        old_schema.execute("INSERT INTO Donations (DonorID, PoliticianID, Amount, Date) VALUES (1, 1, 7000, '2020-05-01')")
+        db_connection.commit()
+        monkeypatch.setattr(donations_ingest, "FEC_INCREMENTAL", True)
+        with pytest.raises(RuntimeError, match="full"):
+            donations_ingest.partition_donations_by_cycle(old_schema)
+        db_connection.rollback()
+
+        monkeypatch.setattr(donations_ingest, "FEC_INCREMENTAL", False)
+        donations_ingest.partition_donations_by_cycle(old_schema)
+        db_connection.commit()
+        old_schema.execute("SELECT SubID FROM Donations ORDER BY SubID")
+        assert old_schema.fetchall() == [(150,), (250,)]
+
+    def test_industry_totals_follow_the_new_table(self, old_schema, db_connection, monkeypatch):
+        """politician_industry_totals over the old table is rebuilt over the partitioned one."""
+        old_schema.execute("ALTER TABLE Donors ADD COLUMN Industry TEXT")
+        old_schema.execute("UPDATE Donors SET Industry = 'Energy'")
+        db_connection.commit()
+        ensure_politician_industry_totals(db_connection)
+        monkeypatch.setattr(donations_ingest, "FEC_INCREMENTAL", True)
+        donations_ingest.partition_donations_by_cycle(old_schema)
+        db_connection.commit()
+
+        assert is_partitioned(old_schema, "Donations")
+        old_schema.execute("SELECT to_regclass('donations_unpartitioned')")
+        assert old_schema.fetchone()[0] is None
+        old_schema.execute("INSERT INTO Donations (DonorID, PoliticianID, Amount, Cycle) VALUES (1, 1, 700, 2024)")
+        db_connection.commit()
+        donations_ingest.refresh_politician_industry_totals(db_connection)
+        old_schema.execute(
+            "SELECT PoliticianID, Industry, TotalAmount, DonationCount FROM politician_industry_totals ORDER BY 1"
+        )
+        assert old_schema.fetchall() == [(1, "Energy", 5700, 2), (2, "Energy", 6000, 1)]
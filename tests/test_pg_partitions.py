@@ -0,0 +1,133 @@
+"""Tests for the partitioning helpers in bin/pg_partitions.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import psycopg2
+import pytest
+
+from bin.pg_partitions import (
+    create_load_table,
+    detach_partition,
+    ensure_default_partition,
+    ensure_partition,
+    is_partitioned,
+    partition_name,
+    partitions,
+    set_aside_table,
+    swap_partition,
+)
+
+
+TEST_TABLES = "partition_test, partition_test_2022, partition_test_2024_load"
+
+
+@pytest.fixture
+def cycles_table(db_connection):
+    """A table partitioned by cycle, with 2022, 2024 and default partitions."""
+    cursor = db_connection.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {TEST_TABLES} CASCADE")
+    cursor.execute(
+        "CREATE TABLE partition_test (id INT, cycle INT, UNIQUE (id, cycle)) PARTITION BY LIST (cycle)"
+    )
+    ensure_default_partition(cursor, "partition_test")
+    for cycle in (2022, 2024):
+        ensure_partition(cursor, "partition_test", cycle)
+    cursor.execute("INSERT INTO partition_test VALUES (1, 2022), (2, 2024), (3, 2024), (4, NULL)")
+    db_connection.commit()
+    yield cursor
+    db_connection.rollback()
+    cursor.execute(f"DROP TABLE IF EXISTS {TEST_TABLES} CASCADE")
+    db_connection.commit()
+    cursor.close()
+
+
+def rows(cursor, table):
+    cursor.execute(f"SELECT id, cycle FROM {table} ORDER BY id")
+    return cursor.fetchall()
+
+
+class TestPartitions:
+    """Test suite for creating and listing list partitions."""
+
+    def test_partition_name(self):
+        """Partitions are named <table>_<value>, lowercased."""
+        assert partition_name("Donations", 2024) == "donations_2024"
+
+    def test_rows_routed_by_value(self, cycles_table):
+        """Rows land in their value's partition; NULLs in the default one."""
+        assert is_partitioned(cycles_table, "partition_test")
+        assert not is_partitioned(cycles_table, "partition_test_2024")
+        assert partitions(cycles_table, "partition_test") == {
+            2022: "partition_test_2022",
+            2024: "partition_test_2024",
+        }
+        assert rows(cycles_table, "partition_test_2024") == [(2, 2024), (3, 2024)]
+        assert rows(cycles_table, "partition_test_default") == [(4, None)]
+
+    def test_ensure_partition_is_idempotent(self, cycles_table):
+        """Ensuring an existing partition changes nothing."""
+        ensure_partition(cycles_table, "partition_test", 2024)
+        assert rows(cycles_table, "partition_test_2024") == [(2, 2024), (3, 2024)]
+
+
+class TestSwapAndDetach:
+    """Test suite for replacing and detaching one partition."""
+
+    def test_swap_replaces_only_that_partition(self, cycles_table, db_connection):
+        """A loaded table replaces the 2024 rows; 2022 is untouched."""
+        load_table = create_load_table(cycles_table, "partition_test", "cycle", 2024)
+        cycles_table.execute(f"INSERT INTO {load_table} VALUES (5, 2024)")
+        swap_partition(cycles_table, "partition_test", 2024, load_table)
+        db_connection.commit()
+
+        assert rows(cycles_table, "partition_test") == [(1, 2022), (4, None), (5, 2024)]
+        assert partitions(cycles_table, "partition_test")[2024] == "partition_test_2024"
+
+    def test_load_table_rejects_other_values(self, cycles_table):
+        """The load table only accepts rows of its partition's value."""
+        load_table = create_load_table(cycles_table, "partition_test", "cycle", 2024)
+        with pytest.raises(psycopg2.IntegrityError):
+            cycles_table.execute(f"INSERT INTO {load_table} VALUES (6, 2022)")
+
+    def test_detach_keeps_the_table(self, cycles_table, db_connection):
+        """A detached partition leaves the parent but keeps its rows."""
+        assert detach_partition(cycles_table, "partition_test", 2022) == "partition_test_2022"
+        assert detach_partition(cycles_table, "partition_test", 2020) is None
+        db_connection.commit()
+
+        assert rows(cycles_table, "partition_test") == [(2, 2024), (3, 2024), (4, None)]
+        assert rows(cycles_table, "partition_test_2022") == [(1, 2022)]
+
+
+class TestSetAside:
+    """Test suite for moving an old table out of the way of its replacement."""
+
+    def test_replacement_reuses_names(self, db_connection):
+        """After set_aside_table, the same DDL creates a fresh table; the old
+        rows stay in <table>_old."""
+        cursor = db_connection.cursor()
+        ddl = "CREATE TABLE aside_test (id SERIAL PRIMARY KEY, value INT UNIQUE)"
+        cursor.execute("DROP TABLE IF EXISTS aside_test, aside_test_old")
+        cursor.execute(ddl)
+        cursor.execute("CREATE INDEX idx_aside_test_value ON aside_test (value)")
+        cursor.execute("INSERT INTO aside_test (value) VALUES (10), (20)")
+        try:
+            assert set_aside_table(cursor, "aside_test", "old") == "aside_test_old"
+            cursor.execute(ddl)
+            cursor.execute("CREATE INDEX idx_aside_test_value ON aside_test (value)")
+            cursor.execute("INSERT INTO aside_test (value) VALUES (30) RETURNING id")
+            assert cursor.fetchone()[0] == 1
+            cursor.execute("SELECT id, value FROM aside_test_old ORDER BY id")
+            assert cursor.fetchall() == [(1, 10), (2, 20)]
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'aside_test_old' ORDER BY indexname"
+            )
+            assert [row[0] for row in cursor.fetchall()] == [
+                "aside_test_pkey_old",
+                "aside_test_value_key_old",
+                "idx_aside_test_value_old",
+            ]
+        finally:
+            db_connection.rollback()
+            cursor.close()
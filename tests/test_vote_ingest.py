@@ -0,0 +1,110 @@
+"""Tests for Voteview vote matching in bin/populate_votes.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import json
+
+import pytest
+
+from bin import populate_votes
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Two members; three roll calls, two of them on the same bill."""
+    monkeypatch.setattr(populate_votes, "icpsr_lookup", {
+        100: ("nancy", "pelosi", "california"),
+        200: ("mitch", "mcconnell", "kentucky"),
+    })
+    monkeypatch.setattr(populate_votes, "politician_db_lookup", {
+        ("pelosi", "california"): [(1, "nancy")],
+        ("mcconnell", "kentucky"): [(2, "mitch")],
+    })
+    monkeypatch.setattr(populate_votes, "rollcall_lookup", {
+        (117, 5, "House"): (1, 10),
+        (117, 6, "House"): (2, 10),
+        (118, 7, "Senate"): (3, 20),
+    })
+    monkeypatch.setattr(
+        populate_votes, "icpsr_politician_ids", populate_votes.build_icpsr_index(populate_votes.resolve_icpsr_map())
+    )
+
+
+@pytest.fixture
+def vote_files(tmp_path):
+    paths = []
+    for congress, chamber, rollnumber, icpsr in ((117, "House", 5, 100), (118, "Senate", 7, 200)):
+        records = [
+            {"congress": congress, "chamber": chamber, "rollnumber": rollnumber, "icpsr": icpsr, "cast_code": 1},
+            {"congress": congress, "chamber": chamber, "rollnumber": rollnumber, "icpsr": 999, "cast_code": 1},
+            {"congress": congress, "chamber": chamber, "rollnumber": 999, "icpsr": icpsr, "cast_code": 6},
+        ]
+        path = tmp_path / f"H{congress}_{chamber}_votes.json"
+        path.write_text(json.dumps(records), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+class TestParseVoteFiles:
+    """Test suite for per-file vote matching, serial and parallel."""
+
+    def test_file_matches_known_members_and_roll_calls(self, lookups, vote_files):
+        """Only records with a known member and a linked roll call match."""
+        assert populate_votes.parse_vote_file(vote_files[0]) == (3, [(1, 1, 10, 117, "Yea")], None)
+
+    def test_each_roll_call_on_a_bill_is_kept(self, lookups, tmp_path):
+        """Votes on two roll calls for the same bill both match."""
+        records = [
+            {"congress": 117, "chamber": "House", "rollnumber": rollnumber, "icpsr": 100, "cast_code": cast_code}
+            for rollnumber, cast_code in ((5, 6), (6, 1))
+        ]
+        path = tmp_path / "H117_votes.json"
+        path.write_text(json.dumps(records), encoding="utf-8")
+        assert populate_votes.parse_vote_file(str(path)) == (2, [(1, 1, 10, 117, "Nay"), (1, 2, 10, 117, "Yea")], None)
+
+    def test_parallel_matches_serial(self, lookups, vote_files, monkeypatch):
+        """Forked workers return the same results, in file order."""
+        serial = list(populate_votes.parse_vote_files(vote_files))
+        monkeypatch.setattr(populate_votes, "VOTE_PARSE_WORKERS", 2)
+        assert list(populate_votes.parse_vote_files(vote_files)) == serial
+        assert [result[1] for _, result in serial] == [[(1, 1, 10, 117, "Yea")], [(2, 3, 20, 118, "Yea")]]
+
+    def test_icpsr_index_resolves_each_member_once(self, lookups, monkeypatch):
+        """Members are matched up front; per-vote resolution is an array read."""
+        assert populate_votes.resolve_icpsr_map() == {100: 1, 200: 2}
+        monkeypatch.setattr(populate_votes, "find_politician_id", lambda icpsr: pytest.fail("resolved per vote"))
+        assert populate_votes.resolve_politician_id(100) == 1
+        assert populate_votes.resolve_politician_id(150) is None
+        assert populate_votes.resolve_politician_id(10**9) is None
+        assert populate_votes.resolve_politician_id(None) is None
+
+    def test_read_error_keeps_earlier_records(self, lookups, tmp_path):
+        """A file cut off mid-way reports the error with what it read."""
+        first = {"congress": 117, "chamber": "House", "rollnumber": 5, "icpsr": 100, "cast_code": 4}
+        path = tmp_path / "HS117_votes.json"
+        path.write_text("[" + json.dumps(first) + ', {"congress": 117', encoding="utf-8")
+        records_read, matched, error = populate_votes.parse_vote_file(str(path))
+        assert (records_read, matched) == (1, [(1, 1, 10, 117, "Nay")])
+        assert error
+
+
+class TestReadRollcalls:
+    """Test suite for reading the roll call dimension."""
+
+    def test_roll_calls_on_enacted_bills_kept_with_date_and_question(self, tmp_path, monkeypatch):
+        """Roll calls carry their date and question; unlinked ones are dropped."""
+        monkeypatch.setattr(populate_votes, "bill_db_lookup", {"hr1": 10})
+        records = [
+            {"congress": 117, "chamber": "House", "rollnumber": 5, "date": "2021-03-03",
+             "vote_question": "On Passage", "bill_number": "H.R. 1"},
+            {"congress": 117, "chamber": "House", "rollnumber": 6, "date": "",
+             "vote_question": "", "bill_number": "HR1"},
+            {"congress": 117, "chamber": "House", "rollnumber": 7, "date": "2021-03-04",
+             "vote_question": "On Passage", "bill_number": "HR2"},
+        ]
+        (tmp_path / "HS117_rollcalls.json").write_text(json.dumps(records), encoding="utf-8")
+        assert populate_votes.read_rollcalls(str(tmp_path)) == [
+            (117, "House", 5, "2021-03-03", "On Passage", 10),
+            (117, "House", 6, None, None, 10),
+        ]
@@ -0,0 +1,75 @@
+"""Tests for the streaming Voteview readers in bin/voteview_reader.py."""
+
+# pylint: disable=unused-argument
+# noqa: F401
+# type: ignore
+import json
+
+import pytest
+
+from bin.voteview_reader import iter_json_array, iter_voteview_records, voteview_files
+
+VOTES = [
+    {"congress": 118, "chamber": "House", "rollnumber": 1, "icpsr": 21500, "cast_code": 1, "prob": 99.5},
+    {"congress": 118, "chamber": "Senate", "rollnumber": 12345678901, "icpsr": 49700, "cast_code": 6},
+    {"bioname": "O'NEILL, Thomas P. [Tip], Jr.", "note": "a ] inside, with \"quotes\" and {braces}"},
+    {"nested": {"list": [1, [2, 3], {"x": None}]}, "flag": True},
+]
+
+
+class TestIterJsonArray:
+    """Test suite for incremental JSON array decoding."""
+
+    @pytest.mark.parametrize("chunk_chars", [1, 7, 64, 1 << 16])
+    def test_matches_json_load(self, tmp_path, chunk_chars):
+        """Any buffer size yields exactly what json.load returns."""
+        path = tmp_path / "HS118_votes.json"
+        path.write_text(json.dumps(VOTES, indent=1), encoding="utf-8")
+        assert list(iter_json_array(str(path), chunk_chars=chunk_chars)) == VOTES
+
+    def test_empty_array(self, tmp_path):
+        """An empty array yields nothing."""
+        path = tmp_path / "HS118_votes.json"
+        path.write_text(" [ ] ", encoding="utf-8")
+        assert list(iter_json_array(str(path))) == []
+
+    def test_not_an_array_rejected(self, tmp_path):
+        """A top-level object raises ValueError."""
+        path = tmp_path / "HS118_votes.json"
+        path.write_text('{"congress": 118}', encoding="utf-8")
+        with pytest.raises(ValueError):
+            list(iter_json_array(str(path)))
+
+    def test_truncated_file_yields_prefix_then_fails(self, tmp_path):
+        """Records before a cut-off are yielded; the cut-off raises."""
+        path = tmp_path / "HS118_votes.json"
+        path.write_text(json.dumps(VOTES)[:-20], encoding="utf-8")
+        records = iter_json_array(str(path), chunk_chars=16)
+        assert next(records) == VOTES[0]
+        with pytest.raises(ValueError):
+            list(records)
+
+
+class TestVoteviewCsv:
+    """Test suite for reading Voteview CSV exports."""
+
+    def test_csv_records_match_json_types(self, tmp_path):
+        """Numeric columns come back as ints, blanks as None."""
+        path = tmp_path / "HS118_votes.csv"
+        path.write_text(
+            "congress,chamber,rollnumber,icpsr,cast_code,prob\n"
+            "118,House,1,21500,1,99.5\n"
+            "118,Senate,2,,9,\n",
+            encoding="utf-8",
+        )
+        records = list(iter_voteview_records(str(path)))
+        assert records[0]["congress"] == 118 and records[0]["cast_code"] == 1
+        assert records[0]["chamber"] == "House"
+        assert records[1]["icpsr"] is None
+
+    def test_csv_preferred_over_json(self, tmp_path):
+        """When both exports exist the CSV is listed, once."""
+        for name in ("HS117_votes.json", "HS118_votes.json", "HS118_votes.csv", "HS118_rollcalls.json", "notes.csv"):
+            (tmp_path / name).write_text("[]", encoding="utf-8")
+        assert voteview_files(str(tmp_path), "votes") == ["HS117_votes.json", "HS118_votes.csv"]
+        assert voteview_files(str(tmp_path), "rollcalls") == ["HS118_rollcalls.json"]